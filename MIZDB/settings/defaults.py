@@ -139,6 +139,24 @@ BOOTSTRAP5 = {
 # Whether anonymous users can view pages as if they had 'view' permission.
 ANONYMOUS_CAN_VIEW = True
 
+# The number of results from which on changelists show estimated counts
+# instead of counting the results (None: always count the results). The pages
+# of such changelists are browsed with cursors instead of page numbers.
+COUNT_ESTIMATE_THRESHOLD = None
+
+# The number of seconds that the total number of records of a model is cached
+# for on changelists (0: do not cache).
+TOTAL_COUNT_CACHE_TIMEOUT = 60
+
+# Whether the names of ComputedNameModel records are updated by the name update
+# worker (the management command 'process_name_updates') instead of by the
+# requests that read the names.
+NAME_UPDATE_WORKER = False
+
+# Whether exports are run in the background by the export worker (the
+# management command 'process_export_jobs') instead of within the request.
+EXPORT_JOB_WORKER = False
+
 # Log CSRF failures:
 CSRF_FAILURE_VIEW = "dbentry.csrf.csrf_failure"
 
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from django import views
 from django.contrib import messages
@@ -8,7 +8,7 @@ from django.contrib.admin.utils import display_for_field, get_fields_from_path
 from django.db import transaction
 from django.db.models import Count, F, Model, ProtectedError, QuerySet
 from django.forms import ALL_FIELDS, BaseInlineFormSet, Form
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.utils.html import format_html
 from django.utils.translation import gettext
 
@@ -32,7 +32,7 @@ from dbentry.actions.forms import (
 from dbentry.admin.views import MIZAdminMixin
 from dbentry.models import Magazin
 from dbentry.site.views.base import BaseListView
-from dbentry.utils.admin import create_logentry, log_addition, log_change, log_deletion
+from dbentry.utils.admin import LogCollector, create_logentry, log_change, log_deletion
 from dbentry.utils.html import get_changelist_link, get_obj_link, link_list
 from dbentry.utils.merge import merge_records
 from dbentry.utils.models import get_model_from_string, get_model_relations, get_updatable_fields, is_protected
@@ -497,7 +497,9 @@ class AdminMergeView(MIZAdminMixin, AdminActionMixin, MergeView):
         # results are displayed as seen as on the changelist. The tag requires
         # the changelist as an argument.
         cl = self.model_admin.get_changelist_instance(self.request)
-        cl.result_list = self.queryset
+        # The changelist only adds the overview annotations to the objects of
+        # its result page; add them to the selected objects:
+        cl.result_list = self.queryset.overview() if hasattr(self.queryset, "overview") else self.queryset
         cl.formset = None
         # The sorting URL refers to the changelist, so don't allow sorting.
         # Trying to sort would send the user back to the changelist.
@@ -726,13 +728,16 @@ class ChangeBestand(AdminActionMixin, MIZAdminMixin, views.generic.TemplateView)
         return self.get(request, *args, **kwargs)
 
     def perform_action(self, formsets: List[BaseInlineFormSet]) -> None:  # type: ignore[override]
-        with transaction.atomic():
+        with transaction.atomic(), LogCollector() as logs:
             for formset in formsets:
                 formset.save()
-                self.create_log_entries(formset)
+                self.create_log_entries(formset, logs)
 
-    def create_log_entries(self, formset: BaseInlineFormSet) -> None:
-        """Create LogEntry objects for the parent and its related objects."""
+    def create_log_entries(self, formset: BaseInlineFormSet, logs: LogCollector) -> None:
+        """
+        Add LogEntry objects for the parent and its related objects to the
+        collector ``logs``.
+        """
         # We can get the correct change message for the LogEntry objects
         # of the parent instance from the model_admin's
         # construct_change_message method, which requires a form argument.
@@ -744,15 +749,15 @@ class ChangeBestand(AdminActionMixin, MIZAdminMixin, views.generic.TemplateView)
         change_message = self.model_admin.construct_change_message(
             request=self.request, form=form, formsets=[formset], add=False
         )
-        self.model_admin.log_change(self.request, formset.instance, change_message)
-        # Now create LogEntry objects for the Bestand model side:
         user_id = self.request.user.pk
+        logs.create_logentry(user_id, formset.instance, CHANGE, change_message)
+        # Now create LogEntry objects for the Bestand model side:
         for new_obj in formset.new_objects:
-            log_addition(user_id, new_obj)
+            logs.log_addition(user_id, new_obj)
         for changed_obj, changed_data in formset.changed_objects:
-            log_change(user_id, changed_obj, fields=changed_data)
+            logs.log_change(user_id, changed_obj, fields=changed_data)
         for deleted_obj in formset.deleted_objects:
-            log_deletion(user_id, deleted_obj)
+            logs.log_deletion(user_id, deleted_obj)
 
     def get_bestand_formset(self, request: HttpRequest, obj: Model) -> Tuple[BaseInlineFormSet, InlineModelAdmin]:
         """Return the Bestand formset and model admin inline for this object."""
@@ -850,8 +855,9 @@ class Replace(MIZAdminMixin, AdminActionConfirmationView):
         change_message = [{"deleted": {"object": str(obj), "name": obj._meta.verbose_name}}]
         for replacement in replacements:
             change_message.append({"added": {"object": str(replacement), "name": replacement._meta.verbose_name}})
-        for changed_obj in changes:
-            create_logentry(self.request.user.pk, changed_obj, CHANGE, change_message)
+        with LogCollector() as logs:
+            for changed_obj in changes:
+                logs.create_logentry(self.request.user.pk, changed_obj, CHANGE, change_message)
         return None
 
     def get_objects_list(self) -> list:
@@ -874,14 +880,16 @@ class Replace(MIZAdminMixin, AdminActionConfirmationView):
         return objects_list
 
 
-def text_summary(queryset: QuerySet) -> HttpResponse:
-    """
-    Return a HttpResponse containing a text summary of the objects in the given
-    queryset.
-    """
-    response = HttpResponse()
+def _iter_text_summary(queryset: QuerySet) -> Iterator[str]:
     for d in get_summaries(queryset):
         for k, v in d.items():
-            response.write(f"<p>{k}: {v}</p>")
-        response.write('<hr style="break-after:page;">')
-    return response
+            yield f"<p>{k}: {v}</p>"
+        yield '<hr style="break-after:page;">'
+
+
+def text_summary(queryset: QuerySet) -> StreamingHttpResponse:
+    """
+    Return a StreamingHttpResponse containing a text summary of the objects in
+    the given queryset.
+    """
+    return StreamingHttpResponse(_iter_text_summary(queryset))
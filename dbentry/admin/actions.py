@@ -2,7 +2,7 @@ from typing import Callable
 
 from django.contrib import admin
 from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, StreamingHttpResponse
 from django.utils.translation import gettext_lazy
 
 from dbentry.actions.views import AdminMergeView, BulkEditJahrgang, ChangeBestand, MoveToBrochure, Replace, text_summary
@@ -34,6 +34,6 @@ def replace(model_admin: admin.ModelAdmin, request: HttpRequest, queryset: Query
 
 
 @admin.action(description="textuelle Zusammenfassung", permissions=["view"])
-def summarize(_model_admin: admin.ModelAdmin, _request: HttpRequest, queryset: QuerySet) -> HttpResponse:
+def summarize(_model_admin: admin.ModelAdmin, _request: HttpRequest, queryset: QuerySet) -> StreamingHttpResponse:
     """An admin action that provides a text summary for the selected items."""
     return text_summary(queryset)
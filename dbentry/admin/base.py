@@ -4,7 +4,7 @@ import Levenshtein
 from django import forms
 from django.apps import apps
 from django.contrib import admin
-from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR
 from django.contrib.auth import get_permission_codename
 from django.contrib.messages.storage import default_storage
 from django.core import checks, exceptions
@@ -81,6 +81,9 @@ class MIZModelAdmin(ExportMixin, WatchlistMixin, AutocompleteMixin, MIZAdminSear
           will require user confirmation if changes alter the object too much
         - ``confirmation_threshold`` (float): threshold for the Levenshtein.ratio()
           for which user confirmation for changes is required
+        - ``search_candidates`` (int): the number of search results to compute
+          the full search rank for (see MIZQuerySet.search). The results of
+          the requested page are always included.
     """
 
     changelist_link_labels: dict
@@ -89,6 +92,7 @@ class MIZModelAdmin(ExportMixin, WatchlistMixin, AutocompleteMixin, MIZAdminSear
     index_category: str = "Sonstige"
     require_confirmation = False
     confirmation_threshold = 0.85
+    search_candidates = 1000
 
     # Add the merge_records action to all MIZModelAdmin classes.
     # Using miz_site.add_action to add that action to all model admin instances
@@ -138,14 +142,6 @@ class MIZModelAdmin(ExportMixin, WatchlistMixin, AutocompleteMixin, MIZAdminSear
     def has_superuser_permission(self, request: HttpRequest) -> bool:
         return request.user.is_superuser
 
-    def get_queryset(self, request: HttpRequest) -> models.QuerySet:
-        queryset = super().get_queryset(request)
-        # overview() adds annotations and queryset optimizations for the
-        # changelist view:
-        if not hasattr(queryset, "overview"):
-            return queryset
-        return queryset.overview()
-
     def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Type[MIZChangeList]:
         return MIZChangeList
 
@@ -394,7 +390,27 @@ class MIZModelAdmin(ExportMixin, WatchlistMixin, AutocompleteMixin, MIZAdminSear
         if not search_term:
             return queryset, False
         # Do a full text search. Respect ordering specified on the changelist.
-        return queryset.search(search_term, ranked=ORDER_VAR not in request.GET), False
+        return (
+            queryset.search(
+                search_term,
+                ranked=ORDER_VAR not in request.GET,
+                candidates=self.get_search_candidates(request),
+            ),
+            False,
+        )
+
+    def get_search_candidates(self, request: HttpRequest) -> int:
+        """
+        Return the number of search results to compute the full search rank
+        for. Make sure that the results of the requested page are included.
+        """
+        if not self.search_candidates:
+            return 0
+        try:
+            page_number = int(request.GET.get(PAGE_VAR, 1))
+        except ValueError:
+            return 0
+        return max(self.search_candidates, page_number * self.list_per_page)
 
     def formfield_for_dbfield(self, db_field: models.Field, request: HttpRequest, **kwargs: Any) -> forms.Field:
         formfield = super().formfield_for_dbfield(db_field, request, **kwargs)
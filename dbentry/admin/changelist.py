@@ -4,9 +4,22 @@ from django.http import HttpRequest
 
 from dbentry.search.mixins import ChangelistSearchFormMixin
 from dbentry.utils.models import get_model_fields
+from dbentry.utils.pagination import get_page_queryset
+from dbentry.utils.query import add_ordering_annotations
 
 
 class MIZChangeList(ChangelistSearchFormMixin, ChangeList):
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        # The overview annotations are only added to the objects of the result
+        # page (see get_results). Add the annotations that the ordering refers
+        # to now.
+        root_queryset = self.root_queryset
+        self.root_queryset = add_ordering_annotations(root_queryset, self.get_ordering(request, root_queryset))
+        try:
+            return super().get_queryset(request)
+        finally:
+            self.root_queryset = root_queryset
+
     def get_results(self, request: HttpRequest) -> None:
         """
         Prepare the result list of the changelist.
@@ -24,6 +37,13 @@ class MIZChangeList(ChangelistSearchFormMixin, ChangeList):
                 self.queryset = self.queryset.none()  # type: ignore[has-type]
         # Let ChangeList.get_results set some other attributes:
         super().get_results(request)
+        # Resolve the objects of the result page first, then add the overview
+        # annotations and queryset optimizations for just those objects:
+        result_list = get_page_queryset(self.queryset, self.result_list)  # type: ignore[has-type]
+        if hasattr(result_list, "overview"):
+            result_list = result_list.overview()
+        # noinspection PyAttributeOutsideInit
+        self.result_list = result_list
 
     def get_show_all_url(self) -> str:
         """Return the url for an unfiltered changelist showing all objects."""
@@ -8,6 +8,10 @@ class DbentryConfig(AppConfig):
 
     def ready(self) -> None:
         from . import csrf  # noqa
+        from .fts.indexes import add_name_field_indexes
+
+        # Add trigram indexes for the name fields used in text searches:
+        add_name_field_indexes(self.get_models())
 
 
 class DbentryAdminConfig(SimpleAdminConfig):
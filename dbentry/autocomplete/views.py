@@ -1,20 +1,63 @@
+from django import http
 from django.core.exceptions import FieldError
+from django.core.paginator import InvalidPage
 from django.db import transaction
 from django.db.models import Q
 from mizdb_tomselect.views import AutocompleteView
 from nameparser import HumanName
-from stdnum import issn
 
 from dbentry import models as _models
 from dbentry.utils.admin import log_addition
+from dbentry.utils.pagination import CURSOR_VAR, KeysetPage, get_keyset_paginator, get_page_queryset
 from dbentry.utils.text import parse_name
 
 
 class MIZAutocompleteView(AutocompleteView):
-    """Base view class for autocomplete requests."""
+    """
+    Base view class for autocomplete requests.
+
+    Attributes:
+        - keyset_pagination (bool): if True, paginate the results by seeking
+          to the position of a cursor (see dbentry.utils.pagination) instead
+          of using OFFSET. The cursor for the next page is included in the
+          response.
+    """
+
+    keyset_pagination = False
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        paginator, page, object_list, has_other_pages = self.paginate_queryset(queryset, self.get_paginate_by(queryset))
+        data = {
+            "results": self.get_result_values(self.get_page_results(page)),
+            "page": page.number,
+            "has_more": page.has_next(),
+            "show_create_option": self.has_add_permission(request),
+        }
+        if isinstance(page, KeysetPage):
+            data["cursor"] = page.next_cursor
+        return http.JsonResponse(data)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.keyset_pagination:
+            paginator = get_keyset_paginator(queryset, page_size)
+            if paginator is not None:
+                try:
+                    number = int(self.request.GET.get(self.page_kwarg, 1))
+                    page = paginator.page(self.request.GET.get(CURSOR_VAR, ""), number=number)
+                except (ValueError, InvalidPage) as e:
+                    raise http.Http404(str(e))
+                return paginator, page, page.object_list, page.has_other_pages()
+        return super().paginate_queryset(queryset, page_size)
 
     def get_page_results(self, page):
-        return page.object_list.overview(*self.values_select)
+        object_list = page.object_list
+        if not isinstance(page, KeysetPage):
+            # Compute the overview annotations only for the objects of the
+            # page (the object list of a keyset page already is restricted to
+            # the page's objects).
+            object_list = get_page_queryset(page.paginator.object_list, object_list)
+        return object_list.overview(*self.values_select)
 
     def search(self, queryset, q):
         if q:
@@ -61,6 +104,8 @@ class AutoSuffixAutocompleteView(MIZAutocompleteView):
 class AutocompleteAusgabe(MIZAutocompleteView):
     """Autocomplete view for the Ausgabe model that applies chronological ordering."""
 
+    keyset_pagination = True
+
     def order_queryset(self, queryset):
         if self.q:
             # search may have already applied ordering - do not override
@@ -101,13 +146,12 @@ class AutocompleteBuchband(MIZAutocompleteView):
 
 
 class AutocompleteMagazin(MIZAutocompleteView):
-    """Autocomplete view for the Magazin model that can handle ISSN search terms."""
+    """
+    Autocomplete view for the Magazin model.
 
-    def search(self, queryset, q):
-        # Compact-ify the search term if it is a valid ISSN.
-        if issn.is_valid(q):
-            q = issn.compact(q)
-        return super().search(queryset, q)
+    ISSN search terms are handled by the queryset's search (see
+    TextSearchQuerySetMixin.search).
+    """
 
 
 class AutocompletePerson(AutoSuffixAutocompleteView):
@@ -19,7 +19,8 @@ class BaseModel(models.Model):
     Attributes:
         - ``name_field`` (str): the name of the field that most accurately
           represents the record. If set, the field's value will determine the
-          output of __str__().
+          output of __str__(). Models of the dbentry app get a trigram index
+          for the name field (see dbentry.fts.indexes).
         - ``create_field`` (str): the name of the field for the dal
           autocomplete object creation.
         - ``exclude_from_str`` (tuple): tuple of field names to be excluded from
@@ -87,7 +88,8 @@ class BaseModel(models.Model):
         Add annotations and optimizations useful for an overview over objects
         of this model to the given queryset.
 
-        If `annotations` is given, only apply matching annotations.
+        If `annotations` is given, only apply matching annotations. Annotations
+        that the queryset already has are not added again.
         """
         if select_related := cls.select_related:
             queryset = queryset.select_related(*select_related)
@@ -98,7 +100,9 @@ class BaseModel(models.Model):
                 _annotations = {k: v for k, v in all_annotations.items() if k in annotations}
             else:
                 _annotations = all_annotations
-            queryset = queryset.annotate(**_annotations)
+            _annotations = {k: v for k, v in _annotations.items() if k not in queryset.query.annotations}
+            if _annotations:
+                queryset = queryset.annotate(**_annotations)
         return queryset
 
     class Meta:
@@ -176,7 +180,8 @@ class ComputedNameModel(BaseModel):
         - ``name_default`` (str): the default value for the _name field, if no
           name can be composed (missing data/new instance)
         - ``_changed_flag`` (boolean): if True, a new name will be computed the
-          next time the model object is instantiated
+          next time the model object is fetched from the database (or by the
+          name update worker, if the NAME_UPDATE_WORKER setting is True)
         - ``name_composing_fields`` (list): a sequence of names of fields
           whose data make up the name. Values of these fields are retrieved
           from the database and passed to the '_get_name' method
@@ -191,11 +196,6 @@ class ComputedNameModel(BaseModel):
 
     objects = CNQuerySet.as_manager()
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        # An up-to-date name _may_ be expected upon initialization.
-        self.update_name()
-
     @classmethod
     def check(cls, **kwargs: Any) -> List[checks.CheckMessage]:
         errors = super().check(**kwargs)
@@ -301,6 +301,9 @@ class ComputedNameModel(BaseModel):
     class Meta(BaseModel.Meta):
         abstract = True
         ordering = ["_name"]
+        # Use the CNQuerySet for related objects and refresh_from_db as well,
+        # so that the names of those instances are updated, too.
+        base_manager_name = "objects"
 
 
 class AbstractJahrModel(BaseModel):
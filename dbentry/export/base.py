@@ -1,10 +1,15 @@
-from django.core.exceptions import FieldDoesNotExist
+from itertools import islice
+
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, FieldError
+from django.db import connections
+from django.db.models import F
 from django.utils.encoding import force_str
 from import_export import widgets
 from import_export.resources import ModelResource
 
-from dbentry.export.fields import AnnotationField
+from dbentry.export.fields import AnnotationField, CachedQuerysetField
 from dbentry.export.widgets import YesNoBooleanWidget
+from dbentry.utils.models import get_fields_and_lookups
 
 
 def get_verbose_name_for_resource_field(resource, field_name):
@@ -54,6 +59,23 @@ def get_verbose_name_for_resource_field(resource, field_name):
 
 class MIZResource(ModelResource):
     add_annotations = True
+    _export_fields = None
+
+    # The internal types of the model fields whose database values can be
+    # exported by the database directly (see can_copy_export):
+    copy_field_types = {
+        "AutoField",
+        "BigAutoField",
+        "BigIntegerField",
+        "CharField",
+        "IntegerField",
+        "PositiveIntegerField",
+        "PositiveSmallIntegerField",
+        "SmallIntegerField",
+        "TextField",
+    }
+    # The widgets that export the text representation of a value unchanged:
+    copy_widgets = (widgets.Widget, widgets.CharWidget, widgets.IntegerWidget)
 
     def _add_annotations(self, queryset):
         """Add the annotations declared in `Meta.annotations` to the queryset."""
@@ -77,10 +99,135 @@ class MIZResource(ModelResource):
             queryset = queryset.select_related(*select_related)
         return queryset
 
+    def _cache_queryset_fields(self, queryset, selected_fields=None):
+        """
+        Set the caches of the CachedQuerysetFields with the results of a single
+        query for the records of the given queryset.
+
+        The values of each field are queried with a correlated subquery instead
+        of a join, so that the aggregates of the fields do not multiply each
+        other's rows.
+        """
+        fields = [f for f in self.get_export_fields(selected_fields) if isinstance(f, CachedQuerysetField)]
+        if not fields:
+            return
+        model = queryset.model
+        pk_name = model._meta.pk.name
+        cache = {}
+        values = model._default_manager.filter(pk__in=queryset.order_by().values(pk_name)).values(
+            pk_name, **{field.attribute: field.as_subquery() for field in fields}
+        )
+        for values_dict in values:
+            cache[values_dict.pop(pk_name)] = values_dict
+        for field in fields:
+            field.cache = cache
+
+    def _release_queryset_field_caches(self):
+        """Release the values cached for the CachedQuerysetFields."""
+        for field in self.fields.values():
+            if isinstance(field, CachedQuerysetField):
+                field.cache = None
+
     def filter_export(self, queryset, *args, **kwargs):
+        # Remember the selected fields for the caches set in iter_queryset.
+        self._export_fields = kwargs.get("export_fields")
         queryset = self._defer_fts(self._add_annotations(self._select_related(queryset)))
         return queryset.order_by(queryset.model._meta.pk.name)
 
+    def iter_queryset(self, queryset):
+        """
+        Iterate over the records of the export queryset in chunks, and set the
+        caches of the CachedQuerysetFields for the records of each chunk.
+
+        Only one chunk of records and their cached values are held in memory
+        at a time.
+        """
+        records = super().iter_queryset(queryset)
+        try:
+            while chunk := list(islice(records, self.get_chunk_size())):
+                self._cache_queryset_fields(
+                    queryset.model._default_manager.filter(pk__in=[obj.pk for obj in chunk]), self._export_fields
+                )
+                yield from chunk
+        finally:
+            self._release_queryset_field_caches()
+
+    def _get_copy_output_field(self, field):
+        """
+        Return the model field that the export value of the given resource
+        field is taken from, or None if the value does not come from a single
+        database column of the exported record.
+        """
+        if isinstance(field, AnnotationField):
+            return field.expr.output_field
+        if isinstance(field, CachedQuerysetField):
+            return field.queryset.query.annotations[field.attribute].output_field
+        fields, lookups = get_fields_and_lookups(self._meta.model, field.attribute)
+        if lookups or any(f.many_to_many or f.one_to_many for f in fields):
+            return None
+        return fields[-1]
+
+    def can_copy_export(self, selected_fields=None):
+        """
+        Return whether the database can produce the export of the selected
+        fields by itself (see copy_export).
+
+        That is the case if every export value is the text representation of a
+        text or integer value selected by the database: values that are
+        rendered by a widget (f.ex. booleans, dates or choices) or by a
+        dehydrate method must be exported in Python.
+        """
+        for field in self.get_export_fields(selected_fields):
+            dehydrate_method = field.get_dehydrate_method(self.get_field_name(field))
+            if callable(dehydrate_method) or hasattr(self, dehydrate_method):
+                return False
+            if type(field.widget) not in self.copy_widgets:
+                return False
+            if isinstance(field, AnnotationField) and not self.add_annotations:
+                return False
+            try:
+                output_field = self._get_copy_output_field(field)
+            except (AttributeError, FieldDoesNotExist, FieldError, KeyError):
+                return False
+            if (
+                output_field is None
+                or hasattr(output_field, "from_db_value")
+                or output_field.get_internal_type() not in self.copy_field_types
+            ):
+                return False
+        return True
+
+    def copy_export(self, queryset, file, selected_fields=None):
+        """
+        Write the export values of the records of the given queryset as CSV
+        (without the headers) into the binary file ``file``, using the COPY
+        command of PostgreSQL.
+
+        The export queryset is compiled into a single SELECT statement, so no
+        model instances are created. Check with can_copy_export whether the
+        export can be done this way.
+        """
+        self.before_export(queryset, export_fields=selected_fields)
+        queryset = self.filter_export(queryset, export_fields=selected_fields)
+        # Select every export value as an annotation: the SELECT statement
+        # then lists the values in the order of the annotations, i.e. in the
+        # export order.
+        columns = {}
+        for i, field in enumerate(self.get_export_fields(selected_fields)):
+            if isinstance(field, CachedQuerysetField):
+                columns[f"_export_{i}"] = field.as_subquery()
+            else:
+                columns[f"_export_{i}"] = F(field.attribute)
+        try:
+            sql, params = queryset.annotate(**columns).values_list(*columns).query.sql_with_params()
+        except EmptyResultSet:
+            # The queryset can never return any rows (e.g. pk__in=[]).
+            pass
+        else:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.copy_expert(cursor.mogrify(f"COPY ({sql}) TO STDOUT WITH CSV", params).decode(), file)
+        self.after_export(queryset, None, export_fields=selected_fields)
+
     def get_export_headers(self, selected_fields=None):
         headers = []
         for field in self.get_export_fields(selected_fields):
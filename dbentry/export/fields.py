@@ -1,5 +1,4 @@
-from functools import cached_property
-
+from django.db.models import OuterRef, Subquery
 from import_export.fields import Field
 
 from dbentry.export.widgets import ChoiceLabelWidget
@@ -14,22 +13,33 @@ class AnnotationField(Field):
 
 
 class CachedQuerysetField(Field):
-    """A Resource Field that returns its export value from a cached queryset."""
+    """
+    A Resource Field that returns its export value from a cache of the values
+    of the exported records.
+
+    The cache only lives for one export run: MIZResource.iter_queryset sets it
+    for each chunk of the exported records, and releases it again at the end
+    of the export. Outside an export run, the value is queried for the given
+    instance only.
+    """
 
     def __init__(self, *args, queryset=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.queryset = queryset
+        self.cache = None
 
-    @cached_property
-    def cache(self):
-        cache = {}
-        pk_name = self.queryset.model._meta.pk.name
-        for values_dict in self.queryset.values(pk_name, self.attribute):
-            pk = values_dict.pop(pk_name)
-            cache[pk] = values_dict
-        return cache
+    def as_subquery(self):
+        """
+        Return a subquery for the export value that refers to the primary key
+        of the outer query.
+        """
+        return Subquery(self.queryset.filter(pk=OuterRef("pk")).values(self.attribute))
 
     def export(self, instance, **kwargs):
+        if self.cache is None:
+            # Not part of an export run: only query the value of this record.
+            value = self.queryset.filter(pk=instance.pk).values_list(self.attribute, flat=True).first()
+            return "" if value is None else value
         try:
             return self.cache[instance.pk][self.attribute]
         except KeyError:
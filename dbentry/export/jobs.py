@@ -0,0 +1,47 @@
+"""Run the export jobs of the export worker."""
+
+import logging
+import tempfile
+
+from django.core.files import File
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from import_export.formats import base_formats
+
+from dbentry.export.streaming import stream_export
+
+logger = logging.getLogger(__name__)
+
+
+def write_export(job, file):
+    """Write the export of the given job into the binary file ``file``."""
+    resource = import_string(job.resource)()
+    file_format = getattr(base_formats, job.file_format)()
+    queryset = job.get_queryset()
+    export_fields = job.export_fields or None
+    stream = stream_export(resource, queryset, file_format, export_fields=export_fields)
+    if stream is None:
+        # The format cannot be streamed: export a Dataset.
+        stream = [file_format.export_data(resource.export(queryset, export_fields=export_fields))]
+    for chunk in stream:
+        file.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+
+def run_export_job(job):
+    """
+    Run the given export job and save the export file. If the export fails,
+    the job is marked as failed and the error is recorded.
+    """
+    try:
+        with tempfile.TemporaryFile() as file:
+            write_export(job, file)
+            file.seek(0)
+            job.file.save(job.filename, File(file), save=False)
+    except Exception as e:
+        logger.exception("Export job %s failed", job.pk)
+        job.status = job.Status.FAILED
+        job.error = f"{e.__class__.__name__}: {e}"
+    else:
+        job.status = job.Status.DONE
+    job.finished = timezone.now()
+    job.save()
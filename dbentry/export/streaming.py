@@ -0,0 +1,170 @@
+"""
+Write the export of a resource row by row, without building the complete
+export in memory first.
+"""
+
+import csv
+import io
+import itertools
+import json
+import tempfile
+
+from django.conf import settings
+from tablib.formats._json import serialize_objects_handler
+
+from dbentry.export.base import MIZResource
+
+# The size of the chunks of the files that are buffered on disk:
+CHUNK_SIZE = 64 * 1024
+
+
+class Echo:
+    """A file-like object that returns the written value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export(resource, queryset, export_fields=None, **kwargs):
+    """
+    Yield the export headers of the given resource, followed by the export
+    values of each record of the queryset.
+
+    This follows the steps of Resource.export, but yields the rows instead of
+    collecting them in a Dataset.
+    """
+    resource.before_export(queryset, export_fields=export_fields, **kwargs)
+    queryset = resource.filter_export(queryset, export_fields=export_fields, **kwargs)
+    yield resource.get_export_headers(selected_fields=export_fields)
+    for obj in resource.iter_queryset(queryset):
+        yield resource.export_resource(obj, selected_fields=export_fields, **kwargs)
+    resource.after_export(queryset, None, export_fields=export_fields, **kwargs)
+
+
+def _escape_formulae(row):
+    # Like TablibFormat._escape_formulae of django-import-export:
+    if getattr(settings, "IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT", False) is True:
+        return [str(value).replace("=", "", 1) if str(value).startswith("=") else value for value in row]
+    return row
+
+
+def stream_csv(rows):
+    """Yield the given rows as lines of CSV."""
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(_escape_formulae(row))
+
+
+def stream_json(rows):
+    """
+    Yield the given rows as a JSON array of objects that map the headers (the
+    first row) to the values.
+    """
+    rows = iter(rows)
+    headers = next(rows)
+    yield "["
+    for i, row in enumerate(rows):
+        item = json.dumps(
+            dict(zip(headers, _escape_formulae(row))), default=serialize_objects_handler, ensure_ascii=False
+        )
+        yield item if i == 0 else ", " + item
+    yield "]"
+
+
+def _escape_illegal_chars(row):
+    # Like XLSX._escape_illegal_chars of django-import-export:
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    if getattr(settings, "IMPORT_EXPORT_ESCAPE_ILLEGAL_CHARS_ON_EXPORT", False) is True:
+        return [ILLEGAL_CHARACTERS_RE.sub("\N{REPLACEMENT CHARACTER}", v) if isinstance(v, str) else v for v in row]
+    for value in row:
+        if isinstance(value, str) and ILLEGAL_CHARACTERS_RE.search(value):
+            # Like django-import-export, do not include the value in the
+            # error message (reflected XSS).
+            raise ValueError("export failed due to IllegalCharacterError")
+    return row
+
+
+def stream_xlsx(rows):
+    """
+    Yield the content of an XLSX workbook with the given rows.
+
+    The workbook is created in openpyxl's write-only mode: the rows are
+    written to a temporary file as they are appended, instead of being kept
+    in memory. The header row is set in bold and frozen, like in the XLSX
+    export of tablib.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Tablib Dataset")
+    sheet.freeze_panes = "A2"
+    rows = iter(rows)
+    headers = []
+    for header in _escape_illegal_chars(next(rows)):
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.font = Font(bold=True)
+        headers.append(cell)
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(_escape_illegal_chars(_escape_formulae(row)))
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+def copy_csv(resource, queryset, export_fields=None):
+    """
+    Yield the CSV export of the given queryset, with the rows written by the
+    database (see MIZResource.copy_export).
+
+    The rows are buffered in a temporary file on disk, not in memory. The CSV
+    of the database differs from the CSV of the csv module (line feeds as line
+    terminators, quoted empty strings): the rows are read back and written
+    with stream_csv, so that the export is the same either way.
+    """
+    with tempfile.TemporaryFile() as file:
+        resource.copy_export(queryset, file, export_fields)
+        file.seek(0)
+        rows = csv.reader(io.TextIOWrapper(file, encoding="utf-8", newline=""))
+        yield from stream_csv(itertools.chain([resource.get_export_headers(export_fields)], rows))
+
+
+STREAM_WRITERS = {
+    "csv": stream_csv,
+    "json": stream_json,
+    "xlsx": stream_xlsx,
+}
+
+
+def get_stream_writer(file_format):
+    """
+    Return the function that streams the export in the given format, or None
+    if the format does not support streaming.
+    """
+    return STREAM_WRITERS.get(file_format.get_title())
+
+
+def stream_export(resource, queryset, file_format, export_fields=None):
+    """
+    Return an iterator over the content of the export of the given queryset
+    in the given format, or None if the format does not support streaming.
+
+    CSV exports that the database can produce by itself are written with the
+    COPY command.
+    """
+    stream_writer = get_stream_writer(file_format)
+    if stream_writer is None:
+        return None
+    if (
+        stream_writer is stream_csv
+        and isinstance(resource, MIZResource)
+        and not getattr(settings, "IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT", False)
+        and resource.can_copy_export(export_fields)
+    ):
+        return copy_csv(resource, queryset, export_fields)
+    return stream_writer(iter_export(resource, queryset, export_fields=export_fields))
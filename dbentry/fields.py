@@ -116,6 +116,10 @@ class StdNumField(models.CharField):
     """
     The base model field for standard number fields.
 
+    Values are stored in their compact canonical form (see to_python), so that
+    records can be looked up by standard number with an equality lookup (see
+    get_canonical_value).
+
     Attributes:
         stdnum: the module of the stdnum library that implements validation and
           formatting of the desired kind of standard number
@@ -172,6 +176,16 @@ class StdNumField(models.CharField):
         # Fallback for ean stdnum which does not have a format function.
         return self.stdnum.compact  # type: ignore[attr-defined]
 
+    def get_canonical_value(self, value: str) -> Optional[str]:
+        """
+        Return the compact canonical form of the standard number ``value`` as
+        it is stored in the database, or None if ``value`` is not a valid
+        standard number.
+        """
+        if not value or not self.stdnum.is_valid(value):  # type: ignore[attr-defined]
+            return None
+        return self.to_python(value)
+
     def to_python(self, value: str) -> str:
         # In order to deny querying and saving with invalid values, we have to
         # call run_validators.
@@ -1,4 +1,5 @@
 from django.db.backends.postgresql.schema import DatabaseSchemaEditor as PostgreSQLSchemaEditor
+from django.db.models.constants import LOOKUP_SEP
 from tsvector_field.schema import DatabaseTriggerEditor
 
 
@@ -9,8 +10,328 @@ class MIZDBTriggerEditor(DatabaseTriggerEditor):
 
     SearchVectorField attributes 'language' and 'language_column' will be
     ignored when creating the setweight SQL.
+
+    If the SearchVectorField declares a ``document_label``, the trigger will
+    also keep the row's entry in the search document table up to date, and an
+    additional trigger will remove the entry when the row is deleted.
+
+    If the SearchVectorField declares ``related`` field paths, the field stores
+    the concatenated search vectors of the related rows instead. A trigger on
+    the model's table computes the value whenever the row is inserted, one of
+    the foreign keys of the paths changes or the value is set to NULL; any
+    other value written to the column is discarded. A trigger on every table
+    along each path resets the value of the affected rows whenever a related
+    row is added, changed or removed.
     """
 
+    document_table = "dbentry_searchdocument"
+
+    sql_create_function = (
+        "CREATE FUNCTION {function} RETURNS trigger AS $$\n"
+        "DECLARE\n"
+        " do_update bool default false;\n"
+        "BEGIN\n"
+        " {preconditions}\n"
+        " IF do_update THEN\n"
+        "  {to_tsvector}\n"
+        " END IF;\n"
+        "{document}"
+        " RETURN NEW;\n"
+        "END\n"
+        "$$ LANGUAGE plpgsql"
+    )
+
+    sql_update_document = (
+        " IF (TG_OP = 'UPDATE') THEN\n"
+        "  IF (NEW.{label} IS DISTINCT FROM OLD.{label}) THEN do_update = true; END IF;\n"
+        " END IF;\n"
+        " IF do_update THEN\n"
+        "  INSERT INTO {document_table} (content_type_id, object_id, search_vector, label)\n"
+        "  SELECT ct.id, NEW.{pk}, NEW.{column}, NEW.{label}::text FROM django_content_type ct\n"
+        "  WHERE ct.app_label = {app_label} AND ct.model = {model_name}\n"
+        "  ON CONFLICT (content_type_id, object_id) DO UPDATE\n"
+        "  SET search_vector = EXCLUDED.search_vector, label = EXCLUDED.label;\n"
+        " END IF;\n"
+    )
+
+    sql_create_delete_function = (
+        "CREATE FUNCTION {function} RETURNS trigger AS $$\n"
+        "BEGIN\n"
+        " DELETE FROM {document_table} WHERE object_id = OLD.{pk} AND content_type_id IN (\n"
+        "  SELECT ct.id FROM django_content_type ct WHERE ct.app_label = {app_label} AND ct.model = {model_name}\n"
+        " );\n"
+        " RETURN OLD;\n"
+        "END\n"
+        "$$ LANGUAGE plpgsql"
+    )
+
+    sql_create_delete_trigger = (
+        "CREATE TRIGGER {trigger} AFTER DELETE ON {table} FOR EACH ROW EXECUTE PROCEDURE {function}"
+    )
+
+    sql_create_related_function = (
+        "CREATE FUNCTION {function} RETURNS trigger AS $$\n"
+        "DECLARE\n"
+        " do_update bool default false;\n"
+        "BEGIN\n"
+        " IF (TG_OP = 'INSERT') THEN do_update = true;\n"
+        " ELSIF (TG_OP = 'UPDATE') THEN\n"
+        "  IF (NEW.{column} IS NULL) THEN do_update = true;\n"
+        "  {preconditions}\n"
+        "  ELSE NEW.{column} := OLD.{column};\n"
+        "  END IF;\n"
+        " END IF;\n"
+        " IF do_update THEN\n"
+        "  NEW.{column} := {vector};\n"
+        " END IF;\n"
+        " RETURN NEW;\n"
+        "END\n"
+        "$$ LANGUAGE plpgsql"
+    )
+
+    # An aggregate that concatenates tsvectors with the || operator, which
+    # shifts the positions of the lexemes of the right operand behind those of
+    # the left operand.
+    tsvector_agg = "dbentry_tsvector_agg"
+
+    sql_create_tsvector_agg = (
+        "CREATE OR REPLACE AGGREGATE {agg}(tsvector) (SFUNC = tsvector_concat, STYPE = tsvector, INITCOND = '')"
+    )
+
+    sql_create_refresh_function = (
+        "CREATE FUNCTION {function} RETURNS trigger AS $$\n"
+        "BEGIN\n"
+        " IF (TG_OP = 'UPDATE') THEN\n"
+        "  IF NOT ({changed}) THEN RETURN NULL; END IF;\n"
+        " END IF;\n"
+        " IF (TG_OP IN ('INSERT', 'UPDATE')) THEN\n"
+        "  UPDATE {table} SET {column} = NULL WHERE {pk} IN ({parents_new});\n"
+        " END IF;\n"
+        " IF (TG_OP IN ('UPDATE', 'DELETE')) THEN\n"
+        "  UPDATE {table} SET {column} = NULL WHERE {pk} IN ({parents_old});\n"
+        " END IF;\n"
+        " RETURN NULL;\n"
+        "END\n"
+        "$$ LANGUAGE plpgsql"
+    )
+
+    sql_create_refresh_trigger = (
+        "CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE ON {table} FOR EACH ROW EXECUTE PROCEDURE {function}"
+    )
+
+    def get_document_names(self, model, field):  # type: ignore[no-untyped-def]
+        """Return the names of the function and the trigger that delete documents."""
+        return (
+            self._create_index_name(model, [field.column], "_document_function") + "()",
+            self._create_index_name(model, [field.column], "_document_trigger"),
+        )
+
+    def _document_params(self, model, field):  # type: ignore[no-untyped-def]
+        opts = model._meta
+        return {
+            "document_table": self.quote_name(self.document_table),
+            "pk": self.quote_name(opts.pk.column),
+            "column": self.quote_name(field.column),
+            "label": self.quote_name(getattr(field, "document_label", "")),
+            "app_label": self.quote_value(opts.app_label),
+            "model_name": self.quote_value(opts.model_name),
+        }
+
+    def get_refresh_names(self, model, field, path, index):  # type: ignore[no-untyped-def]
+        """
+        Return the names of the function and the trigger that refresh the
+        related search vector when the rows of the index-th table along the
+        given path change.
+        """
+        return (
+            self._create_index_name(model, [field.column, path, str(index)], "_refresh_function") + "()",
+            self._create_index_name(model, [field.column, path, str(index)], "_refresh_trigger"),
+        )
+
+    def _get_related_paths(self, field):  # type: ignore[no-untyped-def]
+        """Return the distinct field paths of the related search vectors."""
+        return list(dict.fromkeys(path for path, _config in field.related))
+
+    def _get_joins(self, model, path):  # type: ignore[no-untyped-def]
+        """
+        Resolve the field path of a related search vector.
+
+        Return a list of (model, from column, to column) 3-tuples for every
+        table along the path and the column of the related search vector. The
+        from column is the column of the previous table (the first one being
+        the table of ``model``) that is joined with the to column of the table.
+        """
+        *relations, vector_field = path.split(LOOKUP_SEP)
+        joins = []
+        for name in relations:
+            field = model._meta.get_field(name)
+            if field.concrete:
+                # A forward relation: the foreign key is on the previous table.
+                model = field.related_model
+                joins.append((model, field.column, field.target_field.column))
+            else:
+                # A reverse relation: the foreign key is on the related table.
+                model = field.related_model
+                joins.append((model, field.field.target_field.column, field.field.column))
+        return joins, model._meta.get_field(vector_field).column
+
+    def _join_sql(self, joins, start=1):  # type: ignore[no-untyped-def]
+        """
+        Return the FROM clause that joins the tables of the given joins. The
+        tables are aliased t<start>, t<start + 1> and so on.
+        """
+        tables = []
+        for i, (model, from_column, to_column) in enumerate(joins, start=start):
+            table = "{} AS t{}".format(self.quote_name(model._meta.db_table), i)
+            if tables:
+                table = "JOIN {} ON t{}.{} = t{}.{}".format(
+                    table, i - 1, self.quote_name(from_column), i, self.quote_name(to_column)
+                )
+            tables.append(table)
+        return " ".join(tables)
+
+    def _related_vector_sql(self, model, field, row):  # type: ignore[no-untyped-def]
+        """
+        Return the SQL expression that concatenates the related search vectors
+        of the given row (i.e. 'NEW' or a table alias).
+        """
+        vectors = []
+        for path in self._get_related_paths(field):
+            joins, vector_column = self._get_joins(model, path)
+            _model, from_column, to_column = joins[0]
+            vectors.append(
+                "COALESCE((SELECT {agg}(t{n}.{vector}) FROM {tables} WHERE t1.{to} = {row}.{frm}), '')".format(
+                    agg=self.tsvector_agg,
+                    n=len(joins),
+                    vector=self.quote_name(vector_column),
+                    tables=self._join_sql(joins),
+                    to=self.quote_name(to_column),
+                    row=row,
+                    frm=self.quote_name(from_column),
+                )
+            )
+        return " || ".join(vectors)
+
+    def _parents_sql(self, model, joins, index, row):  # type: ignore[no-untyped-def]
+        """
+        Return a query for the primary keys of the rows of ``model`` that are
+        related to the given row (i.e. 'NEW' or 'OLD') of the index-th table
+        of the joins.
+        """
+        _model, from_column, to_column = joins[index]
+        return "SELECT t0.{pk} FROM {tables} WHERE t{i}.{frm} = {row}.{to}".format(
+            pk=self.quote_name(model._meta.pk.column),
+            tables=self._join_sql([(model, None, None)] + joins[:index], start=0),
+            i=index,
+            frm=self.quote_name(from_column),
+            row=row,
+            to=self.quote_name(to_column),
+        )
+
+    def _create_related_tsvector(self, model, field):  # type: ignore[no-untyped-def]
+        """Yield the SQL for the triggers that maintain a related search vector."""
+        _index, function, trigger = self.get_names(model, field)
+        table = self.quote_name(model._meta.db_table)
+        column = self.quote_name(field.column)
+
+        # The trigger on the model's table:
+        yield self.sql_create_tsvector_agg.format(agg=self.tsvector_agg)
+        preconditions = []
+        for path in self._get_related_paths(field):
+            joins, _vector_column = self._get_joins(model, path)
+            from_column = self.quote_name(joins[0][1])
+            preconditions.append(
+                "ELSIF (NEW.{column} IS DISTINCT FROM OLD.{column}) THEN do_update = true;".format(column=from_column)
+            )
+        yield self.sql_create_related_function.format(
+            function=function,
+            column=column,
+            preconditions="\n  ".join(dict.fromkeys(preconditions)),
+            vector=self._related_vector_sql(model, field, "NEW"),
+        )
+        yield self.sql_create_trigger.format(trigger=self.quote_name(trigger), table=table, function=function)
+
+        # The triggers on the tables along the paths. These reset the vector
+        # of the affected rows, which makes the trigger above compute it anew.
+        for path in self._get_related_paths(field):
+            joins, vector_column = self._get_joins(model, path)
+            for index, (related_model, from_column, to_column) in enumerate(joins):
+                # Refresh the vector if the columns that join this table with
+                # the adjacent tables change, or if the related vector itself
+                # changes.
+                if index + 1 < len(joins):
+                    columns = [to_column, joins[index + 1][1]]
+                else:
+                    columns = [to_column, vector_column]
+                changed = " OR ".join(
+                    "NEW.{column} IS DISTINCT FROM OLD.{column}".format(column=self.quote_name(c))
+                    for c in dict.fromkeys(columns)
+                )
+                refresh_function, refresh_trigger = self.get_refresh_names(model, field, path, index)
+                yield self.sql_create_refresh_function.format(
+                    function=refresh_function,
+                    changed=changed,
+                    table=table,
+                    column=column,
+                    pk=self.quote_name(model._meta.pk.column),
+                    parents_new=self._parents_sql(model, joins, index, "NEW"),
+                    parents_old=self._parents_sql(model, joins, index, "OLD"),
+                )
+                yield self.sql_create_refresh_trigger.format(
+                    trigger=self.quote_name(refresh_trigger),
+                    table=self.quote_name(related_model._meta.db_table),
+                    function=refresh_function,
+                )
+
+    def _drop_related_tsvector(self, model, field):  # type: ignore[no-untyped-def]
+        """Yield the SQL that drops the triggers on the tables along the paths."""
+        for path in self._get_related_paths(field):
+            joins, _vector_column = self._get_joins(model, path)
+            for index in range(len(joins)):
+                refresh_function, _refresh_trigger = self.get_refresh_names(model, field, path, index)
+                # The related table may have been dropped already; drop the
+                # trigger along with the function.
+                yield "DROP FUNCTION IF EXISTS {function} CASCADE".format(function=refresh_function)
+
+    def _create_function(self, function, field):  # type: ignore[no-untyped-def]
+        preconditions = ["do_update = true;"]
+        if not field.force_update:
+            preconditions = self._to_tsvector_preconditions(field)
+        document = ""
+        if getattr(field, "document_label", ""):
+            document = self.sql_update_document.format(**self._document_params(field.model, field))
+        return self.sql_create_function.format(
+            function=function,
+            preconditions="\n ".join(preconditions),
+            to_tsvector="\n  ".join(self._to_tsvector(field)),
+            document=document,
+        )
+
+    def _create_tsvector(self, model, field):  # type: ignore[no-untyped-def]
+        yield from super()._create_tsvector(model, field)
+        if getattr(field, "related", None):
+            yield from self._create_related_tsvector(model, field)
+            return
+        if not (field.columns and getattr(field, "document_label", "")):
+            return
+        function, trigger = self.get_document_names(model, field)
+        yield self.sql_create_delete_function.format(function=function, **self._document_params(model, field))
+        yield self.sql_create_delete_trigger.format(
+            trigger=self.quote_name(trigger),
+            table=self.quote_name(model._meta.db_table),
+            function=function,
+        )
+
+    def _drop_tsvector(self, model, field):  # type: ignore[no-untyped-def]
+        if getattr(field, "related", None):
+            yield from self._drop_related_tsvector(model, field)
+        function, trigger = self.get_document_names(model, field)
+        yield "DROP TRIGGER IF EXISTS {trigger} ON {table}".format(
+            trigger=trigger, table=self.quote_name(model._meta.db_table)
+        )
+        yield "DROP FUNCTION IF EXISTS {function}".format(function=function)
+        yield from super()._drop_tsvector(model, field)
+
     def _to_tsvector_weights(self, field):  # type: ignore[no-untyped-def]
         sql_setweight = " setweight(to_tsvector({language}, COALESCE(NEW.{column}, '')), {weight}) ||"
 
@@ -1,7 +1,9 @@
-from typing import Any, Dict, Iterator, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import tsvector_field
+from django.contrib.admin.utils import NotRelationField, get_fields_from_path
 from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.encoding import force_str
 
 
@@ -31,11 +33,67 @@ class WeightedColumn(tsvector_field.WeightedColumn):
 
 
 class SearchVectorField(tsvector_field.SearchVectorField):
-    def __init__(self, blank: bool = True, editable: bool = False, *args: Any, **kwargs: Any) -> None:
+    """
+    Extend tsvector_field.SearchVectorField with the option to add the search
+    vectors to the global search document table.
+
+    If ``document_label`` is set, the database trigger that updates the search
+    vector will also update the model's row in the search document table (see
+    dbentry.models.SearchDocument). The value of ``document_label`` must be the
+    name of the field whose value should be used as the document's label.
+
+    If ``related`` is set, the field does not index columns of its own table.
+    Instead, it stores the concatenated search vectors of the related objects
+    reachable via the given field paths, and the database triggers on the
+    tables along these paths keep it up to date. ``related`` must be a list of
+    (field path, config name) tuples (like a model's related_search_vectors),
+    where the config name is the search config to query the field with.
+    """
+
+    def __init__(
+        self,
+        blank: bool = True,
+        editable: bool = False,
+        document_label: str = "",
+        related: Optional[List[Tuple[str, str]]] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self.document_label = document_label
+        self.related = related or []
         # Set defaults for blank and editable. Note that tsvector_field ALWAYS
         # sets null to True.
         super().__init__(blank=blank, editable=editable, *args, **kwargs)
 
+    def check(self, **kwargs: Any) -> List[checks.CheckMessage]:
+        errors = super().check(**kwargs)
+        errors.extend(self._check_document_label())
+        errors.extend(self._check_related())
+        return errors
+
+    def _check_document_label(self) -> Iterator[checks.Error]:
+        """Check that document_label refers to a column of the model's table."""
+        if not self.document_label:
+            return
+        columns = [f.column for f in self.model._meta.get_fields(include_parents=False) if f.concrete]
+        if self.document_label not in columns:
+            yield checks.Error(
+                f"'document_label' {self.document_label!r} is not one of the available columns ({', '.join(columns)})",
+                obj=self,
+            )
+
+    def _check_related(self) -> Iterator[checks.Error]:
+        """Check that every path in related leads to a search vector field."""
+        if self.related and self.columns:
+            yield checks.Error("'columns' and 'related' are mutually exclusive.", obj=self)
+        for path, _config in self.related:
+            try:
+                field = get_fields_from_path(self.model, path)[-1]
+            except (FieldDoesNotExist, NotRelationField):
+                field = None
+            if not isinstance(field, SearchVectorField):
+                yield checks.Error(f"'related' path {path!r} does not lead to a SearchVectorField.", obj=self)
+
     def _check_language_attributes(self, textual_columns: List[str]) -> Iterator[checks.Error]:
         """Check that every dbentry.WeightedColumn column has a language set."""
         if self.columns:
@@ -72,6 +130,10 @@ class SearchVectorField(tsvector_field.SearchVectorField):
             kwargs["editable"] = True
         else:
             kwargs.pop("editable", None)
+        if self.document_label:
+            kwargs["document_label"] = self.document_label
+        if self.related:
+            kwargs["related"] = self.related
         # Change the path to so that this SearchVectorField class is used
         # instead of the default implementation:
         return name, "dbentry.fts.fields.{}".format(self.__class__.__name__), args, kwargs
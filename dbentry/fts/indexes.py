@@ -0,0 +1,61 @@
+from typing import Iterable, Optional, Type
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.backends.utils import names_digest
+from django.db.models import CharField, Model, TextField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast, Upper
+
+
+def trigram_expression(field_name: str) -> Upper:
+    """
+    Return the expression that the trigram indexes are built on.
+
+    The expression matches the one used by the case-insensitive lookups (i.e.
+    icontains, istartswith and iexact), so that those lookups can use the
+    index.
+    """
+    return Upper(Cast(field_name, output_field=TextField()))
+
+
+def get_trigram_index(model: Type[Model], field_name: str) -> GinIndex:
+    """Return a trigram GIN index for the field with the given name."""
+    # noinspection PyUnresolvedReferences
+    opts = model._meta
+    digest = names_digest(opts.db_table, opts.get_field(field_name).column, length=5)
+    return GinIndex(
+        OpClass(trigram_expression(field_name), name="gin_trgm_ops"),
+        name=f"{opts.model_name[:19]}_{digest}_trgm",
+    )
+
+
+def get_name_field_index(model: Type[Model]) -> Optional[GinIndex]:
+    """
+    Return a trigram GIN index for the model's name_field, or None if the
+    name field is not a text field of the model's own table.
+    """
+    name_field = getattr(model, "name_field", "")
+    if not name_field or LOOKUP_SEP in name_field:
+        return None
+    # noinspection PyUnresolvedReferences
+    opts = model._meta
+    if opts.abstract or opts.proxy or not opts.managed:
+        return None
+    field = opts.get_field(name_field)
+    if field.model is not model or not isinstance(field, (CharField, TextField)):
+        # Inherited fields are indexed on the parent's table.
+        return None
+    return get_trigram_index(model, name_field)
+
+
+def add_name_field_indexes(models: Iterable[Type[Model]]) -> None:
+    """Add a trigram index for the name_field to the indexes of the given models."""
+    for model in models:
+        index = get_name_field_index(model)
+        # noinspection PyUnresolvedReferences
+        opts = model._meta
+        if index and index.name not in {i.name for i in opts.indexes}:
+            opts.indexes.append(index)
+            # The migration autodetector only picks up the indexes if they
+            # were declared in the model's Meta:
+            opts.original_attrs["indexes"] = opts.indexes
@@ -1,10 +1,29 @@
 from typing import Any, List, Optional, Tuple, Type
 
-from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import BooleanField, ExpressionWrapper, F, FloatField, Max, Model, Q, Value
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import (
+    BooleanField,
+    Case,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    Max,
+    Model,
+    Q,
+    Value,
+    When,
+)
 from django.db.models.functions import Coalesce
 
+from dbentry.fields import StdNumField
+from dbentry.fts.db.schema import MIZDBTriggerEditor
 from dbentry.fts.fields import SearchVectorField
+from dbentry.fts.indexes import trigram_expression
 
 SIMPLE = "simple_unaccent"
 STEMMING = "german_unaccent"
@@ -16,11 +35,73 @@ def _get_search_vector_field(model: Type[Model]) -> Optional[SearchVectorField]:
     opts = model._meta
     # exclude inherited search vector fields:
     for field in opts.get_fields(include_parents=False):
-        if isinstance(field, SearchVectorField):
+        if isinstance(field, SearchVectorField) and not field.related:
             return field
     return None
 
 
+def _get_related_search_vector_field(model: Type[Model]) -> Optional[SearchVectorField]:
+    """
+    Return the SearchVectorField instance of the given model that stores the
+    search vectors of related objects.
+    """
+    # noinspection PyUnresolvedReferences
+    opts = model._meta
+    for field in opts.get_fields(include_parents=False):
+        if isinstance(field, SearchVectorField) and field.related:
+            return field
+    return None
+
+
+def has_search_documents(model: Type[Model]) -> bool:
+    """Return whether the records of the given model have search documents."""
+    field = _get_search_vector_field(model)
+    return bool(field and field.document_label)
+
+
+def insert_search_documents(model: Type[Model], content_type_id: int, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Insert search documents for every record of the given model.
+
+    Returns the number of documents inserted.
+    """
+    field = _get_search_vector_field(model)
+    opts = model._meta
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {qn(MIZDBTriggerEditor.document_table)} (content_type_id, object_id, search_vector, label) "
+        f"SELECT %s, {qn(opts.pk.column)}, {qn(field.column)}, {qn(field.document_label)}::text "
+        f"FROM {qn(opts.db_table)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [content_type_id])
+        return cursor.rowcount
+
+
+def _get_stdnum_filters(model: Type[Model], q: str) -> Q:
+    """
+    Return a filter for the standard number fields (ISBN, ISSN, EAN) of the
+    given model that are equal to ``q``, if ``q`` is a valid standard number
+    for them. Otherwise, return an empty Q object.
+    """
+    filters = Q()
+    # noinspection PyUnresolvedReferences
+    for field in model._meta.concrete_fields:
+        if isinstance(field, StdNumField):
+            value = field.get_canonical_value(q)
+            if value:
+                filters |= Q(**{field.name: value})
+    return filters
+
+
+def _get_pk_values(q: str) -> List[str]:
+    """Return the primary key values, if ``q`` is a comma separated list of ids."""
+    if all(v.strip().isnumeric() for v in q.split(",")):
+        return [v.strip() for v in q.split(",")]
+    return []
+
+
 class TextSearchQuerySetMixin(object):
     """
     Mixin for QuerySet classes that adds a search() text search method.
@@ -40,7 +121,12 @@ class TextSearchQuerySetMixin(object):
 
         Modify ``search_term`` to include prefix matching, if no word
         normalization is intended and if ``search_type`` is 'plain'.
+
+        The search type 'fuzzy' is treated like 'plain' (the trigram matching
+        is done by search()).
         """
+        if search_type == "fuzzy":
+            search_type = "plain"
         if search_term and config in self.simple_configs and search_type == "plain":
             # The given config does not use stemming - it makes sense to add
             # prefix matching.
@@ -69,7 +155,7 @@ class TextSearchQuerySetMixin(object):
         """
         return getattr(self.model, "related_search_vectors", [])  # type: ignore[attr-defined]
 
-    def search(self, q: str, search_type: str = "plain", ranked: bool = True) -> Any:
+    def search(self, q: str, search_type: str = "plain", ranked: bool = True, candidates: int = 0) -> Any:
         """
         Do a full text search for search term ``q``.
 
@@ -79,6 +165,23 @@ class TextSearchQuerySetMixin(object):
         that start with the search term, then ordered by text search rank, and
         finally ordered either according to the queryset ordering or - if the
         queryset wasn't ordered - by the model's default ordering.
+
+        If ``search_type`` is 'fuzzy', also include records whose name field
+        value is similar to the search term (pg_trgm's '%' operator), and add
+        the similarity to the rank. This allows finding records despite typos
+        in the search term.
+
+        If ``q`` is a valid standard number (ISBN, ISSN or EAN) for any of
+        the model's standard number fields, skip the text search and look up
+        the records by the standard number (or by id) instead.
+
+        If ``ranked`` is True and ``candidates`` is given, rank the results in
+        two phases: first, fetch the ids of the first ``candidates`` results
+        in the search ordering. Then compute the rank only for those
+        candidates, and order the candidates by their position in the first
+        phase, before the other results (which are in the default ordering).
+        The first ``candidates`` results are therefore the same as without
+        two-phase ranking.
         """
         if not q:
             return self.none()  # type: ignore[attr-defined]
@@ -89,9 +192,17 @@ class TextSearchQuerySetMixin(object):
         filters = Q()
         # Check if q is an id number or a list of ids, and add filters
         # accordingly.
-        if all(v.strip().isnumeric() for v in q.split(",")):
-            for v in q.split(","):
-                filters |= Q(**{pk_name: v.strip()})
+        for v in _get_pk_values(q):
+            filters |= Q(**{pk_name: v})
+
+        stdnum_filters = _get_stdnum_filters(model, q)
+        if stdnum_filters:
+            # The search term is a standard number: an equality lookup on the
+            # (indexed) standard number columns finds the records.
+            results = self.filter(filters | stdnum_filters)  # type: ignore[attr-defined]
+            if ranked or not self.query.order_by:  # type: ignore[attr-defined]
+                results = results.order_by(*self._get_default_search_ordering())
+            return results
 
         search_field = _get_search_vector_field(model)
         if search_field:
@@ -110,23 +221,41 @@ class TextSearchQuerySetMixin(object):
                 else:
                     model_search_rank += rank
 
-        for field_path, config in self._get_related_search_vectors():
-            # Include related search vector fields in the filter:
-            query = self._get_search_query(q, config=config, search_type=search_type)
-            filters |= Q(**{field_path: query})
-            # The rank function will return NULL, if the related search
-            # vector column has no value - i.e. when the row's record has no
-            # related items on the related table (nothing to join).
-            # NULL would break the summing up of the ranks (comparison with
-            # NULL always returns NULL), so use zero instead.
-            rank = Coalesce(SearchRank(F(field_path), query, normalization=16), Value(0), output_field=FloatField())
-            if related_search_rank is None:
-                related_search_rank = rank
-            else:
-                related_search_rank += rank
+        related_field = _get_related_search_vector_field(model)
+        if related_field:
+            # The search vectors of the related objects are stored on the
+            # model's table: query that column instead of joining the related
+            # tables.
+            configs_seen = set()
+            for _field_path, config in related_field.related:
+                if config in configs_seen:
+                    continue
+                configs_seen.add(config)
+                query = self._get_search_query(q, config=config, search_type=search_type)
+                filters |= Q(**{related_field.name: query})
+                rank = SearchRank(F(related_field.name), query, normalization=16)
+                if model_search_rank is None:
+                    model_search_rank = rank
+                else:
+                    model_search_rank += rank
+        else:
+            for field_path, config in self._get_related_search_vectors():
+                # Include related search vector fields in the filter:
+                query = self._get_search_query(q, config=config, search_type=search_type)
+                filters |= Q(**{field_path: query})
+                # The rank function will return NULL, if the related search
+                # vector column has no value - i.e. when the row's record has no
+                # related items on the related table (nothing to join).
+                # NULL would break the summing up of the ranks (comparison with
+                # NULL always returns NULL), so use zero instead.
+                rank = Coalesce(SearchRank(F(field_path), query, normalization=16), Value(0), output_field=FloatField())
+                if related_search_rank is None:
+                    related_search_rank = rank
+                else:
+                    related_search_rank += rank
 
-        if not filters:
-            # Neither of the loops ran: nothing to filter with.
+        if model_search_rank is None and related_search_rank is None:
+            # Neither of the loops ran: nothing to search.
             return self.none()  # type: ignore[attr-defined]
 
         # Only use the rank of the closest matching related row; this should
@@ -144,20 +273,91 @@ class TextSearchQuerySetMixin(object):
         name_field = getattr(model, "name_field", None)
         if name_field:
             filters |= Q(**{f"{name_field}__icontains": q})
+            if search_type == "fuzzy":
+                # Use the same expression as the trigram index on the name
+                # field so that the index can be used.
+                filters |= Q(TrigramSimilar(trigram_expression(name_field), q))
+                search_rank += TrigramSimilarity(trigram_expression(name_field), q)
 
         results = self.annotate(rank=search_rank).filter(filters)  # type: ignore[attr-defined]
+        if ranked and candidates:
+            # Phase one: find the ids of the best matches. Only the primary
+            # keys are fetched, and no more than 'candidates' of them.
+            candidate_ids = list(
+                results.order_by(*self._get_search_ordering(q, name_field), pk_name).values_list(pk_name, flat=True)[
+                    :candidates
+                ]
+            )
+            # Phase two: order the candidates by their position in the phase
+            # one results, and compute the rank only for the candidates.
+            position = Func(
+                Value(candidate_ids, output_field=ArrayField(IntegerField())),
+                F(pk_name),
+                function="array_position",
+                output_field=IntegerField(),
+            )
+            if len(candidate_ids) < candidates:
+                # Every match is a candidate.
+                return (
+                    self.annotate(rank=search_rank)  # type: ignore[attr-defined]
+                    .filter(**{f"{pk_name}__in": candidate_ids})
+                    .order_by(position.asc())
+                )
+            # There may be more matches than candidates: include the other
+            # matches after the candidates (in the default ordering) so that
+            # the later pages of the results can be reached.
+            is_candidate = Q(**{f"{pk_name}__in": candidate_ids})
+            search_rank = Case(When(is_candidate, then=search_rank), default=Value(0.0), output_field=FloatField())
+            return (
+                self.annotate(rank=search_rank)  # type: ignore[attr-defined]
+                .filter(filters)
+                .order_by(Coalesce(position, Value(candidates + 1)).asc(), *self._get_default_search_ordering())
+            )
         if ranked or not self.query.order_by:  # type: ignore[attr-defined]
             # Apply ordering to the results.
-            _ordering = self.query.order_by or model._meta.ordering  # type: ignore[attr-defined]
-            if ranked and name_field:
-                exact = ExpressionWrapper(Q(**{name_field + "__iexact": q}), output_field=BooleanField())
-                startswith = ExpressionWrapper(Q(**{name_field + "__istartswith": q}), output_field=BooleanField())
-                contains = ExpressionWrapper(Q(**{name_field + "__icontains": q}), output_field=BooleanField())
-                ordering = [exact.desc(), startswith.desc(), "-rank", contains.desc(), *_ordering]
-                if q.isnumeric():
-                    # Prepend an ordering for exact pk matches:
-                    ordering.insert(0, ExpressionWrapper(Q(**{pk_name: q}), output_field=BooleanField()).desc())
+            if ranked:
+                results = results.order_by(*self._get_search_ordering(q, name_field))
             else:
-                ordering = ["-rank", *_ordering]
-            results = results.order_by(*ordering)
+                results = results.order_by("-rank", *self._get_default_search_ordering())
         return results
+
+    def _get_default_search_ordering(self) -> List[Any]:
+        """Return the queryset ordering or the model's default ordering."""
+        return list(self.query.order_by or self.model._meta.ordering)  # type: ignore[attr-defined]
+
+    def _get_search_ordering(self, q: str, name_field: Optional[str]) -> List[Any]:
+        """
+        Return the ordering for ranked search results.
+
+        The ordering refers to a 'rank' annotation.
+        """
+        _ordering = self._get_default_search_ordering()
+        if not name_field:
+            return ["-rank", *_ordering]
+        exact = ExpressionWrapper(Q(**{name_field + "__iexact": q}), output_field=BooleanField())
+        startswith = ExpressionWrapper(Q(**{name_field + "__istartswith": q}), output_field=BooleanField())
+        contains = ExpressionWrapper(Q(**{name_field + "__icontains": q}), output_field=BooleanField())
+        ordering = [exact.desc(), startswith.desc(), "-rank", contains.desc(), *_ordering]
+        if q.isnumeric():
+            # Prepend an ordering for exact pk matches:
+            pk_name = self.model._meta.pk.name  # type: ignore[attr-defined]
+            ordering.insert(0, ExpressionWrapper(Q(**{pk_name: q}), output_field=BooleanField()).desc())
+        return ordering
+
+
+def can_count_search_documents(model: Type[Model], q: str) -> bool:
+    """
+    Return whether the search results of the given model for the search term
+    ``q`` can be counted using the global search index.
+
+    The search documents only know the model's own search vector, the label
+    and the id. Models that implement their own search, or that are searched
+    for a standard number, must be counted by searching the model itself.
+    """
+    if not has_search_documents(model):
+        return False
+    # noinspection PyProtectedMember
+    queryset_class = type(model._default_manager.all())
+    if getattr(queryset_class, "search", None) is not TextSearchQuerySetMixin.search:
+        return False
+    return not (getattr(model, "related_search_vectors", None) or _get_stdnum_filters(model, q))
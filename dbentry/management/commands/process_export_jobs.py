@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from dbentry.export.jobs import run_export_job
+from dbentry.models import ExportJob
+
+
+class Command(BaseCommand):
+    requires_migrations_checks = True
+
+    help = (
+        "Runs the queued export jobs. Runs until interrupted, unless --once is given. "
+        "Several workers can run at the same time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=float, default=5, help="The number of seconds to wait when the queue is empty."
+        )
+        parser.add_argument("--once", action="store_true", help="Run the queued jobs until none is left, then exit.")
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=3600,
+            help="The number of seconds after which a running job is marked as failed.",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            default=7,
+            help="The number of days after which finished jobs and their files are deleted (0: keep them).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            job = ExportJob.objects.claim()
+            if job is not None:
+                run_export_job(job)
+                self.stdout.write("Export {} ({}): {}".format(job.pk, job.filename, job.get_status_display()))
+                continue
+            # The queue is empty: clean up.
+            self.clean_up(options["timeout"], options["max_age"])
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+    def clean_up(self, timeout, max_age):
+        """Mark stale running jobs as failed and delete old finished jobs."""
+        if count := ExportJob.objects.fail_stale(timeout):
+            self.stdout.write("{} stale exports marked as failed".format(count))
+        if max_age and (count := ExportJob.objects.delete_finished(max_age * 24 * 60 * 60)):
+            self.stdout.write("{} old exports deleted".format(count))
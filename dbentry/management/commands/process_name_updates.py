@@ -0,0 +1,59 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from dbentry.base.models import ComputedNameModel
+from dbentry.models import NameUpdate
+
+
+class Command(BaseCommand):
+    requires_migrations_checks = True
+
+    help = (
+        "Updates the names of the records in the queue of the name update worker. "
+        "Runs until interrupted, unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="The number of records to update per transaction."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5, help="The number of seconds to wait when the queue is empty."
+        )
+        parser.add_argument("--once", action="store_true", help="Process the queue until it is empty, then exit.")
+        parser.add_argument(
+            "--enqueue-flagged",
+            action="store_true",
+            help="Add every record with the _changed_flag set to the queue before processing it.",
+        )
+        parser.add_argument(
+            "--status", action="store_true", help="Report the size and the lag of the queue, then exit."
+        )
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            self.write_status()
+            return
+        if options["enqueue_flagged"]:
+            for model in apps.get_models():
+                if issubclass(model, ComputedNameModel):
+                    count = NameUpdate.objects.enqueue(model.objects.filter(_changed_flag=True))
+                    # noinspection PyUnresolvedReferences
+                    self.stdout.write("{}: {} records queued".format(model._meta.verbose_name, count))
+        while True:
+            close_old_connections()
+            lag = NameUpdate.objects.lag()
+            count = NameUpdate.objects.process(options["batch_size"])
+            if count:
+                self.stdout.write("{} names processed (lag: {})".format(count, lag))
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+
+    def write_status(self):
+        lag = NameUpdate.objects.lag()
+        self.stdout.write("{} records queued (lag: {})".format(NameUpdate.objects.count(), lag))
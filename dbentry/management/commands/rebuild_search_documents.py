@@ -0,0 +1,25 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dbentry.fts.query import has_search_documents
+from dbentry.models import SearchDocument
+
+
+class Command(BaseCommand):
+    requires_migrations_checks = True
+
+    help = "Rebuilds the search documents of the global search index."
+
+    def handle(self, *args, **options):
+        models = [model for model in apps.get_models() if has_search_documents(model)]
+        with transaction.atomic():
+            # Remove the documents of models that are no longer indexed:
+            SearchDocument.objects.exclude(
+                content_type__in=ContentType.objects.get_for_models(*models).values()
+            ).delete()
+            for model in models:
+                count = SearchDocument.objects.rebuild(model)
+                # noinspection PyUnresolvedReferences
+                self.stdout.write("{}: {} documents".format(model._meta.verbose_name, count))
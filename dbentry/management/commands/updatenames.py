@@ -1,9 +1,85 @@
+import json
+import os
+import time
+from multiprocessing import get_context
+
 from django.apps import apps
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from dbentry.base.models import ComputedNameModel
 
 
+def get_chunks(model, chunk_size, start=None, force=False):
+    """
+    Yield the first primary key, the last primary key and the number of rows of
+    consecutive chunks of the rows of the given model, starting after the
+    primary key ``start``.
+
+    Unless ``force`` is True, only rows with the _changed_flag set are counted.
+    """
+    queryset = model.objects.order_by("pk")
+    if not force:
+        queryset = queryset.filter(_changed_flag=True)
+    while True:
+        chunk = queryset if start is None else queryset.filter(pk__gt=start)
+        pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield pks[0], pks[-1], len(pks)
+        start = pks[-1]
+
+
+def update_chunk(task):
+    """
+    Update the names of the rows of a chunk. Return the number of names
+    updated.
+
+    ``task`` is a tuple of model label, first primary key, last primary key and
+    the force option.
+    """
+    label, first, last, force = task
+    return apps.get_model(label).objects.filter(pk__gte=first, pk__lte=last)._update_names(force=force)
+
+
+class Checkpoint:
+    """
+    The progress of a run, stored in a JSON file.
+
+    For each model, the file stores the primary key of the last row whose
+    chunk has been processed, or True if the model has been processed
+    completely. The checkpoint is only used by runs with the same force
+    option as the run that created it.
+    """
+
+    def __init__(self, path, force):
+        self.path = path
+        self.force = force
+        self.models = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("force") == force:
+                self.models = data.get("models", {})
+
+    def get(self, label):
+        return self.models.get(label)
+
+    def set(self, label, value):
+        self.models[label] = value
+        if not self.path:
+            return
+        # Replace the file in one step so that an interruption cannot leave
+        # an incomplete file behind.
+        with open(self.path + ".tmp", "w") as f:
+            json.dump({"force": self.force, "models": self.models}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def remove(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class Command(BaseCommand):
     requires_migrations_checks = True
 
@@ -13,6 +89,20 @@ class Command(BaseCommand):
         parser.add_argument(  # pragma: no cover
             "-f", "--force", action="store_true", help="Force the update of all model instances."
         )
+        parser.add_argument(  # pragma: no cover
+            "-j", "--jobs", type=int, default=1, help="The number of processes that update the names."
+        )
+        parser.add_argument(  # pragma: no cover
+            "--chunk-size", type=int, default=10000, help="The number of rows that a process updates at a time."
+        )
+        parser.add_argument(  # pragma: no cover
+            "--checkpoint",
+            default="",
+            help=(
+                "The path of a file that records the progress. If the run is interrupted, run the command again "
+                "with the same file to resume. The file is removed when the run is complete."
+            ),
+        )
 
     def handle(self, *args, **options):
         models = [
@@ -20,9 +110,42 @@ class Command(BaseCommand):
             for model in apps.get_models("dbentry")  # FIXME: the app name shouldn't be hardcoded
             if issubclass(model, ComputedNameModel)
         ]
-        for model in models:
-            if options["force"]:
-                model.objects.update(_changed_flag=True)
-            model.objects.all()._update_names()
-            # noinspection PyUnresolvedReferences
-            self.stdout.write("{} updated!".format(model._meta.verbose_name))
+        checkpoint = Checkpoint(options["checkpoint"], options["force"])
+        pool = None
+        if options["jobs"] > 1:
+            # Do not share the database connection with the forked processes.
+            connections.close_all()
+            pool = get_context("fork").Pool(options["jobs"])
+        try:
+            for model in models:
+                self.update_model(model, checkpoint, pool, options)
+        finally:
+            if pool is not None:
+                pool.terminate()
+        checkpoint.remove()
+
+    def update_model(self, model, checkpoint, pool, options):
+        """Update the names of the given model, starting after the checkpoint."""
+        # noinspection PyProtectedMember
+        label, verbose_name = model._meta.label, model._meta.verbose_name
+        start = checkpoint.get(label)
+        if start is True:
+            self.stdout.write("{} skipped (already updated)".format(verbose_name))
+            return
+        chunks = list(get_chunks(model, options["chunk_size"], start=start, force=options["force"]))
+        total = sum(size for _first, _last, size in chunks)
+        tasks = [(label, first, last, options["force"]) for first, last, _size in chunks]
+        results = pool.imap(update_chunk, tasks) if pool is not None else map(update_chunk, tasks)
+        count = rows = 0
+        started = time.monotonic()
+        # The results are returned in the order of the chunks; all rows up to
+        # the last pk of a returned chunk have been processed.
+        for (_first, last, size), updated in zip(chunks, results):
+            count += updated
+            rows += size
+            checkpoint.set(label, last)
+            if options["verbosity"] > 0:
+                rate = rows / max(time.monotonic() - started, 0.001)
+                self.stdout.write("{}: {}/{} rows ({:.0f} rows/s)".format(verbose_name, rows, total, rate), ending="\r")
+        checkpoint.set(label, True)
+        self.stdout.write("{} updated! ({} names)".format(verbose_name, count))
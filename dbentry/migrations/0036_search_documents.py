@@ -0,0 +1,141 @@
+# Generated by Django 4.2.22 on 2026-10-17 02:00
+
+import dbentry.fts.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dbentry', '0035_memorabilie'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('search_vector', dbentry.fts.fields.SearchVectorField()),
+                ('label', models.TextField(blank=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Suchdokument',
+                'verbose_name_plural': 'Suchdokumente',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.AlterField(
+            model_name='artikel',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('schlagzeile', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('zusammenfassung', 'B', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='schlagzeile'),
+        ),
+        migrations.AlterField(
+            model_name='audio',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='audiomedium',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('medium', 'A', 'simple_unaccent')], document_label='medium'),
+        ),
+        migrations.AlterField(
+            model_name='bildreihe',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='buch',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='foto',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='geber',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='herausgeber',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('herausgeber', 'A', 'simple_unaccent')], document_label='herausgeber'),
+        ),
+        migrations.AlterField(
+            model_name='instrument',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('instrument', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('kuerzel', 'A', 'simple_unaccent')], document_label='instrument'),
+        ),
+        migrations.AlterField(
+            model_name='lagerort',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('_name', 'A', 'simple_unaccent')], document_label='_name'),
+        ),
+        migrations.AlterField(
+            model_name='magazin',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('magazin_name', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('issn', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='magazin_name'),
+        ),
+        migrations.AlterField(
+            model_name='memorabilien',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='memotyp',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='ort',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('_name', 'A', 'simple_unaccent')], document_label='_name'),
+        ),
+        migrations.AlterField(
+            model_name='person',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('_name', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='_name'),
+        ),
+        migrations.AlterField(
+            model_name='plakat',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('signatur', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='plattenfirma',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='schriftenreihe',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='veranstaltungsreihe',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('name', 'A', 'simple_unaccent')], document_label='name'),
+        ),
+        migrations.AlterField(
+            model_name='verlag',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('verlag_name', 'A', 'simple_unaccent')], document_label='verlag_name'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('titel', 'A', 'simple_unaccent'), dbentry.fts.fields.WeightedColumn('beschreibung', 'C', 'german_unaccent'), dbentry.fts.fields.WeightedColumn('bemerkungen', 'D', 'simple_unaccent')], document_label='titel'),
+        ),
+        migrations.AlterField(
+            model_name='videomedium',
+            name='_fts',
+            field=dbentry.fts.fields.SearchVectorField(columns=[dbentry.fts.fields.WeightedColumn('medium', 'A', 'simple_unaccent')], document_label='medium'),
+        ),
+    ]
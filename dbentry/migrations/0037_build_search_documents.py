@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from dbentry.fts.query import has_search_documents, insert_search_documents
+
+
+def build_search_documents(apps, schema_editor):
+    # Run this in a separate migration: the table constraints and triggers
+    # created by the previous migration must be in place before inserting data.
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    for model in apps.get_app_config('dbentry').get_models():
+        if has_search_documents(model):
+            content_type, _created = ContentType.objects.get_or_create(
+                app_label=model._meta.app_label, model=model._meta.model_name
+            )
+            insert_search_documents(model, content_type.pk, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0036_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop, elidable=True),
+    ]
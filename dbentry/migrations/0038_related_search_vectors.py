@@ -0,0 +1,69 @@
+# Generated by Django 4.2.22 on 2026-10-17 02:10
+
+import dbentry.fts.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0037_build_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='autor',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('person___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='band',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('bandalias___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='brochure',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('basebrochure_ptr___base_fts', 'simple_unaccent'), ('basebrochure_ptr___base_fts', 'german_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('genrealias___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='kalender',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('basebrochure_ptr___base_fts', 'simple_unaccent'), ('basebrochure_ptr___base_fts', 'german_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='katalog',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('basebrochure_ptr___base_fts', 'simple_unaccent'), ('basebrochure_ptr___base_fts', 'german_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='musiker',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('musikeralias___fts', 'simple_unaccent'), ('person___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='provenienz',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('geber___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='schlagwort',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('schlagwortalias___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='spielort',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('spielortalias___fts', 'simple_unaccent'), ('ort___fts', 'simple_unaccent')]),
+        ),
+        migrations.AddField(
+            model_name='veranstaltung',
+            name='_related_fts',
+            field=dbentry.fts.fields.SearchVectorField(related=[('veranstaltungalias___fts', 'simple_unaccent'), ('spielort___fts', 'simple_unaccent'), ('spielort__ort___fts', 'simple_unaccent')]),
+        ),
+    ]
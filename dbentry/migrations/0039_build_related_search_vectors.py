@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from dbentry.fts.query import _get_related_search_vector_field
+
+
+def build_related_search_vectors(apps, schema_editor):
+    # Run this in a separate migration: the triggers created by the previous
+    # migration must be in place. Resetting the related search vectors makes
+    # the triggers compute them anew.
+    for model in apps.get_app_config('dbentry').get_models():
+        field = _get_related_search_vector_field(model)
+        if field:
+            model.objects.using(schema_editor.connection.alias).update(**{field.name: None})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0038_related_search_vectors'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_related_search_vectors, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,226 @@
+# Generated by Django 4.2.22 on 2026-10-17 02:50
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0039_build_related_search_vectors'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='artikel',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('schlagzeile', output_field=models.TextField())), name='gin_trgm_ops'), name='artikel_2f053_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='audio',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='audio_193cd_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='audiomedium',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('medium', output_field=models.TextField())), name='gin_trgm_ops'), name='audiomedium_7c7f5_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='ausgabe',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_name', output_field=models.TextField())), name='gin_trgm_ops'), name='ausgabe_0ab4c_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='autor',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_name', output_field=models.TextField())), name='gin_trgm_ops'), name='autor_7f71d_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='autorurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='autorurl_097ec_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='band',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('band_name', output_field=models.TextField())), name='gin_trgm_ops'), name='band_ca860_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='bandalias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='bandalias_c31e3_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='bandurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='bandurl_b8f8b_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='basebrochure',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='basebrochure_9c9d8_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='bildreihe',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='bildreihe_7d91a_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='brochureurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='brochureurl_099e8_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='buch',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='buch_3646c_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='bundesland',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('bland_name', output_field=models.TextField())), name='gin_trgm_ops'), name='bundesland_4c1db_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='datei',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='datei_90c9e_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='dokument',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='dokument_d8860_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='foto',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='foto_a17c2_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='geber',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='geber_6d1f6_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('genre', output_field=models.TextField())), name='gin_trgm_ops'), name='genre_9d7d7_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='genrealias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='genrealias_f7148_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='herausgeber',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('herausgeber', output_field=models.TextField())), name='gin_trgm_ops'), name='herausgeber_5f963_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='instrument',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('instrument', output_field=models.TextField())), name='gin_trgm_ops'), name='instrument_9c8fc_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='lagerort',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_name', output_field=models.TextField())), name='gin_trgm_ops'), name='lagerort_fc231_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='land',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('land_name', output_field=models.TextField())), name='gin_trgm_ops'), name='land_986bd_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='magazin',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('magazin_name', output_field=models.TextField())), name='gin_trgm_ops'), name='magazin_281ab_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='magazinurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='magazinurl_af938_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='memorabilien',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='memorabilien_f9721_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='memotyp',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='memotyp_3e70c_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='monat',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('monat', output_field=models.TextField())), name='gin_trgm_ops'), name='monat_20e65_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='musiker',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('kuenstler_name', output_field=models.TextField())), name='gin_trgm_ops'), name='musiker_669a0_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='musikeralias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='musikeralias_bdb88_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='musikerurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='musikerurl_54875_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='ort',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_name', output_field=models.TextField())), name='gin_trgm_ops'), name='ort_f02ab_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_name', output_field=models.TextField())), name='gin_trgm_ops'), name='person_f4aed_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='personurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='personurl_ba08b_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='plakat',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='plakat_9c37b_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='plattenfirma',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='plattenfirma_ad202_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='schlagwort',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('schlagwort', output_field=models.TextField())), name='gin_trgm_ops'), name='schlagwort_67bad_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='schlagwortalias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='schlagwortalias_4a720_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='schriftenreihe',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='schriftenreihe_220e9_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('label', output_field=models.TextField())), name='gin_trgm_ops'), name='searchdocument_ec10b_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='spielort',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='spielort_57ce8_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='spielortalias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='spielortalias_72017_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='spielorturl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='spielorturl_db2a6_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='technik',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='technik_9bea4_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='veranstaltung',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='veranstaltung_0fc0e_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='veranstaltungalias',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('alias', output_field=models.TextField())), name='gin_trgm_ops'), name='veranstaltungalias_892e2_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='veranstaltungsreihe',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('name', output_field=models.TextField())), name='gin_trgm_ops'), name='veranstaltungsreihe_c1614_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='veranstaltungurl',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('url', output_field=models.TextField())), name='gin_trgm_ops'), name='veranstaltungurl_c3a9d_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='verlag',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('verlag_name', output_field=models.TextField())), name='gin_trgm_ops'), name='verlag_b6dd4_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('titel', output_field=models.TextField())), name='gin_trgm_ops'), name='video_c6b90_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='videomedium',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('medium', output_field=models.TextField())), name='gin_trgm_ops'), name='videomedium_6be18_trgm'),
+        ),
+    ]
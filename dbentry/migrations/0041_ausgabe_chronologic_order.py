@@ -0,0 +1,326 @@
+# Generated by Django 4.2.22 on 2026-10-17 03:51
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+# Compute the chronological sort keys of the ausgaben of the given magazines.
+#
+# The ordering strategy is determined per magazine:
+#   - 'jahrgang' comes before 'jahr' if the ausgaben of the magazine have more
+#     jahrgang values than jahr values
+#   - the criteria e_datum, lnum, monat and num are ordered by how many
+#     ausgaben of the magazine have values for them (the default order
+#     decides ties)
+# The sort key of an ausgabe then is the array:
+#   [jahr|jahrgang, jahrgang|jahr, sonderausgabe, criteria...]
+# NULL array elements sort after any other value, like NULL values do in an
+# ascending ORDER BY.
+#
+# The table STRATEGY_TABLE holds the counts that determine the strategy of each
+# magazine, and the strategy itself as the array
+# [jahrgang first (0 or 1), positions of the criteria...]. The triggers add the
+# changes of a statement to the counts; only a rebuild counts the ausgaben of
+# a magazine anew.
+# Only the keys of the given ausgaben are computed anew (NULL meaning: rebuild
+# all ausgaben of the magazines), unless the strategy of their magazine
+# changed: then the keys of all the ausgaben of that magazine are computed
+# anew. Only rows whose key changed are updated.
+STRATEGY_TABLE = "dbentry_ausgabe_chronologic_strategy"
+
+SQL_CREATE_STRATEGY_TABLE = f"""
+CREATE TABLE {STRATEGY_TABLE} (
+ magazin_id integer PRIMARY KEY,
+ total integer NOT NULL DEFAULT 0,
+ jahrgang integer NOT NULL DEFAULT 0,
+ jahr integer NOT NULL DEFAULT 0,
+ e_datum integer NOT NULL DEFAULT 0,
+ lnum integer NOT NULL DEFAULT 0,
+ monat integer NOT NULL DEFAULT 0,
+ num integer NOT NULL DEFAULT 0,
+ strategy integer[]
+)
+"""
+
+COUNT_COLUMNS = ("total", "jahrgang", "jahr", "e_datum", "lnum", "monat", "num")
+
+
+def add_counts_sql(rows):
+    """
+    Return the SQL that adds the counts of the given rows to the counts of the
+    magazines. ``rows`` is a query whose columns are the magazin id and the
+    COUNT_COLUMNS.
+    """
+    columns = ", ".join(COUNT_COLUMNS)
+    sums = ", ".join(f"sum({c})" for c in COUNT_COLUMNS)
+    updates = ", ".join(f"{c} = s.{c} + EXCLUDED.{c}" for c in COUNT_COLUMNS)
+    return (
+        f"INSERT INTO {STRATEGY_TABLE} AS s (magazin_id, {columns}) "
+        f"SELECT magazin_id, {sums} FROM ({rows}) AS r(magazin_id, {columns}) GROUP BY magazin_id "
+        f"ON CONFLICT (magazin_id) DO UPDATE SET {updates}"
+    )
+
+
+def ausgabe_counts_sql(table, sign, where=""):
+    """
+    Return a query for the counts of the ausgaben in ``table`` (the ausgabe
+    table or one of its transition tables), multiplied by ``sign``.
+    """
+    return f"""
+  SELECT t.magazin_id, {sign},
+   {sign} * CASE WHEN t.jahrgang IS NOT NULL THEN greatest(j.jahr_count, 1) ELSE 0 END,
+   {sign} * j.jahr_count,
+   {sign} * (t.e_datum IS NOT NULL)::integer,
+   {sign} * EXISTS(SELECT 1 FROM dbentry_ausgabelnum WHERE ausgabe_id = t.id)::integer,
+   {sign} * EXISTS(SELECT 1 FROM dbentry_ausgabemonat WHERE ausgabe_id = t.id)::integer,
+   {sign} * EXISTS(SELECT 1 FROM dbentry_ausgabenum WHERE ausgabe_id = t.id)::integer
+  FROM {table} t
+  CROSS JOIN LATERAL (SELECT count(*)::integer AS jahr_count FROM dbentry_ausgabejahr WHERE ausgabe_id = t.id) j
+  {where}
+ """
+
+
+SQL_UPDATE_FUNCTION = f"""
+CREATE FUNCTION dbentry_ausgabe_update_chronologic_order(magazin_ids integer[], ausgabe_ids integer[]) RETURNS void AS $$
+DECLARE
+ changed integer[];
+BEGIN
+ PERFORM set_config('dbentry.chronologic_order', 'on', true);
+ IF ausgabe_ids IS NULL THEN
+  -- Rebuild: count the ausgaben of the magazines anew.
+  DELETE FROM {STRATEGY_TABLE} WHERE magazin_id = ANY(magazin_ids);
+  {add_counts_sql(ausgabe_counts_sql("dbentry_ausgabe", 1, "WHERE t.magazin_id = ANY(magazin_ids)"))};
+ END IF;
+ -- Remove the counts of magazines without any ausgaben:
+ DELETE FROM {STRATEGY_TABLE} WHERE magazin_id = ANY(magazin_ids) AND total = 0;
+ WITH strategy AS (
+  SELECT s.magazin_id, ARRAY[(s.jahrgang > s.jahr)::integer] || ARRAY(
+   SELECT c.position FROM (VALUES (1, s.e_datum), (2, s.lnum), (3, s.monat), (4, s.num)) c(position, total)
+   ORDER BY c.total DESC, c.position
+  ) AS strategy
+  FROM {STRATEGY_TABLE} s WHERE s.magazin_id = ANY(magazin_ids)
+ ), stored AS (
+  UPDATE {STRATEGY_TABLE} s SET strategy = strategy.strategy FROM strategy
+  WHERE s.magazin_id = strategy.magazin_id AND s.strategy IS DISTINCT FROM strategy.strategy
+  RETURNING s.magazin_id
+ )
+ SELECT coalesce(array_agg(magazin_id), '{{}}') INTO changed FROM stored;
+
+ WITH ausgabe AS (
+  SELECT a.id, a.magazin_id, a.jahrgang, a.sonderausgabe::integer AS sonderausgabe,
+   a.e_datum - DATE '0001-01-01' AS e_datum, j.jahr, n.num, l.lnum, m.monat
+  FROM dbentry_ausgabe a
+  CROSS JOIN LATERAL (SELECT min(jahr) AS jahr FROM dbentry_ausgabejahr WHERE ausgabe_id = a.id) j
+  CROSS JOIN LATERAL (SELECT max(num) AS num FROM dbentry_ausgabenum WHERE ausgabe_id = a.id) n
+  CROSS JOIN LATERAL (SELECT max(lnum) AS lnum FROM dbentry_ausgabelnum WHERE ausgabe_id = a.id) l
+  CROSS JOIN LATERAL (
+   SELECT max(mo.ordinal) AS monat FROM dbentry_ausgabemonat am
+   JOIN dbentry_monat mo ON mo.id = am.monat_id WHERE am.ausgabe_id = a.id
+  ) m
+  WHERE a.magazin_id = ANY(magazin_ids)
+   AND (ausgabe_ids IS NULL OR a.id = ANY(ausgabe_ids) OR a.magazin_id = ANY(changed))
+ ), keys AS (
+  SELECT a.id, (
+   ARRAY[
+    CASE WHEN s.strategy[1] = 1 THEN a.jahrgang ELSE a.jahr END,
+    CASE WHEN s.strategy[1] = 1 THEN a.jahr ELSE a.jahrgang END,
+    a.sonderausgabe
+   ]::integer[] || ARRAY(
+    SELECT (ARRAY[a.e_datum, a.lnum, a.monat, a.num])[c.position]
+    FROM unnest(s.strategy[2:]) WITH ORDINALITY AS c(position, i)
+    ORDER BY c.i
+   )::integer[]
+  ) AS chronologic_order
+  FROM ausgabe a JOIN {STRATEGY_TABLE} s ON s.magazin_id = a.magazin_id
+ )
+ UPDATE dbentry_ausgabe SET _chronologic_order = keys.chronologic_order FROM keys
+ WHERE dbentry_ausgabe.id = keys.id AND dbentry_ausgabe._chronologic_order IS DISTINCT FROM keys.chronologic_order;
+ PERFORM set_config('dbentry.chronologic_order', '', true);
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Discard any value written to the column that does not come from the update
+# function above (e.g. a stale value of a model instance being saved).
+SQL_KEEP_FUNCTION = """
+CREATE FUNCTION dbentry_ausgabe_keep_chronologic_order() RETURNS trigger AS $$
+BEGIN
+ IF current_setting('dbentry.chronologic_order', true) IS DISTINCT FROM 'on' THEN
+  NEW._chronologic_order := OLD._chronologic_order;
+ END IF;
+ RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Statement level trigger function for the ausgabe table: add the counts of the
+# added ausgaben and subtract the counts of the removed ausgaben, then update
+# the keys of the added ausgaben and of the ausgaben whose ordering fields
+# changed. (The jahr, num, lnum and monat rows of an ausgabe are not changed by
+# statements on the ausgabe table.)
+SQL_AUSGABE_TRIGGER_FUNCTION = f"""
+CREATE FUNCTION dbentry_ausgabe_chronologic_order_trigger() RETURNS trigger AS $$
+DECLARE
+ magazin_ids integer[];
+ ausgabe_ids integer[];
+BEGIN
+ IF current_setting('dbentry.chronologic_order', true) = 'on' THEN RETURN NULL; END IF;
+ IF (TG_OP = 'INSERT') THEN
+  magazin_ids := ARRAY(SELECT DISTINCT magazin_id FROM new_rows);
+  ausgabe_ids := ARRAY(SELECT id FROM new_rows);
+  {add_counts_sql(ausgabe_counts_sql("new_rows", 1))};
+ ELSIF (TG_OP = 'DELETE') THEN
+  magazin_ids := ARRAY(SELECT DISTINCT magazin_id FROM old_rows);
+  ausgabe_ids := '{{}}';
+  {add_counts_sql(ausgabe_counts_sql("old_rows", -1))};
+ ELSE
+  ausgabe_ids := ARRAY(
+   SELECT n.id FROM new_rows n JOIN old_rows o ON o.id = n.id
+   WHERE (n.magazin_id, n.jahrgang, n.sonderausgabe, n.e_datum)
+    IS DISTINCT FROM (o.magazin_id, o.jahrgang, o.sonderausgabe, o.e_datum)
+  );
+  magazin_ids := ARRAY(
+   SELECT DISTINCT unnest(ARRAY[n.magazin_id, o.magazin_id]) FROM new_rows n JOIN old_rows o ON o.id = n.id
+   WHERE n.id = ANY(ausgabe_ids)
+  );
+  IF cardinality(ausgabe_ids) > 0 THEN
+   {add_counts_sql(
+       ausgabe_counts_sql("new_rows", 1, "WHERE t.id = ANY(ausgabe_ids)")
+       + " UNION ALL "
+       + ausgabe_counts_sql("old_rows", -1, "WHERE t.id = ANY(ausgabe_ids)")
+   )};
+  END IF;
+ END IF;
+ IF cardinality(magazin_ids) > 0 THEN
+  PERFORM dbentry_ausgabe_update_chronologic_order(magazin_ids, ausgabe_ids);
+ END IF;
+ RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def related_trigger_function_sql(table, counts):
+    """
+    Return the SQL for the statement level trigger function of the given table
+    (jahr, num, lnum or monat): add the changes of the counts of the ausgaben
+    of the added, changed or removed rows, then update their keys.
+
+    ``counts`` maps COUNT_COLUMNS to expressions for the change of that count
+    of an ausgabe, given the number of rows of the ausgabe in the table after
+    the statement (n) and the change of that number (d).
+    """
+    values = ", ".join(counts.get(c, "0") for c in COUNT_COLUMNS)
+    return f"""
+CREATE FUNCTION {table}_chronologic_order_trigger() RETURNS trigger AS $$
+DECLARE
+ added integer[] := '{{}}';
+ removed integer[] := '{{}}';
+ ausgabe_ids integer[];
+BEGIN
+ IF (TG_OP IN ('INSERT', 'UPDATE')) THEN
+  added := ARRAY(SELECT ausgabe_id FROM new_rows);
+ END IF;
+ IF (TG_OP IN ('DELETE', 'UPDATE')) THEN
+  removed := ARRAY(SELECT ausgabe_id FROM old_rows);
+ END IF;
+ WITH change AS (
+  SELECT c.id, sum(c.d)::integer AS d
+  FROM (SELECT unnest(added), 1 UNION ALL SELECT unnest(removed), -1) AS c(id, d)
+  GROUP BY c.id
+ ), ausgabe AS (
+  SELECT a.magazin_id, a.jahrgang, c.d, (SELECT count(*)::integer FROM {table} WHERE ausgabe_id = a.id) AS n
+  FROM change c JOIN dbentry_ausgabe a ON a.id = c.id
+  WHERE c.d <> 0
+ )
+ {add_counts_sql(f"SELECT magazin_id, {values} FROM ausgabe")};
+ ausgabe_ids := ARRAY(SELECT DISTINCT unnest(added || removed));
+ PERFORM dbentry_ausgabe_update_chronologic_order(
+  ARRAY(SELECT DISTINCT magazin_id FROM dbentry_ausgabe WHERE id = ANY(ausgabe_ids)), ausgabe_ids
+ );
+ RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+# The change of the 'has values' count of an ausgabe:
+HAS_VALUES_CHANGE = "(n > 0)::integer - (n - d > 0)::integer"
+
+RELATED_COUNTS = {
+    "dbentry_ausgabejahr": {
+        "jahrgang": "CASE WHEN jahrgang IS NOT NULL THEN greatest(n, 1) - greatest(n - d, 1) ELSE 0 END",
+        "jahr": "d",
+    },
+    "dbentry_ausgabelnum": {"lnum": HAS_VALUES_CHANGE},
+    "dbentry_ausgabemonat": {"monat": HAS_VALUES_CHANGE},
+    "dbentry_ausgabenum": {"num": HAS_VALUES_CHANGE},
+}
+
+TRIGGER_TABLES = [("dbentry_ausgabe", "dbentry_ausgabe_chronologic_order_trigger")] + [
+    (table, f"{table}_chronologic_order_trigger") for table in RELATED_COUNTS
+]
+
+# Transition tables can only be declared for triggers with a single event.
+TRIGGER_EVENTS = [
+    ("insert", "INSERT", "NEW TABLE AS new_rows"),
+    ("update", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("delete", "DELETE", "OLD TABLE AS old_rows"),
+]
+
+
+def create_triggers_sql():
+    statements = [
+        SQL_CREATE_STRATEGY_TABLE,
+        SQL_UPDATE_FUNCTION,
+        SQL_KEEP_FUNCTION,
+        SQL_AUSGABE_TRIGGER_FUNCTION,
+    ]
+    statements.extend(related_trigger_function_sql(table, counts) for table, counts in RELATED_COUNTS.items())
+    statements.append(
+        "CREATE TRIGGER dbentry_ausgabe_keep_chronologic_order BEFORE UPDATE OF _chronologic_order "
+        "ON dbentry_ausgabe FOR EACH ROW EXECUTE FUNCTION dbentry_ausgabe_keep_chronologic_order()"
+    )
+    for table, function in TRIGGER_TABLES:
+        for suffix, event, referencing in TRIGGER_EVENTS:
+            statements.append(
+                f"CREATE TRIGGER {table}_chronologic_order_{suffix} AFTER {event} ON {table} "
+                f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+            )
+    statements.append("SELECT dbentry_ausgabe_update_chronologic_order(ARRAY(SELECT id FROM dbentry_magazin), NULL)")
+    return statements
+
+
+def drop_triggers_sql():
+    statements = ["DROP TRIGGER IF EXISTS dbentry_ausgabe_keep_chronologic_order ON dbentry_ausgabe"]
+    for table, _function in TRIGGER_TABLES:
+        for suffix, _event, _referencing in TRIGGER_EVENTS:
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_chronologic_order_{suffix} ON {table}")
+    for _table, function in TRIGGER_TABLES:
+        statements.append(f"DROP FUNCTION IF EXISTS {function}()")
+    for function in (
+        "dbentry_ausgabe_update_chronologic_order(integer[], integer[])",
+        "dbentry_ausgabe_keep_chronologic_order()",
+    ):
+        statements.append(f"DROP FUNCTION IF EXISTS {function}")
+    statements.append(f"DROP TABLE IF EXISTS {STRATEGY_TABLE}")
+    return statements
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0040_name_field_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ausgabe',
+            name='_chronologic_order',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, editable=False, null=True, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='ausgabe',
+            index=models.Index(fields=['magazin', '_chronologic_order', '-id'], name='ausgabe_chronologic_order_idx'),
+        ),
+        migrations.RunSQL(create_triggers_sql(), drop_triggers_sql()),
+    ]
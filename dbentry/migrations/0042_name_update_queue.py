@@ -0,0 +1,30 @@
+# Generated by Django 4.2.22 on 2026-10-17 04:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dbentry', '0041_ausgabe_chronologic_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NameUpdate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Namensaktualisierung',
+                'verbose_name_plural': 'Namensaktualisierungen',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+    ]
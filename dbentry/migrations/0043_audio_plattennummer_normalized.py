@@ -0,0 +1,50 @@
+# Generated by Django 4.2.22 on 2026-10-17 04:54
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+# Keep the column _plattennummer_normalized in sync with the plattennummer:
+# remove any special characters and spaces. The trigger only fires for updates
+# that include the plattennummer column.
+SQL_FUNCTION = r"""
+CREATE FUNCTION dbentry_audio_normalize_plattennummer() RETURNS trigger AS $$
+BEGIN
+ NEW._plattennummer_normalized := regexp_replace(NEW.plattennummer, '\W', '', 'g');
+ RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SQL_TRIGGER = (
+    "CREATE TRIGGER dbentry_audio_normalize_plattennummer BEFORE INSERT OR UPDATE OF plattennummer ON dbentry_audio "
+    "FOR EACH ROW EXECUTE FUNCTION dbentry_audio_normalize_plattennummer()"
+)
+
+SQL_UPDATE = r"UPDATE dbentry_audio SET _plattennummer_normalized = regexp_replace(plattennummer, '\W', '', 'g')"
+
+SQL_DROP = [
+    "DROP TRIGGER IF EXISTS dbentry_audio_normalize_plattennummer ON dbentry_audio",
+    "DROP FUNCTION IF EXISTS dbentry_audio_normalize_plattennummer()",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0042_name_update_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='audio',
+            name='_plattennummer_normalized',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunSQL([SQL_FUNCTION, SQL_TRIGGER, SQL_UPDATE], SQL_DROP),
+        migrations.AddIndex(
+            model_name='audio',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('_plattennummer_normalized', output_field=models.TextField())), name='gin_trgm_ops'), name='audio_plattennummer_trgm'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+from dbentry.fields import StdNumField
+
+BATCH_SIZE = 1000
+
+
+def get_stdnum_fields(apps):
+    for model in apps.get_app_config('dbentry').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, StdNumField):
+                yield model, field
+
+
+def normalize_values(apps, schema_editor):
+    # Store the values in their compact canonical form. Invalid values are
+    # left as they are.
+    db_alias = schema_editor.connection.alias
+    for model, field in get_stdnum_fields(apps):
+        queryset = model.objects.using(db_alias).exclude(**{field.name: ''}).only('pk', field.name)
+        changed = []
+        for obj in queryset.iterator(chunk_size=BATCH_SIZE):
+            value = getattr(obj, field.attname)
+            canonical = field.get_canonical_value(value)
+            if canonical and canonical != value:
+                setattr(obj, field.attname, canonical)
+                changed.append(obj)
+            if len(changed) >= BATCH_SIZE:
+                model.objects.using(db_alias).bulk_update(changed, [field.name])
+                changed = []
+        if changed:
+            model.objects.using(db_alias).bulk_update(changed, [field.name])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0043_audio_plattennummer_normalized'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_values, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.22 on 2026-10-17 07:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0045_export_job'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='ausgabe',
+            options={'base_manager_name': 'objects', 'default_permissions': ('add', 'change', 'delete', 'merge', 'view'), 'ordering': ['magazin'], 'verbose_name': 'Ausgabe', 'verbose_name_plural': 'Ausgaben'},
+        ),
+        migrations.AlterModelOptions(
+            name='autor',
+            options={'base_manager_name': 'objects', 'default_permissions': ('add', 'change', 'delete', 'merge', 'view'), 'ordering': ['_name'], 'verbose_name': 'Autor', 'verbose_name_plural': 'Autoren'},
+        ),
+        migrations.AlterModelOptions(
+            name='lagerort',
+            options={'base_manager_name': 'objects', 'default_permissions': ('add', 'change', 'delete', 'merge', 'view'), 'ordering': ['_name'], 'verbose_name': 'Lagerort', 'verbose_name_plural': 'Lagerorte'},
+        ),
+        migrations.AlterModelOptions(
+            name='ort',
+            options={'base_manager_name': 'objects', 'default_permissions': ('add', 'change', 'delete', 'merge', 'view'), 'ordering': ['land', 'bland', 'stadt'], 'verbose_name': 'Ort', 'verbose_name_plural': 'Orte'},
+        ),
+        migrations.AlterModelOptions(
+            name='person',
+            options={'base_manager_name': 'objects', 'default_permissions': ('add', 'change', 'delete', 'merge', 'view'), 'ordering': ['_name'], 'verbose_name': 'Person', 'verbose_name_plural': 'Personen'},
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.22 on 2026-10-17 07:27
+
+import dbentry.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0046_cn_base_manager'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='buch',
+            name='EAN',
+            field=dbentry.fields.EANField(blank=True, db_index=True, max_length=17),
+        ),
+        migrations.AlterField(
+            model_name='buch',
+            name='ISBN',
+            field=dbentry.fields.ISBNField(blank=True, db_index=True, max_length=17),
+        ),
+        migrations.AlterField(
+            model_name='magazin',
+            name='issn',
+            field=dbentry.fields.ISSNField(blank=True, db_index=True, help_text='EAN (Barcode Nummer) Angaben erlaubt. Die ISSN wird dann daraus ermittelt.', max_length=9, verbose_name='ISSN'),
+        ),
+    ]
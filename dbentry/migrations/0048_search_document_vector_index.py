@@ -0,0 +1,18 @@
+# Generated by Django 4.2.22 on 2026-10-17 08:39
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dbentry', '0047_stdnum_db_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='searchdocument_vector_idx'),
+        ),
+    ]
@@ -1,16 +1,28 @@
 # TODO: Semantik buch.buchband: Einzelbänder/Aufsätze: Teile eines Buchbandes
 from typing import Optional
 
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import Count, Exists, OuterRef, Subquery
+from django.utils import timezone
 
 import dbentry.m2m as _m2m
 from dbentry.base.models import AbstractJahrModel, AbstractURLModel, BaseAliasModel, BaseModel, ComputedNameModel
 from dbentry.fields import EANField, ISBNField, ISSNField, PartialDateField, YearField
 from dbentry.fts.fields import SearchVectorField, WeightedColumn
+from dbentry.fts.indexes import trigram_expression
 from dbentry.fts.query import SIMPLE, STEMMING
-from dbentry.query import AusgabeQuerySet, AudioQuerySet
+from dbentry.query import (
+    MONAT_ABKUERZUNGEN,
+    AusgabeQuerySet,
+    AudioQuerySet,
+    ExportJobQuerySet,
+    NameUpdateQuerySet,
+    SearchDocumentQuerySet,
+)
 from dbentry.utils.models import get_model_fields, get_model_relations
 from dbentry.utils.query import array_to_string, limit, string_list, to_array
 from dbentry.utils.text import concat_limit
@@ -41,7 +53,8 @@ class Person(ComputedNameModel):
             WeightedColumn("_name", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="_name",
     )
 
     name_composing_fields = ["vorname", "nachname"]
@@ -109,6 +122,7 @@ class Musiker(BaseModel):
     create_field = "kuenstler_name"
     name_field = "kuenstler_name"
     related_search_vectors = [("musikeralias___fts", SIMPLE), ("person___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseModel.Meta):
         verbose_name = "Musiker"
@@ -152,6 +166,7 @@ class Genre(BaseModel):
     create_field = "genre"
     name_field = "genre"
     related_search_vectors = [("genrealias___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseModel.Meta):
         verbose_name = "Genre"
@@ -193,6 +208,7 @@ class Band(BaseModel):
     create_field = "band_name"
     name_field = "band_name"
     related_search_vectors = [("bandalias___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseModel.Meta):
         verbose_name = "Band"
@@ -241,6 +257,7 @@ class Autor(ComputedNameModel):
 
     name_composing_fields = ["person___name", "kuerzel"]
     related_search_vectors = [("person___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
     select_related = ("person",)
 
     class Meta(ComputedNameModel.Meta):
@@ -328,6 +345,11 @@ class Ausgabe(ComputedNameModel):
         ]
     )
 
+    # The sort key for the chronological order of the ausgaben of a magazin.
+    # The key is maintained by database triggers; see migration
+    # 0041_ausgabe_chronologic_order and AusgabeQuerySet.chronological_order.
+    _chronologic_order = ArrayField(models.IntegerField(), editable=False, null=True, blank=True)
+
     name_composing_fields = [
         "beschreibung",
         "sonderausgabe",
@@ -348,6 +370,9 @@ class Ausgabe(ComputedNameModel):
         verbose_name = "Ausgabe"
         verbose_name_plural = "Ausgaben"
         ordering = ["magazin"]
+        indexes = [
+            models.Index(fields=["magazin", "_chronologic_order", "-id"], name="ausgabe_chronologic_order_idx"),
+        ]
 
     def save(self, update=True, *args, **kwargs):
         super().save()
@@ -403,11 +428,10 @@ class Ausgabe(ComputedNameModel):
                 sep="/",
             )
         if "ausgabemonat__monat__abk" in data:
-            monat_ordering = ["Jan", "Feb", "Mrz", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep", "Okt", "Nov", "Dez"]
             # Sort the month abbreviations according to the calendar.
             monate = sorted(  # type: ignore[assignment]
                 data["ausgabemonat__monat__abk"],
-                key=lambda abk: monat_ordering.index(abk) + 1 if abk in monat_ordering else 0,
+                key=lambda abk: MONAT_ABKUERZUNGEN.index(abk) + 1 if abk in MONAT_ABKUERZUNGEN else 0,
             )
             monate = concat_limit(monate, sep="/")
         # 'ausgaben_merkmal' acts as an override to what attribute should make
@@ -568,7 +592,10 @@ class Magazin(BaseModel):
     )
     fanzine = models.BooleanField("Fanzine", default=False)
     issn = ISSNField(  # TODO: rename to 'ISBN' (Buch also uses all capitalized ISBN/EAN)
-        "ISSN", blank=True, help_text="EAN (Barcode Nummer) Angaben erlaubt. Die ISSN wird dann daraus ermittelt."
+        "ISSN",
+        blank=True,
+        db_index=True,
+        help_text="EAN (Barcode Nummer) Angaben erlaubt. Die ISSN wird dann daraus ermittelt.",
     )
     beschreibung = models.TextField(blank=True, help_text="Beschreibung bzgl. des Magazines")
     bemerkungen = models.TextField(blank=True, help_text="Kommentare für Archiv-Mitarbeiter")
@@ -584,7 +611,8 @@ class Magazin(BaseModel):
             WeightedColumn("issn", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="magazin_name",
     )
 
     create_field = "magazin_name"
@@ -615,7 +643,8 @@ class Verlag(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("verlag_name", "A", SIMPLE),
-        ]
+        ],
+        document_label="verlag_name",
     )
 
     create_field = "verlag_name"
@@ -637,7 +666,8 @@ class Ort(ComputedNameModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("_name", "A", SIMPLE),
-        ]
+        ],
+        document_label="_name",
     )
 
     name_composing_fields = ["stadt", "land__land_name", "bland__bland_name", "land__code", "bland__code"]
@@ -740,6 +770,7 @@ class Schlagwort(BaseModel):
     create_field = "schlagwort"
     name_field = "schlagwort"
     related_search_vectors = [("schlagwortalias___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseModel.Meta):
         verbose_name = "Schlagwort"
@@ -797,7 +828,8 @@ class Artikel(BaseModel):
             WeightedColumn("zusammenfassung", "B", STEMMING),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="schlagzeile",
     )
 
     name_field = "schlagzeile"
@@ -841,8 +873,8 @@ class Buch(BaseModel):
     jahr = YearField("Jahr", null=True, blank=True)
     jahr_orig = YearField("Jahr (Original)", null=True, blank=True)
     auflage = models.CharField(max_length=200, blank=True)
-    EAN = EANField(blank=True)
-    ISBN = ISBNField(blank=True)
+    EAN = EANField(blank=True, db_index=True)
+    ISBN = ISBNField(blank=True, db_index=True)
     is_buchband = models.BooleanField(
         default=False,
         verbose_name="Ist Sammelband",
@@ -881,7 +913,8 @@ class Buch(BaseModel):
             WeightedColumn("titel", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -909,7 +942,8 @@ class Herausgeber(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("herausgeber", "A", SIMPLE),
-        ]
+        ],
+        document_label="herausgeber",
     )
 
     name_field = "herausgeber"
@@ -929,7 +963,8 @@ class Instrument(BaseModel):
         columns=[
             WeightedColumn("instrument", "A", SIMPLE),
             WeightedColumn("kuerzel", "A", SIMPLE),
-        ]
+        ],
+        document_label="instrument",
     )
 
     name_field = "instrument"
@@ -960,6 +995,9 @@ class Audio(BaseModel):
         "Originalmaterial", default=False, help_text="Ist das vorliegende Material ein Original?"
     )
     plattennummer = models.CharField(max_length=200, blank=True)
+    # The plattennummer without special characters and spaces, maintained by a
+    # database trigger. Used by AudioQuerySet to filter by plattennummer.
+    _plattennummer_normalized = models.CharField(max_length=200, editable=False, blank=True, default="")
     release_id = models.PositiveIntegerField("Release ID (discogs)", blank=True, null=True)
     discogs_url = models.URLField(
         "Link discogs.com", blank=True, help_text="Adresse zur discogs.com Seite dieses Objektes."
@@ -994,7 +1032,8 @@ class Audio(BaseModel):
             WeightedColumn("titel", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -1006,6 +1045,12 @@ class Audio(BaseModel):
         ordering = ["titel"]
         verbose_name = "Audio Material"
         verbose_name_plural = "Audio Materialien"
+        indexes = [
+            GinIndex(
+                OpClass(trigram_expression("_plattennummer_normalized"), name="gin_trgm_ops"),
+                name="audio_plattennummer_trgm",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.titel)
@@ -1023,7 +1068,8 @@ class AudioMedium(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("medium", "A", SIMPLE),
-        ]
+        ],
+        document_label="medium",
     )
 
     create_field = "medium"
@@ -1069,7 +1115,8 @@ class Plakat(BaseModel):
             WeightedColumn("signatur", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -1090,7 +1137,8 @@ class Bildreihe(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("name", "A", SIMPLE),
-        ]
+        ],
+        document_label="name",
     )
 
     create_field = "name"
@@ -1108,7 +1156,8 @@ class Schriftenreihe(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("name", "A", SIMPLE),
-        ]
+        ],
+        document_label="name",
     )
 
     create_field = "name"
@@ -1172,7 +1221,8 @@ class Memorabilien(BaseModel):
             WeightedColumn("titel", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -1192,7 +1242,7 @@ class Memorabilien(BaseModel):
 class MemoTyp(BaseModel):
     name = models.CharField("Typ", max_length=100, unique=True)
 
-    _fts = SearchVectorField(columns=[WeightedColumn("name", "A", SIMPLE)])
+    _fts = SearchVectorField(columns=[WeightedColumn("name", "A", SIMPLE)], document_label="name")
 
     create_field = "name"
     name_field = "name"
@@ -1220,6 +1270,7 @@ class Spielort(BaseModel):
 
     name_field = "name"
     related_search_vectors = [("spielortalias___fts", SIMPLE), ("ort___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
     select_related = ("ort",)
 
     class Meta(BaseModel.Meta):
@@ -1304,6 +1355,7 @@ class Veranstaltung(BaseModel):
         ("spielort___fts", SIMPLE),
         ("spielort__ort___fts", SIMPLE),
     ]
+    _related_fts = SearchVectorField(related=related_search_vectors)
     select_related = ("spielort", "reihe")
 
     class Meta(BaseModel.Meta):
@@ -1341,7 +1393,8 @@ class Veranstaltungsreihe(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("name", "A", SIMPLE),
-        ]
+        ],
+        document_label="name",
     )
 
     create_field = "name"
@@ -1398,7 +1451,8 @@ class Video(BaseModel):
             WeightedColumn("titel", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -1422,7 +1476,8 @@ class VideoMedium(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("medium", "A", SIMPLE),
-        ]
+        ],
+        document_label="medium",
     )
 
     create_field = "medium"
@@ -1448,6 +1503,7 @@ class Provenienz(BaseModel):
 
     name_field = "geber__name"
     related_search_vectors = [("geber___fts", SIMPLE)]
+    _related_fts = SearchVectorField(related=related_search_vectors)
     select_related = ("geber",)
 
     class Meta(BaseModel.Meta):
@@ -1462,7 +1518,7 @@ class Provenienz(BaseModel):
 class Geber(BaseModel):
     name = models.CharField(max_length=200)
 
-    _fts = SearchVectorField(columns=[WeightedColumn("name", "A", SIMPLE)])
+    _fts = SearchVectorField(columns=[WeightedColumn("name", "A", SIMPLE)], document_label="name")
 
     name_field = create_field = "name"
 
@@ -1482,12 +1538,13 @@ class Lagerort(ComputedNameModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("_name", "A", SIMPLE),
-        ]
+        ],
+        document_label="_name",
     )
 
     name_composing_fields = ["ort", "raum", "regal", "fach"]
 
-    class Meta(BaseModel.Meta):
+    class Meta(ComputedNameModel.Meta):
         verbose_name = "Lagerort"
         verbose_name_plural = "Lagerorte"
         ordering = ["_name"]
@@ -1639,7 +1696,8 @@ class Plattenfirma(BaseModel):
     _fts = SearchVectorField(
         columns=[
             WeightedColumn("name", "A", SIMPLE),
-        ]
+        ],
+        document_label="name",
     )
 
     name_field = create_field = "name"
@@ -1721,6 +1779,7 @@ class Brochure(BaseBrochure):
         ("basebrochure_ptr___base_fts", SIMPLE),
         ("basebrochure_ptr___base_fts", STEMMING),
     ]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseBrochure.Meta):
         verbose_name = "Broschüre"
@@ -1739,6 +1798,7 @@ class Kalender(BaseBrochure):
         ("basebrochure_ptr___base_fts", SIMPLE),
         ("basebrochure_ptr___base_fts", STEMMING),
     ]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseBrochure.Meta):
         verbose_name = "Programmheft"
@@ -1762,6 +1822,7 @@ class Katalog(BaseBrochure):
         ("basebrochure_ptr___base_fts", SIMPLE),
         ("basebrochure_ptr___base_fts", STEMMING),
     ]
+    _related_fts = SearchVectorField(related=related_search_vectors)
 
     class Meta(BaseBrochure.Meta):
         verbose_name = "Warenkatalog"
@@ -1800,7 +1861,8 @@ class Foto(BaseModel):
             WeightedColumn("titel", "A", SIMPLE),
             WeightedColumn("beschreibung", "C", STEMMING),
             WeightedColumn("bemerkungen", "D", SIMPLE),
-        ]
+        ],
+        document_label="titel",
     )
 
     name_field = "titel"
@@ -1813,3 +1875,109 @@ class Foto(BaseModel):
     @staticmethod
     def get_overview_annotations() -> dict:
         return {"schlagwort_list": string_list("schlagwort__schlagwort")}
+
+
+class SearchDocument(models.Model):
+    """
+    A document of the global search index.
+
+    The records of every model whose SearchVectorField declares a
+    ``document_label`` are represented by a document in this table. The
+    documents are kept up to date by the database triggers of the search vector
+    fields (see dbentry.fts.db.schema.MIZDBTriggerEditor).
+
+    Use the management command ``rebuild_search_documents`` to rebuild the
+    table.
+    """
+
+    content_type = models.ForeignKey("contenttypes.ContentType", models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    search_vector = SearchVectorField()
+    label = models.TextField(blank=True)
+
+    name_field = "label"
+
+    objects = SearchDocumentQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("content_type", "object_id")
+        indexes = [GinIndex(fields=["search_vector"], name="searchdocument_vector_idx")]
+        verbose_name = "Suchdokument"
+        verbose_name_plural = "Suchdokumente"
+
+
+class NameUpdate(models.Model):
+    """
+    A record of a ComputedNameModel whose name must be updated.
+
+    This is the queue of the name update worker: if the NAME_UPDATE_WORKER
+    setting is True, CNQuerySet adds the records whose ``_changed_flag`` it
+    sets to this table, and the management command ``process_name_updates``
+    updates their names in batches.
+    """
+
+    content_type = models.ForeignKey("contenttypes.ContentType", models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    created = models.DateTimeField(default=timezone.now)
+
+    objects = NameUpdateQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("content_type", "object_id")
+        verbose_name = "Namensaktualisierung"
+        verbose_name_plural = "Namensaktualisierungen"
+
+
+class ExportJob(models.Model):
+    """
+    An export of records that is run in the background.
+
+    If the EXPORT_JOB_WORKER setting is True, the export views add a job to
+    this table instead of exporting the records within the request. The
+    management command ``process_export_jobs`` runs the jobs and saves the
+    export files, which the users can download from the page of their exports.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = ("queued", "wartet")
+        RUNNING = ("running", "läuft")
+        DONE = ("done", "fertig")
+        FAILED = ("failed", "fehlgeschlagen")
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, models.CASCADE)
+    content_type = models.ForeignKey("contenttypes.ContentType", models.CASCADE)
+    # The primary keys of the records to export; None for all records.
+    object_ids = ArrayField(models.PositiveIntegerField(), null=True, blank=True)
+    # The import path of the resource class:
+    resource = models.CharField(max_length=200)
+    export_fields = ArrayField(models.CharField(max_length=200), default=list, blank=True)
+    # The name of the format class (see import_export.formats.base_formats):
+    file_format = models.CharField(max_length=20)
+    filename = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    file = models.FileField(upload_to="exports/", blank=True)
+    error = models.TextField(blank=True)
+    created = models.DateTimeField(default=timezone.now)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    objects = ExportJobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created", "-id"]
+        indexes = [
+            models.Index(fields=["created", "id"], condition=models.Q(status="queued"), name="exportjob_queued_idx")
+        ]
+        verbose_name = "Export"
+        verbose_name_plural = "Exporte"
+
+    def __str__(self) -> str:
+        return self.filename
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return the queryset of the records to export."""
+        # noinspection PyUnresolvedReferences
+        queryset = self.content_type.model_class()._default_manager.all()
+        if self.object_ids is not None:
+            queryset = queryset.filter(pk__in=self.object_ids)
+        return queryset
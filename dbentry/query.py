@@ -2,16 +2,30 @@ import calendar
 import datetime
 import re
 from collections import OrderedDict
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 from typing import OrderedDict as OrderedDictType
 
-from django.core.exceptions import FieldDoesNotExist
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
 from django.core.validators import EMPTY_VALUES
-from django.db import transaction
-from django.db.models import Count, Exists, Max, Min, Model, OuterRef, Q, QuerySet, Value, Func, F
+from django.db import connections, transaction
+from django.db.models import Count, Model, Q, QuerySet, Min
 from django.db.models.constants import LOOKUP_SEP
-
-from dbentry.fts.query import TextSearchQuerySetMixin
+from django.db.models.lookups import Exact
+from django.db.models.query import ModelIterable
+from django.db.models.sql.where import AND
+from django.utils import timezone
+
+from dbentry.fts.indexes import trigram_expression
+from dbentry.fts.query import (
+    TextSearchQuerySetMixin,
+    _get_pk_values,
+    _get_search_vector_field,
+    insert_search_documents,
+)
 from dbentry.utils import add_attrs
 from dbentry.utils.dates import leapdays
 
@@ -137,28 +151,115 @@ class MIZQuerySet(TextSearchQuerySetMixin, QuerySet):
         return self.annotate(**{name: Count(relation)}).order_by(*ordering)
 
 
+def update_instance_names(objs: Iterable[Model]) -> None:
+    """
+    Update the names of the given ComputedNameModel instances whose
+    ``_changed_flag`` is set, including the instances of ComputedNameModels
+    that are cached on them as related objects (select_related).
+
+    For each model, the name data of the instances is fetched with one query
+    and the names are written with one UPDATE statement.
+    """
+    from dbentry.base.models import ComputedNameModel  # avoid circular imports
+
+    dirty: Dict[Tuple[Type[Model], str], Dict[Any, List[Model]]] = {}
+    seen = set()
+    stack = list(objs)
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        stack.extend(obj._state.fields_cache.values())
+        if not isinstance(obj, ComputedNameModel) or obj.pk is None:
+            continue
+        deferred = obj.get_deferred_fields()
+        if "_name" in deferred or "_changed_flag" not in deferred and not obj._changed_flag:
+            # Like ComputedNameModel.update_name, ignore instances without the
+            # name field. If the _changed_flag was loaded, it tells whether an
+            # update is needed; otherwise the database has to be asked.
+            continue
+        dirty.setdefault((type(obj), obj._state.db), {}).setdefault(obj.pk, []).append(obj)
+    for (model, db), instances in dirty.items():
+        # noinspection PyUnresolvedReferences
+        queryset = model.objects.using(db)
+        names = queryset.filter(pk__in=list(instances), _changed_flag=True)._compute_names()
+        queryset._write_names(names)
+        for pk, name in names:
+            for obj in instances[pk]:
+                obj._name = name
+                obj._changed_flag = False
+
+
+class CNModelIterable(ModelIterable):
+    """
+    Iterable for CNQuerySet that updates the names of the dirty instances.
+
+    The instances are fetched in chunks (of the chunk size of the queryset
+    iterator), and the names of the instances of a chunk are updated with
+    update_instance_names before the instances are yielded.
+    """
+
+    def __iter__(self) -> Any:
+        iterator = super().__iter__()
+        while True:
+            objs = list(islice(iterator, self.chunk_size))
+            if not objs:
+                return
+            if not settings.NAME_UPDATE_WORKER:
+                update_instance_names(objs)
+            yield from objs
+
+
 class CNQuerySet(MIZQuerySet):
+    """
+    Queryset for ComputedNameModels.
+
+    Names of rows with the ``_changed_flag`` set are updated lazily, when the
+    names are about to be read, or when the model instances are fetched (see
+    CNModelIterable). If the NAME_UPDATE_WORKER setting is True, the
+    rows are instead added to the queue of the name update worker (see
+    NameUpdateQuerySet and the ``process_name_updates`` command), and read
+    paths never update names.
+
+    Attributes:
+        - name_update_batch_size (int): the number of names that are computed
+          and written per UPDATE statement by _update_names
+    """
+
     # TODO: shouldn't get() update the name just like filter?
 
+    name_update_batch_size = 1000
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._iterable_class = CNModelIterable
+
     def bulk_create(self, objs: Iterable[Model], **kwargs: Any) -> List[Model]:
         # Set the _changed_flag on the objects to be created
+        objs = list(objs)
         for obj in objs:
             obj._changed_flag = True
-        return super().bulk_create(objs, **kwargs)
+        created = super().bulk_create(objs, **kwargs)
+        if settings.NAME_UPDATE_WORKER:
+            pks = [obj.pk for obj in created if obj.pk is not None]
+            if pks:
+                self._enqueue_names(self.filter(pk__in=pks))
+        return created
 
     def defer(self, *fields: str) -> MIZQuerySet:
         if "_name" not in fields:
-            self._update_names()
+            self._refresh_names()
         return super().defer(*fields)
 
     def filter(self, *args: Any, **kwargs: Any) -> MIZQuerySet:
         if any(k.startswith("_name") for k in kwargs):
-            self._update_names()
+            self._refresh_names()
         return super().filter(*args, **kwargs)
 
     def only(self, *fields: str) -> MIZQuerySet:
         if "_name" in fields:
-            self._update_names()
+            self._refresh_names()
         return super().only(*fields)
 
     @add_attrs(alters_data=True)
@@ -167,29 +268,92 @@ class CNQuerySet(MIZQuerySet):
         # If _changed_flag is not already part of the update, add it.
         if "_changed_flag" not in kwargs:
             kwargs["_changed_flag"] = True
-        return super().update(**kwargs)
+        if not (settings.NAME_UPDATE_WORKER and kwargs["_changed_flag"]):
+            return super().update(**kwargs)
+        # Queue the rows before the update, while the filters of this queryset
+        # still select them. The worker cannot see the queued rows before the
+        # update is committed.
+        with transaction.atomic(using=self.db):
+            self._enqueue_names(self)
+            return super().update(**kwargs)
 
     def values(self, *fields: str, **expressions: Any) -> MIZQuerySet:
         if "_name" in fields:
-            self._update_names()
+            self._refresh_names()
         return super().values(*fields, **expressions)
 
     def values_list(self, *fields: str, **kwargs: Any) -> MIZQuerySet:
         if "_name" in fields:
-            self._update_names()
+            self._refresh_names()
         return super().values_list(*fields, **kwargs)
 
+    def _refresh_names(self) -> None:
+        """
+        Update the names of rows where _changed_flag is True before reading
+        them, unless the names are maintained by the name update worker.
+        """
+        if not settings.NAME_UPDATE_WORKER:
+            self._update_names()
+
+    def _enqueue_names(self, queryset: QuerySet) -> int:
+        """Add the rows of the given queryset to the queue of the name update worker."""
+        from dbentry.models import NameUpdate  # avoid circular imports
+
+        return NameUpdate.objects.using(self.db).enqueue(queryset)
+
     @add_attrs(alters_data=True)
-    def _update_names(self) -> None:
-        """Update the names of rows where _changed_flag is True."""
-        if self.query.can_filter() and self.filter(_changed_flag=True).exists():
-            values = self.filter(_changed_flag=True).values_dict(
-                *self.model.name_composing_fields, include_empty=False, flatten=False
-            )
-            with transaction.atomic():
-                for pk, val_dict in values.items():
-                    new_name = self.model._get_name(**val_dict)
-                    self.order_by().filter(pk=pk).update(_name=new_name, _changed_flag=False)
+    def _update_names(self, force: bool = False) -> int:
+        """
+        Update the names of rows where _changed_flag is True.
+
+        If ``force`` is True, the names of all rows are recomputed, and the
+        names that changed are updated.
+
+        The names are computed in batches of ``name_update_batch_size`` rows,
+        and each batch is written with a single UPDATE statement.
+
+        Returns the number of rows updated.
+        """
+        if not self.query.can_filter():
+            return 0
+        queryset = self if force else self.filter(_changed_flag=True)
+        pks = list(queryset.order_by().values_list("pk", flat=True))
+        updated = 0
+        for i in range(0, len(pks), self.name_update_batch_size):
+            names = self.filter(pk__in=pks[i : i + self.name_update_batch_size])._compute_names()
+            updated += self._write_names(names)
+        return updated
+
+    def _compute_names(self) -> List[Tuple[Any, str]]:
+        """Return the (primary key, name) pairs of the rows of this queryset."""
+        values = self.values_dict(*self.model.name_composing_fields, include_empty=False, flatten=False)
+        return [(pk, self.model._get_name(**val_dict)) for pk, val_dict in values.items()]
+
+    def _write_names(self, names: List[Tuple[Any, str]]) -> int:
+        """
+        Write the given (primary key, name) pairs with a single
+        UPDATE ... FROM (VALUES ...) statement and reset the _changed_flag.
+
+        Rows whose name is up-to-date and whose _changed_flag is not set are
+        left alone. Returns the number of rows updated.
+        """
+        if not names:
+            return 0
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        table = qn(opts.db_table)
+        name_column = qn(opts.get_field("_name").column)
+        flag_column = qn(opts.get_field("_changed_flag").column)
+        sql = (
+            f"UPDATE {table} SET {name_column} = v.name, {flag_column} = false "
+            f"FROM (VALUES {', '.join(['(%s, %s)'] * len(names))}) AS v (pk, name) "
+            f"WHERE {table}.{qn(opts.pk.column)} = v.pk::{opts.pk.cast_db_type(connection)} "
+            f"AND ({table}.{flag_column} OR {table}.{name_column} IS DISTINCT FROM v.name)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [param for pair in names for param in pair])
+            return cursor.rowcount
 
 
 def build_date(years: List[int], month_ordinals: List[int], day: int = 1) -> Optional[datetime.date]:
@@ -227,6 +391,80 @@ class InvalidJahrgangError(Exception):
     """
 
 
+# The abbreviations of the months in calendar order, as used in the names of
+# Ausgabe objects.
+MONAT_ABKUERZUNGEN = ["Jan", "Feb", "Mrz", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep", "Okt", "Nov", "Dez"]
+
+# Regular expressions for the name formats of Ausgabe objects (see
+# Ausgabe._get_name): the years (or the jahrgang) followed by numbers or month
+# abbreviations, running numbers followed by the years in parentheses, or the
+# date of publication.
+_AUSGABE_JAHRE = r"(?:(?P<jahre>\d{4}(?:/\d{2})*)|Jg\. ?(?P<jahrgang>\d{1,4}))"
+_AUSGABE_NAME_PATTERNS = [
+    re.compile(r"(?P<e_datum>\d{4}-\d{2}-\d{2})"),
+    re.compile(rf"{_AUSGABE_JAHRE}-(?P<nums>\d{{1,4}}(?:/\d{{1,4}})*)"),
+    re.compile(rf"{_AUSGABE_JAHRE}-(?P<monate>[a-z]{{3}}(?:/[a-z]{{3}})*)", re.IGNORECASE),
+    re.compile(rf"(?P<lnums>\d{{1,4}}(?:/\d{{1,4}})*) \({_AUSGABE_JAHRE}\)"),
+]
+
+
+def _expand_years(jahre: str) -> List[int]:
+    """
+    Return the years of the 'jahre' part of an Ausgabe name.
+
+    The first year is given with four digits, the following years only with
+    their last two digits: '1999/00' is expanded to [1999, 2000].
+    """
+    first, *others = jahre.split("/")
+    years = [int(first)]
+    for other in others:
+        year = years[0] // 100 * 100 + int(other)
+        if year < years[0]:
+            year += 100
+        years.append(year)
+    return years
+
+
+def parse_ausgabe_name(q: str) -> Optional[List[Q]]:
+    """
+    Parse the search term ``q`` as a name of an Ausgabe object.
+
+    Return a list of filters, one for each value of the name, or None if ``q``
+    does not match any of the name formats. Each filter should be applied with
+    a separate call of filter(), so that an Ausgabe must have all the values of
+    a multi-valued relation (f.ex. all the given years).
+    """
+    q = q.strip()
+    for pattern in _AUSGABE_NAME_PATTERNS:
+        match = pattern.fullmatch(q)
+        if match:
+            break
+    else:
+        return None
+    values = match.groupdict()
+    filters = []
+    if values.get("e_datum"):
+        try:
+            return [Q(e_datum=datetime.date.fromisoformat(values["e_datum"]))]
+        except ValueError:
+            return None
+    if values.get("jahre"):
+        filters.extend(Q(ausgabejahr__jahr=jahr) for jahr in _expand_years(values["jahre"]))
+    if values.get("jahrgang"):
+        filters.append(Q(jahrgang=int(values["jahrgang"])))
+    if values.get("nums"):
+        filters.extend(Q(ausgabenum__num=int(num)) for num in values["nums"].split("/"))
+    if values.get("lnums"):
+        filters.extend(Q(ausgabelnum__lnum=int(lnum)) for lnum in values["lnums"].split("/"))
+    if values.get("monate"):
+        abks = {abk.lower(): abk for abk in MONAT_ABKUERZUNGEN}
+        for abk in values["monate"].split("/"):
+            if abk.lower() not in abks:
+                return None
+            filters.append(Q(ausgabemonat__monat__abk=abks[abk.lower()]))
+    return filters
+
+
 class AusgabeQuerySet(CNQuerySet):
     chronologically_ordered = False
 
@@ -241,21 +479,21 @@ class AusgabeQuerySet(CNQuerySet):
         self.chronologically_ordered = False
         return super().order_by(*field_names)
 
-    def update(self, **kwargs: Any) -> int:
-        if self.chronologically_ordered:
-            # Need to clear ordering for the update.
-            # The queryset's order depends on values from annotations - but
-            # update() clears all annotations: an update on an ordered
-            # queryset will fail.
-            return self.order_by().update(**kwargs)
-        return super().update(**kwargs)
-
-    def search(self, q: str, search_type: str = "plain", ranked: bool = True) -> "AusgabeQuerySet":
+    def search(self, q: str, search_type: str = "plain", ranked: bool = True, candidates: int = 0) -> "AusgabeQuerySet":
+        # Look up search terms in the format of an Ausgabe name (f.ex.
+        # '2001-05' or '1999/00-12/01') with equality filters on the jahr,
+        # num, lnum and monat tables instead of using full text search.
+        filters = parse_ausgabe_name(q)
+        if filters:
+            queryset = self
+            for f in filters:
+                queryset = queryset.filter(f)
+            return queryset.chronological_order()
         # Replace the forward slashes in the query term. Otherwise, postgres
         # would treat the search term as a file path.
         q = q.replace("/", "+")
         # Always apply the chronological ordering to the search results.
-        return super().search(q, ranked=False).chronological_order()
+        return super().search(q, ranked=False, candidates=candidates).chronological_order()
 
     def increment_jahrgang(self, start_obj: Model, start_jg: int = 1, commit: bool = True) -> Dict[int, List[int]]:
         """
@@ -383,34 +621,40 @@ class AusgabeQuerySet(CNQuerySet):
 
         return update_dict
 
+    def _is_filtered_by_magazin(self) -> bool:
+        """Return whether the queryset is filtered to the ausgaben of one magazin."""
+        where = self.query.where
+        if where.connector != AND or where.negated:
+            return False
+        field = self.model._meta.get_field("magazin")
+        for child in where.children:
+            if (
+                isinstance(child, Exact)
+                and getattr(child.lhs, "target", None) == field
+                and child.rhs is not None
+                and not hasattr(child.rhs, "resolve_expression")
+            ):
+                return True
+        return False
+
     def chronological_order(self, *order_fields: str) -> "AusgabeQuerySet":
-        """Return this queryset chronologically ordered."""
-        # TODO: check out nulls_first and nulls_last parameters of
-        #   Expression.asc() and desc() (added in 1.11) to fix the nulls
-        #   messing up the ordering.
+        """
+        Return this queryset chronologically ordered.
+
+        The ausgaben are ordered by magazin and then by the sort key stored in
+        the ``_chronologic_order`` field. Database triggers maintain the key
+        whenever an ausgabe or its jahr, num, lnum or monat values change. The
+        ordering strategy of the key (i.e. whether to order by jahr or by
+        jahrgang first, and which of the fields e_datum, lnum, monat and num
+        to prefer) is determined for each magazin.
+        See migration 0041_ausgabe_chronologic_order for details.
+        """
         if self.chronologically_ordered:
             # Already ordered!
             return self
 
-        opts = self.model._meta
-        # A chronological order is (mostly) consistent ONLY within the
-        # ausgabe_set of one particular magazin. If the queryset contains the
-        # ausgaben of more than one magazin, we may end up replacing one 'poor'
-        # ordering (the default one) with another poor, but more expensive
-        # chronological one. In that case, return self with some form of
-        # ordering instead.
-        if self.only("magazin").distinct().values_list("magazin").count() != 1:
-            # This condition is also True if self is an empty queryset.
-            if order_fields:
-                return self.order_by(*order_fields)
-            if self.query.order_by:
-                return self
-            return self.order_by(*opts.ordering)
-
-        default_ordering = ("magazin__magazin_name", "jahr", "jahrgang", "sonderausgabe")
-        ordering: List[str] = [*order_fields, *default_ordering]
-
-        pk_name = opts.pk.name
+        ordering: List[str] = list(order_fields)
+        pk_name = self.model._meta.pk.name
         # Retrieve the first item in ordering that refers to the primary key,
         # so we can later append it to the final ordering.
         # It makes no sense to have the queryset be ordered primarily on the
@@ -422,54 +666,15 @@ class AusgabeQuerySet(CNQuerySet):
             # No primary key in ordering, use a default.
             pk_order_item = "-%s" % pk_name
 
-        # Determine if jahr should come before jahrgang in ordering.
-        jj_values: List[Tuple[int, int]] = list(self.values_list("ausgabejahr__jahr", "jahrgang"))
-        # Remove empty values and unzip the 2-tuples into two lists.
-        jahr_values: Sequence[int]
-        jahrgang_values: Sequence[int]
-        jahr_values, jahrgang_values = (list(filter(None, _list)) for _list in zip(*jj_values))
-        if len(jahrgang_values) > len(jahr_values):
-            # Prefer jahrgang over jahr.
-            jahr_index = ordering.index("jahr")
-            jahrgang_index = ordering.index("jahrgang")
-            ordering[jahr_index] = "jahrgang"
-            ordering[jahrgang_index] = "jahr"
-
-        clone = self.annotate(
-            num=Max("ausgabenum__num"),
-            monat=Max("ausgabemonat__monat__ordinal"),
-            lnum=Max("ausgabelnum__lnum"),
-            jahr=Min("ausgabejahr__jahr"),
-        )
-        # Find the best (annotated) fields to order against.
-        # Sort the fields e_datum, lnum, monat and num by how often the objects
-        # of the queryset have values in those fields.
-        from dbentry.models import AusgabeLnum, AusgabeMonat, AusgabeNum
-
-        counted = self.annotate(
-            has_lnum=Exists(AusgabeLnum.objects.filter(ausgabe=OuterRef("pk"))),
-            has_monat=Exists(AusgabeMonat.objects.filter(ausgabe=OuterRef("pk"))),
-            has_num=Exists(AusgabeNum.objects.filter(ausgabe=OuterRef("pk"))),
-        ).aggregate(
-            e_datum__sum=Count("e_datum"),
-            lnum__sum=Count("has_lnum", filter=Q(has_lnum=True)),
-            monat__sum=Count("has_monat", filter=Q(has_monat=True)),
-            num__sum=Count("has_num", filter=Q(has_num=True)),
-        )
-        default_criteria_ordering = ["e_datum__sum", "lnum__sum", "monat__sum", "num__sum"]
-
-        # Tuples are sorted lexicographically in ascending order:
-        # sorted([(1, 'c'), (1, 'b'), (2, 'a')]) = [(1, 'b'), (1, 'c'), (2, 'a')]
-        # Here, we want to order the sums (tpl[1]) in descending/reverse order
-        # (hence the minus operand), and if any sums are equal, the order of
-        # sum_names in the defaults decides.
-        criteria = sorted(
-            counted.items(), key=lambda itemtpl: (-itemtpl[1], default_criteria_ordering.index(itemtpl[0]))
-        )
-        result_ordering = [sum_name.split("__")[0] for sum_name, _sum in criteria]
-        ordering.extend(result_ordering + [pk_order_item])
+        # The sort keys are only comparable within the ausgaben of the same
+        # magazin. If the queryset is limited to a single magazin, leave out
+        # the magazin so that the index on (magazin, _chronologic_order, -id)
+        # can provide the ordering.
+        if not self._is_filtered_by_magazin():
+            ordering.extend(["magazin__magazin_name", "magazin_id"])
+        ordering.extend(["_chronologic_order", pk_order_item])
 
-        clone = clone.order_by(*ordering)
+        clone = self.order_by(*ordering)
         clone.chronologically_ordered = True
         return clone
 
@@ -481,23 +686,13 @@ class AudioQuerySet(MIZQuerySet):
         """Remove any special characters and empty spaces from the filter value."""
         return re.sub(r"\W", "", value)
 
-    def _clean_field_values(self, queryset):
-        """
-        Remove any special characters and empty spaces from the 'plattennummer'
-        field values.
-        """
-        pattern = Value(r"\W")
-        replacement = Value("")
-        flags = Value("g")  # replace all occurrences in the text
-        return queryset.annotate(
-            pn_cleaned=Func(F("plattennummer"), pattern, replacement, flags, function="regexp_replace")
-        )
-
     def filter(self, *args: Any, **kwargs: Any) -> MIZQuerySet:
         for k, v in kwargs.items():
             if k.startswith("plattennummer"):
                 # If filtering by 'plattennummer', remove any special characters
-                # from the filter value and the field values. This should make
+                # from the filter value and compare it with the plattennummer
+                # without special characters (a column maintained by a
+                # database trigger that has a trigram index). This should make
                 # it easier to find objects by their plattennummer without
                 # needing to know the exact formatting.
                 q = self._clean_filter_value(v)
@@ -507,8 +702,223 @@ class AudioQuerySet(MIZQuerySet):
                     break
                 # Use the other filters as usual:
                 queryset = super().filter(*args, **{_k: _v for _k, _v in kwargs.items() if _k != k})
-                # Then remove special characters from field values:
-                queryset = self._clean_field_values(queryset)
                 # Filter by the 'cleaned' filter value:
-                return queryset.filter(pn_cleaned__icontains=q)
+                return queryset.filter(_plattennummer_normalized__icontains=q)
         return super().filter(*args, **kwargs)
+
+
+class SearchDocumentQuerySet(TextSearchQuerySetMixin, QuerySet):
+    """Queryset for the documents of the global search index."""
+
+    def search(self, q: str, models: Iterable[Type[Model]], search_type: str = "plain") -> QuerySet:  # type: ignore[override]
+        """
+        Return the documents of the given models that match the search term
+        ``q``.
+
+        A document matches if the model's own search would have found the
+        record: either by a text search using the search configs of the
+        model's search vector field, or because the document label contains the
+        search term (or, if ``search_type`` is 'fuzzy', is similar to it), or
+        because ``q`` is the record's id.
+        """
+        if not q:
+            return self.none()
+        content_types: Dict[str, List[int]] = {}
+        content_type_ids = []
+        for model in models:
+            content_type_id = ContentType.objects.get_for_model(model).pk
+            content_type_ids.append(content_type_id)
+            for column in _get_search_vector_field(model).columns:
+                if content_type_id not in content_types.setdefault(column.language, []):
+                    content_types[column.language].append(content_type_id)
+        if not content_type_ids:
+            return self.none()
+
+        # Use one filter per search config instead of one filter per model;
+        # this way, postgres only needs to look up each query in the index
+        # once.
+        filters = Q(content_type__in=content_type_ids, label__icontains=q)
+        if search_type == "fuzzy":
+            filters |= Q(TrigramSimilar(trigram_expression("label"), q), content_type__in=content_type_ids)
+        for config, ids in content_types.items():
+            query = self._get_search_query(q, config=config, search_type=search_type)
+            filters |= Q(content_type__in=ids, search_vector=query)
+        if pk_values := _get_pk_values(q):
+            filters |= Q(content_type__in=content_type_ids, object_id__in=pk_values)
+        return self.filter(filters)
+
+    def counts(self) -> Dict[int, int]:
+        """Return a mapping of content type id to the number of documents."""
+        return dict(
+            self.order_by()
+            .values("content_type")
+            .annotate(count=Count("object_id"))
+            .values_list("content_type", "count")
+        )
+
+    @add_attrs(alters_data=True)
+    def rebuild(self, model: Type[Model]) -> int:
+        """
+        Replace the documents of the given model with new documents created
+        from the model's records.
+
+        Returns the number of documents created.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        self.filter(content_type=content_type).delete()
+        return insert_search_documents(model, content_type.pk, using=self.db)
+
+
+class NameUpdateQuerySet(QuerySet):
+    """
+    Queryset for the queue of the name update worker.
+
+    Rows of ComputedNameModels that require a name update are added to the
+    queue with ``enqueue``. The worker (the management command
+    ``process_name_updates``) takes batches of rows off the queue with
+    ``process``. Several workers can process the queue concurrently: rows that
+    are locked by one worker are skipped by the others.
+    """
+
+    @add_attrs(alters_data=True)
+    def enqueue(self, queryset: QuerySet) -> int:
+        """
+        Add the rows of the given queryset to the queue. Rows that are already
+        queued are ignored.
+
+        Returns the number of rows added.
+        """
+        try:
+            sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        content_type_column = qn(opts.get_field("content_type").column)
+        object_id_column = qn(opts.get_field("object_id").column)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(opts.db_table)} ({content_type_column}, {object_id_column}, "
+                f"{qn(opts.get_field('created').column)}) "
+                f"SELECT %s, sub.object_id, now() FROM ({sql}) AS sub (object_id) "
+                f"ON CONFLICT ({content_type_column}, {object_id_column}) DO NOTHING",
+                [ContentType.objects.db_manager(self.db).get_for_model(queryset.model).pk, *params],
+            )
+            return cursor.rowcount
+
+    @add_attrs(alters_data=True)
+    def process(self, batch_size: int = 1000) -> int:
+        """
+        Take up to ``batch_size`` of the oldest rows off the queue and update
+        their names.
+
+        The rows are deleted from the queue before the names are computed, in
+        the same transaction. Rows that are queued again while the names are
+        being computed are therefore not lost. Rows locked by another worker
+        are skipped.
+
+        Returns the number of rows taken off the queue.
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        table, pk = qn(opts.db_table), qn(opts.pk.column)
+        with transaction.atomic(using=self.db):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {pk} IN ("
+                    f"SELECT {pk} FROM {table} ORDER BY {qn(opts.get_field('created').column)}, {pk} "
+                    f"LIMIT %s FOR UPDATE SKIP LOCKED) "
+                    f"RETURNING {qn(opts.get_field('content_type').column)}, {qn(opts.get_field('object_id').column)}",
+                    [batch_size],
+                )
+                rows = cursor.fetchall()
+            object_ids: Dict[int, List[int]] = {}
+            for content_type_id, object_id in rows:
+                object_ids.setdefault(content_type_id, []).append(object_id)
+            for content_type_id, ids in object_ids.items():
+                model = ContentType.objects.db_manager(self.db).get_for_id(content_type_id).model_class()
+                if model is None:  # pragma: no cover
+                    # The model no longer exists.
+                    continue
+                model.objects.using(self.db).filter(pk__in=ids)._update_names()
+        return len(rows)
+
+    def lag(self) -> Optional[datetime.timedelta]:
+        """
+        Return how long the oldest row has been waiting in the queue, or None
+        if the queue is empty.
+        """
+        oldest = self.aggregate(oldest=Min("created"))["oldest"]
+        if oldest is None:
+            return None
+        return timezone.now() - oldest
+
+
+class ExportJobQuerySet(QuerySet):
+    """
+    Queryset for the queue of the export worker.
+
+    The worker (the management command ``process_export_jobs``) takes the
+    queued jobs off the queue one at a time with ``claim``. Several workers can
+    run concurrently: a job that is being claimed by one worker is skipped by
+    the others. Jobs whose worker died are marked as failed with
+    ``fail_stale``, and old jobs are removed with ``delete_finished``.
+    """
+
+    @add_attrs(alters_data=True)
+    def claim(self) -> Optional[Model]:
+        """
+        Mark the oldest queued job as running and return it. Return None if no
+        job is queued.
+        """
+        with transaction.atomic(using=self.db):
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(status=self.model.Status.QUEUED)
+                .order_by("created", "pk")
+                .first()
+            )
+            if job is not None:
+                job.status = self.model.Status.RUNNING
+                job.started = timezone.now()
+                job.save(update_fields=["status", "started"])
+        return job
+
+    @add_attrs(alters_data=True)
+    def fail_stale(self, timeout: float) -> int:
+        """
+        Mark the running jobs that were started more than ``timeout`` seconds
+        ago as failed. The worker that ran such a job has most likely been
+        terminated.
+
+        Returns the number of jobs marked as failed.
+        """
+        now = timezone.now()
+        return self.filter(
+            status=self.model.Status.RUNNING, started__lt=now - datetime.timedelta(seconds=timeout)
+        ).update(
+            status=self.model.Status.FAILED,
+            error="Der Export wurde nicht innerhalb von {} Sekunden beendet.".format(int(timeout)),
+            finished=now,
+        )
+
+    @add_attrs(alters_data=True)
+    def delete_finished(self, max_age: float) -> int:
+        """
+        Delete the jobs that finished (or failed) more than ``max_age`` seconds
+        ago, and delete their export files.
+
+        Returns the number of jobs deleted.
+        """
+        jobs = list(
+            self.filter(
+                status__in=[self.model.Status.DONE, self.model.Status.FAILED],
+                finished__lt=timezone.now() - datetime.timedelta(seconds=max_age),
+            )
+        )
+        for job in jobs:
+            if job.file:
+                job.file.delete(save=False)
+        return self.filter(pk__in=[job.pk for job in jobs]).delete()[0]
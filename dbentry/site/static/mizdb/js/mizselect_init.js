@@ -27,6 +27,32 @@ window.addEventListener('initMIZSelect', (e) => {
       }
     }
   }
+  // Same as the default load function, except that the cursor of a keyset
+  // paginated response is passed on to the request for the next page.
+  germanSettings.load = function (query, callback) {
+    const url = this.getUrl(query)
+    fetch(url)
+      .then((response) => response.json())
+      .then((json) => {
+        if (json.has_more) {
+          const nextUrl = new URL(url, window.location.href)
+          nextUrl.searchParams.set('p', json.page + 1)
+          if (json.cursor) {
+            nextUrl.searchParams.set('c', json.cursor)
+          }
+          this.setNextUrl(query, nextUrl.toString())
+        }
+        this.settings.showCreateOption = json.show_create_option
+        // Do not scroll to the first option when more results are loaded:
+        const _scrollToOption = this.scrollToOption
+        this.scrollToOption = () => {}
+        callback(json.results)
+        this.scrollToOption = _scrollToOption
+      })
+      .catch(() => {
+        callback()
+      })
+  }
   if (elem.hasAttribute('can-remove')) {
     germanSettings.plugins.remove_button = { title: 'Entfernen' }
   }
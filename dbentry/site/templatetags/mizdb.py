@@ -35,6 +35,14 @@ def paginator_url(changelist, i):  # pragma: no cover
     return changelist.get_query_string(new_params={PAGE_VAR: i})
 
 
+@register.simple_tag
+def cursor_url(changelist, cursor):  # pragma: no cover
+    """Return the query string for the result page of the given cursor."""
+    from dbentry.utils.pagination import CURSOR_VAR
+
+    return changelist.get_query_string(new_params={CURSOR_VAR: cursor})
+
+
 @register.simple_tag
 def has_perm(user, action, opts):  # pragma: no cover
     """Return True if the given user has a certain permission to an object."""
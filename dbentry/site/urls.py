@@ -3,6 +3,7 @@ from django.urls import include, path
 
 from dbentry.site.registry import miz_site
 from dbentry.site.views.auth import LoginView, PasswordChangeDoneView, PasswordChangeView
+from dbentry.site.views.export import ExportJobDownloadView, ExportJobListView
 from dbentry.site.views.feedback import FeedbackView
 from dbentry.site.views.help import HelpIndexView, HelpView
 from dbentry.site.views.list import Index, changelist_selection_sync
@@ -27,4 +28,6 @@ urlpatterns = [
     path("hilfe/<path:page_name>/", HelpView.as_view(), name="help"),
     path("autocomplete/", include("dbentry.autocomplete.urls")),
     path("feedback/", FeedbackView.as_view(), name="feedback"),
+    path("exporte/", ExportJobListView.as_view(), name="export_jobs"),
+    path("exporte/<int:pk>/download/", ExportJobDownloadView.as_view(), name="export_job_download"),
 ]
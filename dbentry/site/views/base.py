@@ -14,6 +14,7 @@ from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.contrib.messages.storage import default_storage
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage
 from django.db import models, transaction
 from django.http import Http404, HttpResponseBase
 from django.shortcuts import redirect, render
@@ -38,13 +39,21 @@ from dbentry.site.templatetags.mizdb import add_preserved_filters
 from dbentry.utils import flatten
 from dbentry.utils.admin import construct_change_message, create_logentry
 from dbentry.utils.html import create_hyperlink, get_obj_link, get_view_link
+from dbentry.utils.count import RowCount, get_result_estimate, get_total_count
 from dbentry.utils.models import get_model_relations
+from dbentry.utils.pagination import (
+    CURSOR_VAR,
+    KeysetPaginator,
+    get_keyset_paginator,
+    get_page_queryset,
+)
 from dbentry.utils.permission import (
     get_perm,
     has_add_permission,
     has_change_permission,
     has_view_permission,
 )
+from dbentry.utils.query import add_ordering_annotations
 from dbentry.utils.text import diffhtml
 from dbentry.utils.url import get_change_url, get_changelist_url_for_relation, get_view_url, urlname
 
@@ -703,6 +712,18 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
           the initial request for a changelist.
         - prioritize_search_ordering (bool): if True, do not override the
           ordering set by queryset.search()
+        - search_candidates (int): the number of search results to compute
+          the full search rank for (see queryset.search()). The results of
+          the requested page are always included. Set to 0 to rank all
+          search results.
+        - keyset_pagination (bool): if True, paginate the results by seeking
+          to the position of a cursor (see dbentry.utils.pagination) instead
+          of using page numbers. Fetching a deep page is then as fast as
+          fetching the first page, but the pages can only be browsed
+          sequentially. Orderings that do not support keyset pagination fall
+          back to page numbers. Keyset pagination is also used if the number
+          of results is estimated (see the COUNT_ESTIMATE_THRESHOLD setting):
+          page numbers require the exact number of results.
         - actions (list): a list of changelist action callables
         - sortable_by (list): defines which list_display fields the changelist
           can be sorted against. If left empty, the changelist can be sorted
@@ -720,6 +741,9 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
 
     order_unfiltered_results: bool = True
     prioritize_search_ordering: bool = True
+    search_candidates: int = 1000
+    keyset_pagination: bool = False
+    result_estimate: Optional[RowCount] = None
     actions: Sequence = ()
     sortable_by: Sequence[str] = ()
     include_add_btn = True
@@ -770,11 +794,12 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
         return "?%s" % urlencode(sorted(p.items()))
 
     def get_queryset(self):
-        queryset = self.add_list_display_annotations(super().get_queryset())
-        queryset = self.get_search_results(queryset)
+        # The annotations for the list_display items are only added to the
+        # objects of the result page (see paginate_queryset).
+        queryset = self.get_search_results(super().get_queryset())
 
         # Re-evaluate the ordering of the queryset, now that the search was
-        # performed and annotations have been added.
+        # performed.
         return self.order_queryset(queryset)
 
     @property
@@ -783,9 +808,54 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
 
     def get_search_results(self, queryset):
         if self.search_term:
-            return queryset.search(self.search_term, ranked=ORDER_VAR not in self.request.GET)
+            return queryset.search(
+                self.search_term,
+                ranked=ORDER_VAR not in self.request.GET,
+                candidates=self.get_search_candidates(),
+            )
         return queryset
 
+    def get_search_candidates(self):
+        """
+        Return the number of search results to compute the full search rank
+        for. Make sure that the results of the requested page are included.
+        """
+        if not self.search_candidates:
+            return 0
+        try:
+            page_number = int(self.request.GET.get(self.page_kwarg, 1))
+        except ValueError:
+            # Most likely page='last': rank all results.
+            return 0
+        return max(self.search_candidates, page_number * self.get_paginate_by(None))
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate the queryset and add the list_display annotations to the
+        objects of the requested page.
+
+        The page is resolved first, using only the filters and the ordering of
+        the queryset. The annotations are then only computed for the objects
+        of that page, instead of for every result of the queryset.
+        """
+        paginator = page = None
+        # Do not count the results if the estimate is above the threshold.
+        self.result_estimate = get_result_estimate(queryset)
+        if self.keyset_pagination or self.result_estimate is not None:
+            paginator = get_keyset_paginator(queryset, page_size)
+            if paginator is not None:
+                try:
+                    page = paginator.page(self.request.GET.get(CURSOR_VAR, ""))
+                except InvalidPage as e:
+                    raise Http404(str(e))
+        if page is None:
+            paginator, page, _object_list, _is_paginated = super().paginate_queryset(queryset, page_size)
+            page.object_list = get_page_queryset(queryset, page.object_list)
+        # (the object list of a keyset page is already filtered by the primary
+        # keys of the page's objects)
+        page.object_list = self.add_list_display_annotations(page.object_list)
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def _get_default_ordering(self):
         if self.ordering is not None:
             return self.ordering
@@ -827,7 +897,7 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
             ordering = [self.opts.pk.name]
         else:
             ordering = self.get_ordering_fields(queryset)
-        return queryset.order_by(*ordering)
+        return add_ordering_annotations(queryset, ordering).order_by(*ordering)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -861,22 +931,43 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
             "other_actions": other_actions,
         }
 
+        if isinstance(paginator, KeysetPaginator):
+            page_range = []
+            pagination_required = ctx["page_obj"].has_other_pages()
+            # Keyset pagination is used to avoid scanning the entire result
+            # set; only count the results if COUNT_ESTIMATE_THRESHOLD is set
+            # and the estimate is below the threshold - unless all results fit
+            # on this page. Without the setting, no result count is shown.
+            if not pagination_required:
+                result_count = RowCount(len(ctx["object_list"]))
+            elif self.result_estimate is not None:
+                result_count = self.result_estimate
+            elif settings.COUNT_ESTIMATE_THRESHOLD:
+                result_count = RowCount(self.object_list.count())
+            else:
+                result_count = None
+        else:
+            # call list on the pagination page range generator, because it will
+            # be consumed more than once:
+            page_range = list(paginator.get_elided_page_range(ctx["page_obj"].number))
+            pagination_required = paginator.count > 100
+            # Reuse the count of the paginator:
+            result_count = paginator.count
         ctx.update(
             {
                 "title": self.opts.verbose_name_plural,
                 # some template tags require this view object:
                 "cl": self,
-                # call list on the pagination page range generator, because it will
-                # be consumed more than once:
-                "page_range": list(paginator.get_elided_page_range(ctx["page_obj"].number)),
-                "pagination_required": paginator.count > 100,
+                "page_range": page_range,
+                "pagination_required": pagination_required,
+                "keyset_pagination": isinstance(paginator, KeysetPaginator),
                 "result_rows": self.get_result_rows(ctx["object_list"]),
                 "result_headers": self.get_result_headers(),
-                "result_count": self.object_list.count(),
-                "total_count": self.model.objects.count(),
+                "result_count": result_count,
+                "total_count": get_total_count(self.model),
                 "search_term": self.request.GET.get(SEARCH_VAR, ""),
                 "actions": actions,
-                "is_filtered": bool(ctx["object_list"].query.has_filters()),
+                "is_filtered": bool(self.object_list.query.has_filters()),
                 "include_add_btn": self.include_add_btn,
             }
         )
@@ -1008,6 +1099,9 @@ class BaseListView(WatchlistMixin, PermissionRequiredMixin, ModelViewMixin, List
 
                 def add_params(new_params):
                     params = {**dict(self.request.GET.items()), **new_params}
+                    # A cursor is only valid for the ordering it was created
+                    # with:
+                    params.pop(CURSOR_VAR, None)
                     return f"?{urlencode(params)}"
 
                 headers.append(
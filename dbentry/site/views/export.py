@@ -1,14 +1,21 @@
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.contrib.auth.mixins import UserPassesTestMixin
-from django.http import HttpResponse
-from django.views.generic import FormView
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.views import View
+from django.views.generic import FormView, ListView
 from import_export.mixins import ExportViewMixin
 from import_export.signals import post_export
 
 from dbentry.actions.base import ActionConfirmationView
 from dbentry.export.base import get_verbose_name_for_resource_field
 from dbentry.export.forms import MIZSelectableFieldsExportForm
-from dbentry.site.views.base import ModelViewMixin
+from dbentry.export.streaming import stream_export
+from dbentry.models import ExportJob
+from dbentry.site.views.base import BaseViewMixin, ModelViewMixin
 from dbentry.utils.permission import has_export_permission
 
 
@@ -48,14 +55,54 @@ class BaseExportView(UserPassesTestMixin, ModelViewMixin, ExportViewMixin, FormV
     def get_export_resource_fields_from_form(self, form):
         return form.cleaned_data.get("fields_select")
 
+    def get_export_stream(self, file_format, queryset, export_form):
+        """
+        Return an iterator over the content of the export, or None if the
+        format does not support streaming.
+        """
+        resource_class = self.choose_export_resource_class(export_form, self.request)
+        resource = resource_class(**self.get_export_resource_kwargs(self.request, export_form=export_form))
+        export_fields = self.get_export_resource_fields_from_form(export_form)
+        return stream_export(resource, queryset, file_format, export_fields=export_fields)
+
+    def get_export_job_object_ids(self, queryset):
+        """Return the primary keys of the records that an export job exports."""
+        return list(queryset.values_list("pk", flat=True))
+
+    def create_export_job(self, file_format, queryset, export_form):
+        """Add a job for the export to the queue of the export worker."""
+        resource_class = self.choose_export_resource_class(export_form, self.request)
+        return ExportJob.objects.create(
+            user=self.request.user,
+            content_type=ContentType.objects.get_for_model(queryset.model),
+            object_ids=self.get_export_job_object_ids(queryset),
+            resource=f"{resource_class.__module__}.{resource_class.__qualname__}",
+            export_fields=self.get_export_resource_fields_from_form(export_form) or [],
+            file_format=file_format.__class__.__name__,
+            filename=self.get_export_filename(file_format),
+        )
+
     def form_valid(self, form):
         # Originally, this was part of the ExportViewFormMixin from
         # django-import-export, but that mixin has been slated for deprecation.
         formats = self.get_export_formats()
         file_format = formats[int(form.cleaned_data["format"])]()
-        export_data = self.get_export_data(file_format, self.get_queryset(), export_form=form)
+        if settings.EXPORT_JOB_WORKER:
+            # Let the export worker create the export file.
+            self.create_export_job(file_format, self.get_queryset(), export_form=form)
+            messages.info(
+                self.request,
+                "Der Export wurde gestartet. Die Datei kann heruntergeladen werden, sobald der Export fertig ist.",
+            )
+            return redirect("export_jobs")
         content_type = file_format.get_content_type()
-        response = HttpResponse(export_data, content_type=content_type)
+        if (stream := self.get_export_stream(file_format, self.get_queryset(), export_form=form)) is not None:
+            # Write the rows of the export as they are fetched from the
+            # database, instead of building the whole export in memory first.
+            response = StreamingHttpResponse(stream, content_type=content_type)
+        else:
+            export_data = self.get_export_data(file_format, self.get_queryset(), export_form=form)
+            response = HttpResponse(export_data, content_type=content_type)
         response["Content-Disposition"] = f'attachment; filename="{self.get_export_filename(file_format)}"'
         post_export.send(sender=None, model=self.model)
         return response
@@ -86,6 +133,10 @@ class ExportModelView(BaseExportView):
     def get_queryset(self):  # pragma: no cover
         return self.model.objects.all()
 
+    def get_export_job_object_ids(self, queryset):
+        # Export all records that exist when the job is run.
+        return None
+
     def test_func(self) -> bool:
         return self.request.user.is_superuser
 
@@ -98,3 +149,21 @@ class ExportResultsActionView(ExportActionView):
     # the template need not render a hidden field for each of the 'selected
     # items' like for ExportActionView.
     template_name: str = "mizdb/export_results.html"
+
+
+class ExportJobListView(BaseViewMixin, LoginRequiredMixin, ListView):
+    """List the export jobs of the current user."""
+
+    template_name = "mizdb/export_jobs.html"
+    title = "Meine Exporte"
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(user=self.request.user).select_related("content_type")
+
+
+class ExportJobDownloadView(LoginRequiredMixin, View):
+    """Download the export file of an export job of the current user."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk, user=request.user, status=ExportJob.Status.DONE)
+        return FileResponse(job.file.open("rb"), as_attachment=True, filename=job.filename)
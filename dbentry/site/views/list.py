@@ -151,6 +151,7 @@ class ArtikelList(SearchableListView):
     model = _models.Artikel
     order_unfiltered_results = False
     prioritize_search_ordering = False
+    keyset_pagination = True
     list_display = [
         "id",
         "schlagzeile",
@@ -247,6 +248,7 @@ class AudioList(SearchableListView):
 class AusgabeList(SearchableListView):
     model = _models.Ausgabe
     ordering = ["magazin__magazin_name", "_name"]
+    keyset_pagination = True
     list_display = [
         "id",
         "ausgabe_name",
@@ -1,13 +1,17 @@
 from urllib.parse import quote
 
+from django.contrib.contenttypes.models import ContentType
 from django.http import JsonResponse
 from django.views import View
 from django.views.generic import TemplateView
 
+from dbentry.fts.query import can_count_search_documents
+from dbentry.models import SearchDocument
 from dbentry.site.registry import miz_site
 from dbentry.site.views import BaseViewMixin
 from dbentry.utils.html import create_hyperlink, get_obj_link, get_view_link
 from dbentry.utils.permission import has_change_permission
+from dbentry.utils.query import count_querysets
 from dbentry.utils.url import get_changelist_url
 
 
@@ -17,8 +21,20 @@ class SearchViewMixin:
 
     By default, queries will be made against the models registered with
     `miz_site`.
+
+    The result counts of all querysets are fetched with a single query and are
+    memoized for the duration of the request (see `get_count`).
+
+    If `use_search_documents` is True, the counts for models that have search
+    documents are taken from the global search index instead.
     """
 
+    use_search_documents = True
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.result_counts = {}
+
     def get_results(self, q):
         """Return the results for the given search term."""
         return self._get_results(q, self._get_querysets(self.get_models()))
@@ -30,12 +46,42 @@ class SearchViewMixin:
         Returns a list of querysets that returned results for the search term.
         """
         results = []
-        for queryset in querysets:
-            result = self._get_model_results(q, queryset)
-            if result.exists():
-                results.append(result)
+        querysets = [self._get_model_results(q, queryset) for queryset in querysets]
+        for queryset, count in zip(querysets, self._get_counts(q, querysets)):
+            if count:
+                self.result_counts[queryset.model] = count
+                results.append(queryset)
         return results
 
+    def _get_counts(self, q, querysets):
+        """
+        Return the number of search results for each queryset in `querysets`.
+
+        Models whose results can be found via the global search index are
+        counted with a single query against the search index, and the
+        remaining querysets are counted with another single query.
+        """
+        counts = [0] * len(querysets)
+        indexed, other = [], []
+        for i, queryset in enumerate(querysets):
+            if self.use_search_documents and can_count_search_documents(queryset.model, q):
+                indexed.append(i)
+            else:
+                other.append(i)
+        if indexed:
+            document_counts = SearchDocument.objects.search(q, [querysets[i].model for i in indexed]).counts()
+            for i in indexed:
+                counts[i] = document_counts.get(ContentType.objects.get_for_model(querysets[i].model).pk, 0)
+        for i, count in zip(other, count_querysets([querysets[i] for i in other])):
+            counts[i] = count
+        return counts
+
+    def get_count(self, queryset):
+        """Return the memoized result count for the given queryset."""
+        if queryset.model not in self.result_counts:
+            self.result_counts[queryset.model] = queryset.count()
+        return self.result_counts[queryset.model]
+
     def get_models(self):
         """Hook for specifying which models to query."""
         return [opts.model for _category, model_options in miz_site.model_list for opts in model_options]
@@ -76,8 +122,8 @@ class SearchViewMixin:
 
     def _get_changelist_link_label(self, queryset, opts):
         """Return an appropriate label for the changelist link."""
-        if queryset.count() > 1:
-            return f"{opts.verbose_name_plural} ({queryset.count()})"
+        if (count := self.get_count(queryset)) > 1:
+            return f"{opts.verbose_name_plural} ({count})"
         else:
             return opts.verbose_name
 
@@ -115,12 +161,13 @@ class SearchbarSearch(SearchViewMixin, View):
         if q := request.GET.get("q", ""):
             for queryset in self.get_results(q):
                 opts = queryset.query.get_meta()
-                data["total_count"] += queryset.count()
+                count = self.get_count(queryset)
+                data["total_count"] += count
                 model_results = {
                     "model_name": opts.model_name,
                     "changelist_link": self.get_changelist_link(request, queryset, q),
                 }
-                if queryset.count() < 20:
+                if count < 20:
                     link_func = get_view_link
                     if has_change_permission(request.user, opts):
                         link_func = get_obj_link
@@ -144,7 +191,7 @@ class SiteSearchView(SearchViewMixin, BaseViewMixin, TemplateView):
         if q := self.request.GET.get("q", ""):
             ctx["q"] = q
             for queryset in self.get_results(q):
-                total_count += queryset.count()
+                total_count += self.get_count(queryset)
                 results.append(self.get_changelist_link(self.request, queryset, q))
         ctx["results"] = results
         ctx["total_count"] = total_count
@@ -18,7 +18,7 @@ from dbentry import models as _models
 from dbentry.admin.views import MIZAdminMixin
 from dbentry.tools.bulk.forms import BulkFormAusgabe
 from dbentry.tools.decorators import register_tool
-from dbentry.utils.admin import log_addition, log_change
+from dbentry.utils.admin import LogCollector
 from dbentry.utils.html import get_changelist_link, link_list
 from dbentry.utils.url import get_changelist_url
 
@@ -177,115 +177,116 @@ class BulkAusgabe(MIZAdminMixin, PermissionRequiredMixin, views.generic.FormView
             else:
                 original.append(row)
 
-        for row in chain(original, dupes):
-            if "dupe_of" in row:
-                instance = row["dupe_of"]["instance"]
-                # Since this is a duplicate of another row,
-                # form.row_data has set lagerort to dublette.
-                bestand_data = dict(lagerort=row.get("ausgabe_lagerort"))
-                if "provenienz" in row["dupe_of"]:
-                    # Also add the provenienz of the original to this object's
-                    # bestand.
-                    bestand_data["provenienz"] = row.get("provenienz")
-                bestand = instance.bestand_set.create(**bestand_data)
-                log_addition(user_id, instance, bestand)
-                continue
+        with LogCollector() as logs:
+            for row in chain(original, dupes):
+                if "dupe_of" in row:
+                    instance = row["dupe_of"]["instance"]
+                    # Since this is a duplicate of another row,
+                    # form.row_data has set lagerort to dublette.
+                    bestand_data = dict(lagerort=row.get("ausgabe_lagerort"))
+                    if "provenienz" in row["dupe_of"]:
+                        # Also add the provenienz of the original to this object's
+                        # bestand.
+                        bestand_data["provenienz"] = row.get("provenienz")
+                    bestand = instance.bestand_set.create(**bestand_data)
+                    logs.log_addition(user_id, instance, bestand)
+                    continue
 
-            if row.get("instance"):
-                instance = row["instance"]
-            else:
-                instance = _models.Ausgabe(**self.instance_data(row))
-            if not instance.pk:
-                # This is a new instance, mark it as such.
-                instance.save()
-                log_addition(user_id, instance)
-                created.append(instance)
-            else:
-                # This instance already existed, update it and mark it as such.
-                updates = {}
-                for k, v in self.instance_data(row).items():
-                    if k == "magazin":
-                        # Should and must not update the 'magazin' field.
-                        continue
-                    if v and getattr(instance, k) != v:
-                        # The instance's value for this field differs from
-                        # the new data; include it in the update.
-                        updates[k] = v
+                if row.get("instance"):
+                    instance = row["instance"]
+                else:
+                    instance = _models.Ausgabe(**self.instance_data(row))
+                if not instance.pk:
+                    # This is a new instance, mark it as such.
+                    instance.save()
+                    logs.log_addition(user_id, instance)
+                    created.append(instance)
+                else:
+                    # This instance already existed, update it and mark it as such.
+                    updates = {}
+                    for k, v in self.instance_data(row).items():
+                        if k == "magazin":
+                            # Should and must not update the 'magazin' field.
+                            continue
+                        if v and getattr(instance, k) != v:
+                            # The instance's value for this field differs from
+                            # the new data; include it in the update.
+                            updates[k] = v
 
-                instance.qs().update(**updates)
-                instance.refresh_from_db()
-                log_change(user_id, instance, list(updates.keys()))
-                updated.append(instance)
+                    instance.qs().update(**updates)
+                    instance.refresh_from_db()
+                    logs.log_change(user_id, instance, list(updates.keys()))
+                    updated.append(instance)
 
-            # Create and/or update related sets.
-            for field_name in ["jahr", "num", "monat", "lnum"]:
-                if not row.get(field_name):
-                    continue
-                data = row[field_name]
-                if isinstance(data, tuple):
-                    data = list(data)  # pragma: no cover
-                if not isinstance(data, list):
-                    data = [data]
-                accessor_name = "ausgabe{}_set".format(field_name)
-                related_manager = getattr(instance, accessor_name)
-                if field_name == "monat":
-                    # ausgabemonat is actually a m2m intermediary table
-                    # between tables 'ausgabe' and 'monat'. The form values for
-                    # 'monat' refer to the ordinals of the months.
-                    for i, value in enumerate(data):
-                        if value:
-                            data[i] = _models.Monat.objects.filter(ordinal=value).first()
-                for value in data:
-                    if not value:
-                        continue  # pragma: no cover
-                    try:
-                        with transaction.atomic():
-                            related_obj = related_manager.create(**{field_name: value})
-                    except IntegrityError:
-                        # Ignore UNIQUE constraints violations.
+                # Create and/or update related sets.
+                for field_name in ["jahr", "num", "monat", "lnum"]:
+                    if not row.get(field_name):
                         continue
-                    log_addition(user_id, instance, related_obj)
+                    data = row[field_name]
+                    if isinstance(data, tuple):
+                        data = list(data)  # pragma: no cover
+                    if not isinstance(data, list):
+                        data = [data]
+                    accessor_name = "ausgabe{}_set".format(field_name)
+                    related_manager = getattr(instance, accessor_name)
+                    if field_name == "monat":
+                        # ausgabemonat is actually a m2m intermediary table
+                        # between tables 'ausgabe' and 'monat'. The form values for
+                        # 'monat' refer to the ordinals of the months.
+                        for i, value in enumerate(data):
+                            if value:
+                                data[i] = _models.Monat.objects.filter(ordinal=value).first()
+                    for value in data:
+                        if not value:
+                            continue  # pragma: no cover
+                        try:
+                            with transaction.atomic():
+                                related_obj = related_manager.create(**{field_name: value})
+                        except IntegrityError:
+                            # Ignore UNIQUE constraints violations.
+                            continue
+                        logs.log_addition(user_id, instance, related_obj)
 
-            # All the necessary data to construct a proper name should be
-            # included now, update the name.
-            instance.update_name(force_update=True)
+                # All the necessary data to construct a proper name should be
+                # included now, update the name.
+                instance.update_name(force_update=True)
 
-            # Handle related audio objects.
-            if "audio" in row:
-                titel = "Musik-Beilage: {magazin!s} {suffix!s}".format(magazin=row.get("magazin"), suffix=instance)
-                audio_data = {"titel": titel}
-                # Use the first matching queryset result or create a new instance.
-                audio_instance = _models.Audio.objects.filter(**audio_data).first()
-                if audio_instance is None:
-                    audio_instance = _models.Audio(**audio_data)
-                    audio_instance.save()
-                    log_addition(user_id, audio_instance)
-                # Check if the ausgabe instance is already related to the audio
-                # instance.
-                is_related = _models.Ausgabe.audio.through.objects.filter(
-                    ausgabe=instance, audio=audio_instance
-                ).exists()
-                if not is_related:
-                    m2m_instance = _models.Ausgabe.audio.through(ausgabe=instance, audio=audio_instance)
-                    m2m_instance.save()
-                    log_addition(user_id, instance, m2m_instance)
-                    log_addition(user_id, audio_instance, m2m_instance)
-                # Add bestand for the audio instance.
-                bestand_data = {"lagerort": form.cleaned_data.get("audio_lagerort")}
+                # Handle related audio objects.
+                if "audio" in row:
+                    titel = "Musik-Beilage: {magazin!s} {suffix!s}".format(magazin=row.get("magazin"), suffix=instance)
+                    audio_data = {"titel": titel}
+                    # Use the first matching queryset result or create a new instance.
+                    audio_instance = _models.Audio.objects.filter(**audio_data).first()
+                    if audio_instance is None:
+                        audio_instance = _models.Audio(**audio_data)
+                        audio_instance.save()
+                        logs.log_addition(user_id, audio_instance)
+                    # Check if the ausgabe instance is already related to the audio
+                    # instance.
+                    is_related = _models.Ausgabe.audio.through.objects.filter(
+                        ausgabe=instance, audio=audio_instance
+                    ).exists()
+                    if not is_related:
+                        m2m_instance = _models.Ausgabe.audio.through(ausgabe=instance, audio=audio_instance)
+                        m2m_instance.save()
+                        logs.log_addition(user_id, instance, m2m_instance)
+                        logs.log_addition(user_id, audio_instance, m2m_instance)
+                    # Add bestand for the audio instance.
+                    bestand_data = {"lagerort": form.cleaned_data.get("audio_lagerort")}
+                    if "provenienz" in row:
+                        bestand_data["provenienz"] = row.get("provenienz")
+                    bestand = audio_instance.bestand_set.create(**bestand_data)
+                    logs.log_addition(user_id, audio_instance, bestand)
+
+                # Add bestand for the ausgabe instance.
+                bestand_data = {"lagerort": row.get("ausgabe_lagerort")}
                 if "provenienz" in row:
                     bestand_data["provenienz"] = row.get("provenienz")
-                bestand = audio_instance.bestand_set.create(**bestand_data)
-                log_addition(user_id, audio_instance, bestand)
-
-            # Add bestand for the ausgabe instance.
-            bestand_data = {"lagerort": row.get("ausgabe_lagerort")}
-            if "provenienz" in row:
-                bestand_data["provenienz"] = row.get("provenienz")
-            bestand = instance.bestand_set.create(**bestand_data)
-            log_addition(user_id, instance, bestand)
+                bestand = instance.bestand_set.create(**bestand_data)
+                logs.log_addition(user_id, instance, bestand)
 
-            row["instance"] = instance
-            ids.append(instance.pk)
+                row["instance"] = instance
+                ids.append(instance.pk)
         return ids, created, updated
 
     # noinspection PyMethodMayBeStatic
@@ -6,6 +6,7 @@ from django import views
 from django.apps import apps
 from django.contrib.admin.utils import get_fields_from_path
 from django.contrib.auth import get_permission_codename
+from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, F, ManyToManyRel, ManyToOneRel, Model, OneToOneRel, Q, QuerySet, Window
 from django.db.models.query import RawQuerySet
 from django.forms import Form
@@ -15,11 +16,13 @@ from django.urls import reverse
 from django.utils.safestring import SafeString, SafeText
 
 from dbentry.admin.views import MIZAdminMixin, SuperUserOnlyMixin
+from dbentry.fts.query import can_count_search_documents
+from dbentry.models import SearchDocument
 from dbentry.tools.decorators import register_tool
 from dbentry.tools.forms import DuplicateFieldsSelectForm, ModelSelectForm, UnusedObjectsForm
 from dbentry.utils.html import create_hyperlink, get_obj_link
 from dbentry.utils.models import get_model_from_string, get_model_relations
-from dbentry.utils.query import string_list
+from dbentry.utils.query import count_querysets, string_list
 from dbentry.utils.url import get_changelist_url
 
 Relations = Union[ManyToManyRel, ManyToOneRel, OneToOneRel]
@@ -403,6 +406,14 @@ class SiteSearchView(views.generic.TemplateView):
         """Search the given model for the search term ``q``."""
         raise NotImplementedError("The view class must implement the search.")  # pragma: no cover
 
+    def _get_counts(self, models: List[Type[Model]], q: str) -> Dict[Type[Model], int]:
+        """Return a mapping of model to the number of results for ``q``."""
+        counts = {}
+        for model in models:
+            if model_results := self._search(model, q):
+                counts[model] = len(model_results)
+        return counts
+
     def get_result_list(self, q: str) -> List[SafeText]:
         """
         Perform the queries for the search term ``q``.
@@ -412,12 +423,13 @@ class SiteSearchView(views.generic.TemplateView):
              sorted by the model's object name
         """
         results = []
-        for model in sorted(self._get_models(), key=lambda m: m._meta.object_name):
-            model_results = self._search(model, q)
-            if not model_results:
+        models = sorted(self._get_models(), key=lambda m: m._meta.object_name)
+        counts = self._get_counts(models, q)
+        for model in models:
+            if not counts.get(model):
                 continue
             # noinspection PyUnresolvedReferences
-            label = "%s (%s)" % (model._meta.verbose_name_plural, len(model_results))
+            label = "%s (%s)" % (model._meta.verbose_name_plural, counts[model])
             url = get_changelist_url(self.request, model, namespace="admin")
             if url:
                 url += f"?q={q!s}"
@@ -447,3 +459,14 @@ class MIZSiteSearch(MIZAdminMixin, SiteSearchView):
     def _search(self, model: Model, q: str) -> Any:
         # noinspection PyUnresolvedReferences
         return model.objects.search(q, ranked=False)  # pragma: no cover
+
+    def _get_counts(self, models: List[Type[Model]], q: str) -> Dict[Type[Model], int]:
+        # Count the results of models that can be found via the global search
+        # index using the index, and count the results of the other models
+        # with a single query.
+        indexed = [model for model in models if can_count_search_documents(model, q)]
+        other = [model for model in models if model not in indexed]
+        document_counts = SearchDocument.objects.search(q, indexed).counts()
+        counts = {model: document_counts.get(ContentType.objects.get_for_model(model).pk, 0) for model in indexed}
+        counts.update(zip(other, count_querysets([self._search(model, q) for model in other])))
+        return counts
@@ -1,3 +1,4 @@
+import json
 from typing import Dict, List, Optional, Sequence, Type, Union
 
 from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
@@ -120,27 +121,17 @@ def create_logentry(user_id: int, obj: Model, action_flag: int, message: Union[s
     )
 
 
-def log_addition(user_id: int, obj: Model, related_obj: Model = None) -> LogEntry:
-    """
-    Log that an object has been successfully added.
-
-    If ``related_obj`` is given, log that a related object has been added to
-    ``object``.
-    """
+def _get_addition_message(obj: Model, related_obj: Model = None) -> List[Dict]:
+    """Return the change message for the addition of ``obj`` or ``related_obj``."""
     message: Dict[str, dict] = {"added": {}}
     if related_obj:
         # noinspection PyUnresolvedReferences
         message["added"] = _get_relation_change_message(related_obj, obj._meta.model)
-    return create_logentry(user_id, obj, ADDITION, [message])
-
+    return [message]
 
-def log_change(user_id: int, obj: Model, fields: Union[Sequence[str], str], related_obj: Model = None) -> LogEntry:
-    """
-    Log that values for the ``fields`` of ``object`` have changed.
 
-    If ``related_obj`` is given, log that a related object's field values have
-    been changed. (useful for logging changes made with admin inlines)
-    """
+def _get_change_message(obj: Model, fields: Union[Sequence[str], str], related_obj: Model = None) -> List[Dict]:
+    """Return the change message for changes of the ``fields`` of ``obj`` or ``related_obj``."""
     if isinstance(fields, str):  # pragma: no cover
         fields = [fields]
     message: Dict[str, dict] = {"changed": {}}
@@ -154,9 +145,97 @@ def log_change(user_id: int, obj: Model, fields: Union[Sequence[str], str], rela
 
     # noinspection PyTypeChecker
     message["changed"]["fields"] = sorted(capfirst(opts.get_field(f).verbose_name) for f in fields)
-    return create_logentry(user_id, obj, CHANGE, [message])
+    return [message]
+
+
+def log_addition(user_id: int, obj: Model, related_obj: Model = None) -> LogEntry:
+    """
+    Log that an object has been successfully added.
+
+    If ``related_obj`` is given, log that a related object has been added to
+    ``object``.
+    """
+    return create_logentry(user_id, obj, ADDITION, _get_addition_message(obj, related_obj))
+
+
+def log_change(user_id: int, obj: Model, fields: Union[Sequence[str], str], related_obj: Model = None) -> LogEntry:
+    """
+    Log that values for the ``fields`` of ``object`` have changed.
+
+    If ``related_obj`` is given, log that a related object's field values have
+    been changed. (useful for logging changes made with admin inlines)
+    """
+    return create_logentry(user_id, obj, CHANGE, _get_change_message(obj, fields, related_obj))
 
 
 def log_deletion(user_id: int, obj: Model) -> LogEntry:
     """Log that an object will be deleted."""
     return create_logentry(user_id, obj, DELETION)
+
+
+class LogCollector:
+    """
+    Collect LogEntry objects and create them with a single query.
+
+    Use as a context manager: the collected LogEntry objects are created when
+    the context is exited without an exception. When used within a
+    transaction, the objects are therefore only saved together with the
+    changes that they log:
+
+        with transaction.atomic(), LogCollector() as logs:
+            obj.save()
+            logs.log_addition(user_id, obj)
+    """
+
+    def __init__(self) -> None:
+        self.entries: List[LogEntry] = []
+        self._content_type_ids: Dict[Type[Model], int] = {}
+
+    def __enter__(self) -> "LogCollector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore[no-untyped-def]
+        if exc_type is None:
+            self.flush()
+
+    def flush(self) -> List[LogEntry]:
+        """Create the collected LogEntry objects."""
+        entries, self.entries = self.entries, []
+        return LogEntry.objects.bulk_create(entries)
+
+    def get_content_type_id(self, obj: Model) -> int:
+        """Return the id of the ContentType of the model of ``obj``."""
+        # noinspection PyUnresolvedReferences
+        model = obj._meta.model
+        if model not in self._content_type_ids:
+            self._content_type_ids[model] = get_content_type_for_model(obj).pk
+        return self._content_type_ids[model]
+
+    def create_logentry(self, user_id: int, obj: Model, action_flag: int, message: Union[str, list] = "") -> LogEntry:
+        """Add a LogEntry object for an action. See create_logentry."""
+        if isinstance(message, list):
+            message = json.dumps(message)
+        entry = LogEntry(
+            user_id=user_id,
+            content_type_id=self.get_content_type_id(obj),
+            object_id=str(obj.pk),
+            object_repr=str(obj)[:200],
+            action_flag=action_flag,
+            change_message=message,
+        )
+        self.entries.append(entry)
+        return entry
+
+    def log_addition(self, user_id: int, obj: Model, related_obj: Model = None) -> LogEntry:
+        """Log the addition of ``obj`` (or ``related_obj``). See log_addition."""
+        return self.create_logentry(user_id, obj, ADDITION, _get_addition_message(obj, related_obj))
+
+    def log_change(
+        self, user_id: int, obj: Model, fields: Union[Sequence[str], str], related_obj: Model = None
+    ) -> LogEntry:
+        """Log changes to the ``fields`` of ``obj`` (or ``related_obj``). See log_change."""
+        return self.create_logentry(user_id, obj, CHANGE, _get_change_message(obj, fields, related_obj))
+
+    def log_deletion(self, user_id: int, obj: Model) -> LogEntry:
+        """Log the deletion of ``obj``. See log_deletion."""
+        return self.create_logentry(user_id, obj, DELETION)
@@ -0,0 +1,116 @@
+"""
+Helpers for counting the results of (changelist) querysets.
+
+Counting the rows of a table or of a filtered queryset requires Postgres to
+scan every matching row. For large result sets, the counts can instead be
+estimated using the statistics of the query planner; see the settings
+COUNT_ESTIMATE_THRESHOLD and TOTAL_COUNT_CACHE_TIMEOUT.
+"""
+
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model, QuerySet
+
+
+class RowCount(int):
+    """
+    A count of rows that knows whether it is an estimate.
+
+    Attributes:
+        - estimated (bool): whether the count is an estimate
+    """
+
+    estimated: bool
+
+    def __new__(cls, value: int, estimated: bool = False) -> "RowCount":
+        count = super().__new__(cls, value)
+        count.estimated = estimated
+        return count
+
+
+def estimate_table_count(model: Type[Model], using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Return the planner's estimate of the number of rows in the table of the
+    given model (pg_class.reltuples).
+
+    Return -1 if the table has not been analyzed yet.
+    """
+    # noinspection PyUnresolvedReferences
+    db_table = model._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [db_table])
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+def estimate_query_count(queryset: QuerySet) -> int:
+    """Return the planner's estimate of the number of rows of the given queryset."""
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _get_threshold() -> int:
+    """Return the count from which on estimates are used, or 0 if disabled."""
+    return settings.COUNT_ESTIMATE_THRESHOLD or 0
+
+
+def get_result_estimate(queryset: QuerySet) -> Optional[RowCount]:
+    """
+    Return the planner's estimate of the number of results of the given
+    queryset, if the estimate is above the COUNT_ESTIMATE_THRESHOLD setting.
+
+    Return None if the results should be counted instead.
+    """
+    threshold = _get_threshold()
+    if threshold:
+        estimate = estimate_query_count(queryset)
+        if estimate >= threshold:
+            return RowCount(estimate, estimated=True)
+    return None
+
+
+def get_result_count(queryset: QuerySet) -> RowCount:
+    """
+    Return the number of results of the given queryset.
+
+    If the estimated number of results is above the COUNT_ESTIMATE_THRESHOLD
+    setting, return the estimate instead of counting the results.
+    """
+    estimate = get_result_estimate(queryset)
+    if estimate is not None:
+        return estimate
+    return RowCount(queryset.count())
+
+
+def get_total_count(model: Type[Model], using: str = DEFAULT_DB_ALIAS) -> RowCount:
+    """
+    Return the number of records of the given model.
+
+    Use the table statistics (pg_class.reltuples) if the estimated number of
+    records is above the COUNT_ESTIMATE_THRESHOLD setting. Otherwise, count
+    the records and cache the count for TOTAL_COUNT_CACHE_TIMEOUT seconds.
+    """
+    threshold = _get_threshold()
+    if threshold:
+        estimate = estimate_table_count(model, using)
+        if estimate >= threshold:
+            return RowCount(estimate, estimated=True)
+    # noinspection PyUnresolvedReferences
+    key = f"total_count:{using}:{model._meta.label_lower}"
+    count = cache.get(key)
+    if count is None:
+        # noinspection PyProtectedMember
+        count = model._default_manager.using(using).count()
+        if settings.TOTAL_COUNT_CACHE_TIMEOUT:
+            cache.set(key, count, settings.TOTAL_COUNT_CACHE_TIMEOUT)
+    return RowCount(count)
@@ -1,13 +1,29 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Type
 
 from django.db import models, transaction
-from django.db.models import Model, QuerySet
-from django.db.utils import IntegrityError
+from django.db.models import Exists, Model, OuterRef, QuerySet
 
-from dbentry.utils.admin import log_addition, log_change, log_deletion
+from dbentry.utils.admin import LogCollector
 from dbentry.utils.models import get_model_relations, get_relation_info_to, get_updatable_fields, is_protected
 
 
+def _get_unique_fields(related_model: Type[Model], related_field: models.Field) -> List[List[str]]:
+    """
+    For each unique constraint of ``related_model`` that includes the field
+    ``related_field``, return the names of the other fields of the constraint.
+    """
+    # noinspection PyUnresolvedReferences
+    opts = related_model._meta
+    unique_fields = [*opts.unique_together, *(constraint.fields for constraint in opts.total_unique_constraints)]
+    if related_field.unique:
+        unique_fields.append([related_field.name])
+    return [
+        [field_name for field_name in fields if field_name != related_field.name]
+        for fields in unique_fields
+        if related_field.name in fields
+    ]
+
+
 def merge_records(
     original: Model,
     queryset: QuerySet,
@@ -53,13 +69,15 @@ def merge_records(
                 if v and k not in update_data:
                     update_data[k] = v
 
-    with transaction.atomic():
+    # Collect the log entries and create them with one query at the end of the
+    # transaction.
+    with transaction.atomic(), LogCollector() as logs:
         # Update the original object with the additional data and
         # log the changes.
         if expand_original and update_data:
             original_qs.update(**update_data)
             if user_id:
-                log_change(user_id, original_qs.get(), list(update_data.keys()))
+                logs.log_change(user_id, original_qs.get(), list(update_data.keys()))
 
         for rel in get_model_relations(model, forward=False):
             related_model, related_field = get_relation_info_to(model, rel)
@@ -67,78 +85,43 @@ def merge_records(
             # related to original:
             # noinspection PyUnresolvedReferences
             merger_related = related_model.objects.filter(**{related_field.name + "__in": queryset})
-            qs_to_be_updated = merger_related.all()
-            if not qs_to_be_updated.exists():
-                continue
-
-            # Exclude all related objects that the original has already to
-            # avoid IntegrityErrors due to UNIQUE CONSTRAINT violations.
-            # noinspection PyUnresolvedReferences
-            for unique_together in related_model._meta.unique_together:
-                if related_field.name in unique_together:
-                    # The ForeignKey field that led us from original's model
-                    # to this related model is part of this unique_together.
-                    # Since we're filtering against this field being equal to
-                    # 'original' in order to find all the values that original
-                    # already has, the values of this field will always be equal
-                    # to original's id.
-                    # But we're trying to exclude objects that are not yet
-                    # related to original (i.e. related_field.name cannot be
-                    # equal to original_id), and by including this field and its
-                    # values in the exclude parameters, we would exclude all
-                    # those very objects that are not yet related to original.
-                    # Thus, we need to remove this field from the list of
-                    # parameters passed to values().
-                    unique_together = list(unique_together)
-                    unique_together.remove(related_field.name)
-                    if not unique_together:  # pragma: no cover
-                        continue
+            # Move the related objects to original with a single UPDATE.
+            # Skip related objects that would violate a unique constraint:
+            # objects with values that the original already has, and
+            # duplicates among the related objects of the other records
+            # (only the first of those is moved).
+            qs_to_be_updated = merger_related
+            for fields in _get_unique_fields(related_model, related_field):
+                values = {field_name: OuterRef(field_name) for field_name in fields}
                 # noinspection PyUnresolvedReferences
-                already_related = related_model.objects.filter(**{related_field.name: original})
-                for values in already_related.values(*unique_together):
-                    # Exclude all values that would violate the unique
-                    # constraints (i.e. values that original has already):
-                    qs_to_be_updated = qs_to_be_updated.exclude(**values)
-
-            # Get the ids of the related objects that will be updated.
-            # If an IntegrityError occurs, despite our efforts above,
-            # this list is reevaluated.
-            updated_ids = list(qs_to_be_updated.values_list("pk", flat=True))
-            try:
-                with transaction.atomic():
-                    qs_to_be_updated.update(**{related_field.name: original})
-            except IntegrityError:
-                # An object that the original already has was left in
-                # qs_to_be_updated. Work through each object in
-                # qs_to_be_updated and do the update individually.
-                updated_ids = []
-                for pk in qs_to_be_updated.values_list("pk", flat=True):
-                    # noinspection PyUnresolvedReferences
-                    loop_qs = related_model.objects.filter(pk=pk)
-                    try:
-                        with transaction.atomic():
-                            loop_qs.update(**{related_field.name: original})
-                    except IntegrityError:
-                        # Ignore UNIQUE CONSTRAINT violations at this stage.
-                        # If an error occurred, the related object will not be
-                        # 'moved' to original and later deleted.
-                        pass
-                    else:
-                        updated_ids.append(pk)
+                already_related = related_model.objects.filter(**{related_field.name: original}, **values)
+                duplicates = merger_related.filter(pk__lt=OuterRef("pk"), **values)
+                qs_to_be_updated = qs_to_be_updated.exclude(Exists(already_related)).exclude(Exists(duplicates))
+            if user_id:
+                # Fetch the objects to log before they are moved; afterwards,
+                # they can no longer be told apart from the related objects
+                # that the original already had.
+                # The change messages for the objects of m2m intermediary
+                # tables include the object on the other end of the relation:
+                # noinspection PyUnresolvedReferences
+                foreign_keys = [f.name for f in related_model._meta.concrete_fields if f.is_relation]
+                moved = list(qs_to_be_updated.select_related(*foreign_keys))
+            qs_to_be_updated.update(**{related_field.name: original})
 
             # Log the changes:
-            for pk in updated_ids:
-                # noinspection PyUnresolvedReferences
-                obj = related_model.objects.get(pk=pk)
-                if user_id:
+            if user_id:
+                for obj in moved:
+                    setattr(obj, related_field.name, original)
                     # Log the addition of a new related object for original.
-                    log_addition(user_id, original, obj)
+                    logs.log_addition(user_id, original, obj)
                     # Log the change of the related object's relation field
                     # pointing towards original.
-                    log_change(user_id, obj, related_field.name)
+                    logs.log_change(user_id, obj, related_field.name)
 
             if rel.on_delete == models.PROTECT:
-                not_updated = merger_related.exclude(pk__in=updated_ids)
+                # The objects that were moved no longer reference the other
+                # records; only the objects that were not moved remain:
+                not_updated = merger_related
                 if not_updated.exists() and not is_protected(not_updated):
                     # FIXME: unreachable code: if the relation is protected,
                     #  then how could is_protected(not_updated) be False?
@@ -147,7 +130,7 @@ def merge_records(
                     # Delete the related object now, or the merge will fail.
                     if user_id:
                         for obj in not_updated:
-                            log_deletion(user_id, obj)
+                            logs.log_deletion(user_id, obj)
                     not_updated.delete()
 
         # All related objects that could have been protected should now have
@@ -160,6 +143,6 @@ def merge_records(
             raise protected
         if user_id:
             for obj in queryset:
-                log_deletion(user_id, obj)
+                logs.log_deletion(user_id, obj)
         queryset.delete()
     return original_qs.first(), update_data
@@ -0,0 +1,307 @@
+"""
+Keyset (seek) pagination.
+
+Instead of skipping the rows of the previous pages with OFFSET, a keyset
+paginator filters the results to the rows that come after the last row of the
+previous page, according to the ordering of the queryset. The cost of fetching
+a page therefore does not depend on the position of the page in the result
+set, and no COUNT query is needed.
+
+The position in the result set is passed around as an opaque cursor token
+that contains the ordering values of the row to seek to.
+"""
+
+import json
+from collections.abc import Sequence
+from typing import Any, List, Optional, Tuple, Type
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Model, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import OrderBy
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from dbentry.fields import PartialDate
+
+CURSOR_VAR = "c"
+
+# A list of (field or annotation name, descending) tuples:
+Keys = List[Tuple[str, bool]]
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder for the ordering values of a cursor."""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, PartialDate):
+            return o.db_value
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence, reverse: bool = False) -> str:
+    """
+    Return a cursor token for the row with the given ordering values.
+
+    If ``reverse`` is True, the cursor points to the rows that come before
+    that row.
+    """
+    data = {"v": list(values)}
+    if reverse:
+        data["r"] = 1
+    return urlsafe_base64_encode(json.dumps(data, cls=CursorEncoder).encode())
+
+
+def decode_cursor(cursor: str) -> Tuple[List[Any], bool]:
+    """Return the ordering values and the direction of the given cursor token."""
+    try:
+        data = json.loads(urlsafe_base64_decode(cursor))
+        values, reverse = data["v"], bool(data.get("r"))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor.")
+    return values, reverse
+
+
+def _expand_ordering(model: Type[Model], name: str, descending: bool) -> Optional[Keys]:
+    """
+    Resolve the ordering item ``name`` into keys of concrete fields.
+
+    Orderings on relations are expanded into the ordering of the related
+    model (like Django does when compiling the query). Return None, if the
+    ordering refers to a field that may introduce duplicate rows (i.e. a
+    many-valued relation), or to something that is not a field.
+    """
+    current, field, path = model, None, []
+    for part in name.split(LOOKUP_SEP):
+        if field is not None:
+            if not (field.many_to_one or field.one_to_one):
+                return None
+            current = field.related_model
+        if part == "pk":
+            part = current._meta.pk.attname
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        path.append(part)
+    if not field.concrete:
+        return None
+    if not field.is_relation or part == field.attname:
+        return [(LOOKUP_SEP.join(path), descending)]
+    related_ordering = field.related_model._meta.ordering
+    if not related_ordering:
+        # Django orders by the foreign key column.
+        return [(LOOKUP_SEP.join(path[:-1] + [field.attname]), descending)]
+    keys = []
+    for item in related_ordering:
+        if not isinstance(item, str) or item == "?":
+            return None
+        expanded = _expand_ordering(
+            model, LOOKUP_SEP.join(path + [item.lstrip("-")]), item.startswith("-") != descending
+        )
+        if expanded is None:
+            return None
+        keys.extend(expanded)
+    return keys
+
+
+def get_keyset_ordering(queryset: QuerySet) -> Optional[Tuple[QuerySet, Keys]]:
+    """
+    Return the queryset ordered by the keys of a keyset pagination, and the
+    keys.
+
+    Ordering expressions are added to the queryset as annotations, and the
+    primary key is added to the ordering to make it unique. Return None, if the
+    ordering cannot be used for keyset pagination (random ordering, NULLS
+    FIRST/LAST or ordering on many-valued relations).
+    """
+    query = queryset.query
+    opts = queryset.model._meta
+    if query.order_by:
+        ordering = list(query.order_by)
+    elif query.default_ordering:
+        ordering = list(opts.ordering)
+    else:
+        ordering = []
+    keys: Keys = []
+    annotations = {}
+    for i, item in enumerate(ordering):
+        if isinstance(item, str):
+            if item == "?":
+                return None
+            descending, name = item.startswith("-"), item.lstrip("-")
+            if name in query.annotations:
+                keys.append((name, descending))
+                continue
+            expanded = _expand_ordering(queryset.model, name, descending)
+            if expanded is None:
+                return None
+            keys.extend(expanded)
+        else:
+            if isinstance(item, F):
+                item = item.asc()
+            if not isinstance(item, OrderBy) or item.nulls_first or item.nulls_last:
+                return None
+            alias = f"_keyset_{i}"
+            annotations[alias] = item.expression
+            keys.append((alias, item.descending))
+    unique_keys: Keys = []
+    for name, descending in keys:
+        if name not in {k for k, _ in unique_keys}:
+            unique_keys.append((name, descending))
+    if opts.pk.attname not in {k for k, _ in unique_keys}:
+        unique_keys.append((opts.pk.attname, False))
+    queryset = queryset.annotate(**annotations).order_by(
+        *(f"-{name}" if descending else name for name, descending in unique_keys)
+    )
+    return queryset, unique_keys
+
+
+def keyset_filter(keys: Keys, values: Sequence, reverse: bool = False) -> Q:
+    """
+    Return a filter for the rows that come after the row with the given
+    ordering values (or before the row, if ``reverse`` is True).
+    """
+    # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+    # Postgres sorts NULL values as if they were larger than any other value.
+    result, equal = Q(), Q()
+    for (name, descending), value in zip(keys, values):
+        if reverse:
+            descending = not descending
+        if value is None:
+            after = Q(**{f"{name}__isnull": False}) if descending else None
+            same = Q(**{f"{name}__isnull": True})
+        else:
+            if descending:
+                after = Q(**{f"{name}__lt": value})
+            else:
+                after = Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+            same = Q(**{name: value})
+        if after is not None:
+            result |= equal & after
+        equal &= same
+    return result
+
+
+class KeysetPage(Sequence):
+    """
+    A page of results of a keyset pagination.
+
+    Attributes:
+        - object_list: the queryset of the objects on this page
+        - next_cursor (str): the cursor for the next page, or an empty string
+          if this is the last page
+        - previous_cursor (str): the cursor for the previous page, or an empty
+          string if this is the first page
+        - number (int): the page number given by the caller. Keyset pages
+          are not numbered; the number can be used to track the position.
+    """
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        paginator: "KeysetPaginator",
+        next_cursor: str = "",
+        previous_cursor: str = "",
+        number: int = 1,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.number = number
+
+    def __repr__(self) -> str:
+        return "<Keyset page %s>" % self.number
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+    def has_previous(self) -> bool:
+        return bool(self.previous_cursor)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate the given queryset by seeking to the position of a cursor.
+
+    Use get_keyset_paginator to create a paginator for a queryset.
+    """
+
+    def __init__(self, queryset: QuerySet, keys: Keys, per_page: int) -> None:
+        self.queryset = queryset
+        self.keys = keys
+        self.per_page = int(per_page)
+
+    def page(self, cursor: str = "", number: int = 1) -> KeysetPage:
+        """Return the page of results that follows the given cursor."""
+        queryset = self.queryset
+        names = [name for name, _descending in self.keys]
+        reverse = False
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            if len(values) != len(self.keys):
+                raise InvalidCursor("Invalid cursor.")
+            try:
+                queryset = queryset.filter(keyset_filter(self.keys, values, reverse))
+            except (ValueError, TypeError, ValidationError):
+                # The values do not fit the fields of the ordering.
+                raise InvalidCursor("Invalid cursor.")
+        if reverse:
+            queryset = queryset.reverse()
+        rows = list(queryset.values_list(*names)[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+        pk_index = names.index(self.queryset.model._meta.pk.attname)
+        return KeysetPage(
+            # Query the objects of this page by their primary keys. The keys
+            # have already been found by the seek query above.
+            self.queryset.filter(pk__in=[row[pk_index] for row in rows]),
+            self,
+            next_cursor=encode_cursor(rows[-1]) if rows and has_next else "",
+            previous_cursor=encode_cursor(rows[0], reverse=True) if rows and has_previous else "",
+            number=number,
+        )
+
+
+def get_keyset_paginator(queryset: QuerySet, per_page: int) -> Optional[KeysetPaginator]:
+    """
+    Return a keyset paginator for the given queryset, or None if the ordering
+    of the queryset does not support keyset pagination.
+    """
+    ordering = get_keyset_ordering(queryset)
+    if ordering is None:
+        return None
+    return KeysetPaginator(*ordering, per_page=per_page)
+
+
+def get_page_queryset(queryset: QuerySet, object_list: QuerySet) -> QuerySet:
+    """
+    Return the objects of ``object_list`` - a page of ``queryset`` - as a
+    queryset that is filtered by the primary keys of the objects.
+
+    Annotations that are added to the returned queryset are then only computed
+    for the objects of the page instead of for every result of ``queryset``.
+    """
+    return queryset.filter(pk__in=list(object_list.values_list("pk", flat=True)))
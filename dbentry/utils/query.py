@@ -1,7 +1,8 @@
-from typing import Any, Optional, Union
+from typing import Any, List, Optional, Sequence, Union
 
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db import models
+from django.core.exceptions import EmptyResultSet
+from django.db import DEFAULT_DB_ALIAS, connections, models
 from django.db.models import Expression, Func, Value
 from django.db.models.expressions import Combinable
 
@@ -64,3 +65,51 @@ def string_list(path: str, sep: str = ", ", length: int = LENGTH_LIMIT, distinct
     `length`.
     """
     return limit(array_to_string(to_array(path, distinct=distinct), sep=sep), length=length)
+
+
+def count_querysets(querysets: Sequence[models.QuerySet], using: str = DEFAULT_DB_ALIAS) -> List[int]:
+    """
+    Count the rows of every queryset in `querysets` with a single query.
+
+    The count queries are combined with UNION ALL, so that only one round trip
+    to the database is required. Returns the counts in the order of the given
+    querysets.
+    """
+    counts = [0] * len(querysets)
+    selects, params = [], []
+    for i, queryset in enumerate(querysets):
+        try:
+            sql, query_params = queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            # The queryset is empty (f.ex. QuerySet.none()), no need to query.
+            continue
+        selects.append(f"SELECT {i:d}, COUNT(*) FROM ({sql}) AS __count_{i:d}")
+        params.extend(query_params)
+    if selects:
+        with connections[using].cursor() as cursor:
+            cursor.execute(" UNION ALL ".join(selects), params)
+            for i, count in cursor.fetchall():
+                counts[i] = count
+    return counts
+
+
+def add_ordering_annotations(queryset: models.QuerySet, ordering: Sequence[Any]) -> models.QuerySet:
+    """
+    Add the overview annotations of the queryset's model that are referred to
+    by the given ordering.
+
+    The other overview annotations can then be added to the objects of the
+    result page only (see dbentry.utils.pagination.get_page_queryset).
+    """
+    get_overview_annotations = getattr(queryset.model, "get_overview_annotations", None)
+    if get_overview_annotations is None:
+        return queryset
+    names = {item.lstrip("-") for item in ordering if isinstance(item, str)}
+    annotations = {
+        name: expr
+        for name, expr in get_overview_annotations().items()
+        if name in names and name not in queryset.query.annotations
+    }
+    if not annotations:
+        return queryset
+    return queryset.annotate(**annotations)
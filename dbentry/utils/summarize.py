@@ -9,9 +9,10 @@ from collections import OrderedDict
 from typing import Any, Callable, Iterable, Iterator, Optional, Type, TypeVar
 
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db.models import Model, QuerySet
+from django.db.models import Expression, Model, OuterRef, QuerySet, Subquery
 
 from dbentry import models as _models
+from dbentry.utils.pagination import get_keyset_paginator
 from dbentry.utils.text import concat_limit
 
 ModelClass = TypeVar("ModelClass", bound=Type[Model])  # a django model class
@@ -52,6 +53,14 @@ def _get_array_agg(path: str, ordering: Optional[str] = None) -> ArrayAgg:
     return ArrayAgg(path, distinct=True, ordering=ordering)
 
 
+def _as_subquery(model: ModelClass, expression: Expression) -> Subquery:
+    """
+    Return a subquery that evaluates the aggregate 'expression' for the
+    object of the outer query.
+    """
+    return Subquery(model._default_manager.order_by().filter(pk=OuterRef("pk")).annotate(x=expression).values("x"))
+
+
 def _bool(v: Any) -> str:
     return "Ja" if bool(v) else "Nein"
 
@@ -65,6 +74,8 @@ class Parser:
     # arguments for QuerySet.select_related and prefetch_related
     select_related: Iterable = ()
     prefetch_related: Iterable = ()
+    # the number of objects fetched from the database at a time
+    chunk_size: int = 500
 
     def get_annotations(self) -> dict:
         """Return annotation declarations to be added to the queryset."""
@@ -81,16 +92,49 @@ class Parser:
                 pass
         if self.prefetch_related:
             queryset = queryset.prefetch_related(*self.prefetch_related)
-        return queryset.annotate(**self.get_annotations())
+        annotations = {}
+        for name, expression in self.get_annotations().items():
+            if getattr(expression, "contains_aggregate", False):
+                # Aggregate in a separate subquery for each annotation:
+                # joining several relations in the same query would return
+                # a row for every combination of the related objects.
+                expression = _as_subquery(queryset.model, expression)
+            annotations[name] = expression
+        return queryset.annotate(**annotations)
 
     def get_summary(self, obj: ModelObject) -> OrderedDict:
         """Return an OrderedDict summary of the given model object 'obj'."""
         raise NotImplementedError("Subclasses must implement this method.")  # pragma: no cover
 
     def get_summaries(self, queryset: QuerySet) -> Iterator[OrderedDict]:
-        """Yield summaries (OrderedDicts) for each object in 'queryset'."""
-        for obj in self.modify_queryset(queryset):  # pragma: no cover
-            yield self.get_summary(obj)
+        """
+        Yield summaries (OrderedDicts) for each object in 'queryset'.
+
+        The objects are fetched in chunks of size 'chunk_size', using keyset
+        pagination on the ordering of the queryset. If the ordering does not
+        support keyset pagination, the primary keys of the objects are fetched
+        in the order of the queryset first, and the objects are then fetched
+        in chunks of those primary keys.
+        """
+        paginator = get_keyset_paginator(queryset, self.chunk_size)
+        if paginator is None:
+            # Slicing the queryset would evaluate a random ordering anew for
+            # every chunk, and orderings on many-valued relations may return
+            # an object more than once.
+            pks = list(dict.fromkeys(queryset.values_list("pk", flat=True)))
+            for i in range(0, len(pks), self.chunk_size):
+                chunk = pks[i : i + self.chunk_size]
+                objects = {obj.pk: obj for obj in self.modify_queryset(queryset.order_by().filter(pk__in=chunk))}
+                for pk in chunk:
+                    yield self.get_summary(objects[pk])
+            return
+        page = paginator.page()
+        while True:
+            for obj in self.modify_queryset(page.object_list):
+                yield self.get_summary(obj)
+            if not page.has_next():
+                return
+            page = paginator.page(page.next_cursor)
 
 
 @_register(_models.Person)
@@ -117,6 +117,14 @@ BOOTSTRAP5 = {
 
 ANONYMOUS_CAN_VIEW = True
 
+COUNT_ESTIMATE_THRESHOLD = None
+
+TOTAL_COUNT_CACHE_TIMEOUT = 0
+
+NAME_UPDATE_WORKER = False
+
+EXPORT_JOB_WORKER = False
+
 CSRF_FAILURE_VIEW = "dbentry.csrf.csrf_failure"
 
 ONLINE_HELP_URL = "https://foo.bar/help/"
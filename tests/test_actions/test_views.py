@@ -1,10 +1,10 @@
 from collections import OrderedDict
-from unittest.mock import DEFAULT, Mock, PropertyMock, patch
+from unittest.mock import Mock, PropertyMock, patch
 
 from django import forms
 from django.contrib import admin
 from django.contrib.admin import helpers
-from django.contrib.admin.models import LogEntry
+from django.contrib.admin.models import DELETION, LogEntry
 from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission
@@ -1632,23 +1632,16 @@ class TestChangeBestand(AdminActionViewTestCase, LoggingTestMixin):
         )
         form_data["bestand_set-%s-2-DELETE" % self.obj1.pk] = True
 
-        patches = {
-            "log_addition": DEFAULT,
-            "log_change": DEFAULT,
-            "log_deletion": DEFAULT,
-        }
-        with patch.multiple("dbentry.actions.views", **patches) as mocks:
-            with patch("dbentry.admin.admin.AusgabenAdmin.log_change") as admin_log_change:
-                self.post_response(
-                    path=self.changelist_path,
-                    data={
-                        "action": "change_bestand",
-                        helpers.ACTION_CHECKBOX_NAME: [self.obj1.pk],
-                        "action_confirmed": "Yes",
-                        **form_data,
-                    },
-                    follow=False,
-                )
+        self.post_response(
+            path=self.changelist_path,
+            data={
+                "action": "change_bestand",
+                helpers.ACTION_CHECKBOX_NAME: [self.obj1.pk],
+                "action_confirmed": "Yes",
+                **form_data,
+            },
+            follow=False,
+        )
         added = _models.Bestand.objects.order_by("-pk").first()
         changed.refresh_from_db()
 
@@ -1659,18 +1652,31 @@ class TestChangeBestand(AdminActionViewTestCase, LoggingTestMixin):
             {"changed": {"name": name, "object": str(changed), "fields": ["lagerort"]}},
             {"deleted": {"name": name, "object": str(deleted)}},
         ]
-        admin_log_change.assert_called()
-        _request, formset_instance, change_message = admin_log_change.call_args[0]
-        self.assertEqual(formset_instance, self.obj1)
-        self.assertEqual(change_message, expected_change_message)
+        self.assertLoggedChange(self.obj1, change_message=expected_change_message)
 
         # Check the log entries for the Bestand instances:
-        mocks["log_addition"].assert_called_with(self.super_user.pk, added)
-        mocks["log_change"].assert_called_with(self.super_user.pk, changed, fields=["lagerort"])
-        # Can't compare the instances (second argument) directly, since one of
-        # them has been deleted.
-        args, kwargs = mocks["log_deletion"].call_args
-        self.assertEqual((args[0], str(args[1])), (self.super_user.pk, str(deleted)))
+        self.assertLoggedAddition(added)
+        self.assertLoggedChange(changed, change_message=[{"changed": {"fields": ["Lagerort"]}}])
+        # The formset has already deleted the instance when the deletion is
+        # logged; look the log entry up by the object's representation:
+        self.assertTrue(LogEntry.objects.filter(action_flag=DELETION, object_repr=str(deleted)).exists())
+
+    def test_create_log_entries_single_query(self):
+        """Assert that the LogEntry objects are created with a single query."""
+        form_data = self.get_form_data(self.obj1, (None, self.lagerort1.pk), (None, self.lagerort2.pk))
+        with patch.object(LogEntry.objects, "bulk_create", wraps=LogEntry.objects.bulk_create) as bulk_create_mock:
+            self.post_response(
+                path=self.changelist_path,
+                data={
+                    "action": "change_bestand",
+                    helpers.ACTION_CHECKBOX_NAME: [self.obj1.pk],
+                    "action_confirmed": "Yes",
+                    **form_data,
+                },
+                follow=False,
+            )
+        bulk_create_mock.assert_called_once()
+        self.assertEqual(LogEntry.objects.count(), 3)
 
 
 @override_settings(ROOT_URLCONF=URLConf)
@@ -1865,8 +1871,9 @@ class TestSummarize(TestCase):
                 OrderedDict(ID="5678", Name="Spam & Sausage"),
             ]
             response = text_summary(queryset=None)
+            content = b"".join(response.streaming_content)
         expected = (
             b'<p>ID: 1234</p><p>Name: Egg & Bacon</p><hr style="break-after:page;">'
             b'<p>ID: 5678</p><p>Name: Spam & Sausage</p><hr style="break-after:page;">'
         )
-        self.assertEqual(response.content, expected)
+        self.assertEqual(content, expected)
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 from django.contrib import admin, contenttypes
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
 from django.contrib.admin.models import LogEntry
-from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR
+from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR, SEARCH_VAR
 from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission, User
 from django.contrib.contenttypes.models import ContentType
@@ -34,7 +34,7 @@ class AdminTestMethodsMixin(object):
     # The number of queries expected for a changelist request:
     # Commonly, it is 5 queries: 1. session, 2. auth, 3. result count,
     # 4. full count, 5. result list
-    num_queries_changelist = 5
+    num_queries_changelist = 6
 
     def get_annotated_model_obj(self: Union["AdminTestMethodsMixin", "AdminTestCase"], obj):
         """Apply the model_admin's changelist annotations to the given object."""
@@ -53,6 +53,11 @@ class AdminTestMethodsMixin(object):
         response = self.client.get(path=self.changelist_path)
         self.assertEqual(response.status_code, 200)
 
+    def test_changelist_search(self: Union["AdminTestMethodsMixin", "AdminTestCase"]):
+        """Assert that the changelist can be searched."""
+        response = self.client.get(path=self.changelist_path, data={SEARCH_VAR: "Test"})
+        self.assertEqual(response.status_code, 200)
+
     def test_add_page_can_be_reached(self: Union["AdminTestMethodsMixin", "AdminTestCase"]):
         """Assert that the add page can be reached."""
         response = self.client.get(path=self.add_path)
@@ -228,6 +233,18 @@ class TestAusgabenAdmin(AdminTestMethodsMixin, AdminTestCase):
         )
         super().setUpTestData()
 
+    def test_changelist_search_results(self):
+        """Assert that searching the changelist finds the expected Ausgabe records."""
+        obj = make(_models.Ausgabe, ausgabejahr__jahr=2020, ausgabenum__num=10, beschreibung="Sonderheft")
+        other = make(_models.Ausgabe, ausgabejahr__jahr=2000, beschreibung="Jubiläum")
+        for search_term in ("2020-10", "Sonderheft"):
+            with self.subTest(search_term=search_term):
+                response = self.client.get(path=self.changelist_path, data={SEARCH_VAR: search_term})
+                self.assertEqual(response.status_code, 200)
+                result_list = response.context["cl"].result_list
+                self.assertIn(obj, result_list)
+                self.assertNotIn(other, result_list)
+
     def test_changelist_queries(self):
         """
         Assert that the number of queries needed for the changelist remains
@@ -265,10 +282,10 @@ class TestAusgabenAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("jahr_list", annotations)
         self.assertIsInstance(annotations["jahr_list"], Func)
         self.assertIn("num_list", annotations)
@@ -517,10 +534,10 @@ class TestAutorAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("magazin_list", annotations)
         self.assertIsInstance(annotations["magazin_list"], Func)
 
@@ -550,10 +567,10 @@ class TestBandAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("genre_list", annotations)
         self.assertIsInstance(annotations["genre_list"], Func)
         self.assertIn("musiker_list", annotations)
@@ -708,10 +725,10 @@ class TestBaseBrochureAdmin(AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("jahr_list", annotations)
         self.assertIsInstance(annotations["jahr_list"], Func)
 
@@ -799,10 +816,10 @@ class TestBuchAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("autor_list", annotations)
         self.assertIsInstance(annotations["autor_list"], Func)
         self.assertIn("schlagwort_list", annotations)
@@ -901,10 +918,10 @@ class TestFotoAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("schlagwort_list", annotations)
         self.assertIsInstance(annotations["schlagwort_list"], Func)
 
@@ -934,10 +951,10 @@ class TestGenreAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("alias_list", annotations)
         self.assertIsInstance(annotations["alias_list"], Func)
 
@@ -1083,10 +1100,10 @@ class TestMagazinAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("orte_list", annotations)
         self.assertIsInstance(annotations["orte_list"], Func)
         self.assertIn("anz_ausgaben", annotations)
@@ -1167,10 +1184,10 @@ class TestMusikerAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("band_list", annotations)
         self.assertIsInstance(annotations["band_list"], Func)
         self.assertIn("genre_list", annotations)
@@ -1226,10 +1243,10 @@ class TestPersonAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("is_musiker", annotations)
         self.assertIsInstance(annotations["is_musiker"], Exists)
         self.assertIn("is_autor", annotations)
@@ -1282,10 +1299,10 @@ class TestPlakatAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("veranstaltung_list", annotations)
         self.assertIsInstance(annotations["veranstaltung_list"], Func)
 
@@ -1357,10 +1374,10 @@ class TestSchlagwortAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("alias_list", annotations)
         self.assertIsInstance(annotations["alias_list"], Func)
 
@@ -1422,10 +1439,10 @@ class TestVeranstaltungAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("kuenstler_list", annotations)
         self.assertIsInstance(annotations["kuenstler_list"], Func)
 
@@ -1475,10 +1492,10 @@ class TestVideoAdmin(AdminTestMethodsMixin, AdminTestCase):
 
     def test_get_queryset_contains_annotations(self):
         """
-        Assert that the queryset returned by get_queryset contains the expected
+        Assert that the result list of the changelist contains the expected
         annotations.
         """
-        annotations = self.model_admin.get_queryset(self.get_request()).query.annotations
+        annotations = self.get_changelist(self.get_request(data={ALL_VAR: "1"})).result_list.query.annotations
         self.assertIn("kuenstler_list", annotations)
         self.assertIsInstance(annotations["kuenstler_list"], Func)
 
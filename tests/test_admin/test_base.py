@@ -1,6 +1,7 @@
 from unittest import mock
 from unittest.mock import patch
 
+from django.contrib.admin.views.main import PAGE_VAR
 from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
@@ -128,20 +129,6 @@ class MIZModelAdminTest(AdminTestCase):
                 "Audio has no field named 'this_is_no_field'",
             )
 
-    def test_get_queryset(self):
-        """Assert that get_queryset calls the queryset's overview method."""
-        mock_overview = mock.Mock()
-        with mock.patch("dbentry.admin.base.super") as super_mock:
-            for mock_queryset in [mock.Mock(spec_set=True), mock.Mock(overview=mock_overview)]:
-                super_mock.return_value.get_queryset.return_value = mock_queryset
-                has_overview = hasattr(mock_queryset, "overview")
-                with self.subTest(has_overview_attr=has_overview):
-                    self.model_admin.get_queryset(self.get_request())
-                    if has_overview:
-                        mock_overview.assert_called()
-                    else:
-                        mock_overview.assert_not_called()
-
     def test_get_changelist(self):
         """MIZModelAdmin should use MIZChangelist."""
         self.assertEqual(self.model_admin.get_changelist(self.get_request), MIZChangeList)
@@ -367,6 +354,19 @@ class MIZModelAdminTest(AdminTestCase):
             self.model_admin.get_search_results(request, qs, search_term="q")
             search_mock.assert_called()
 
+    def test_get_search_candidates(self):
+        """
+        Assert that get_search_candidates returns the number of candidates
+        that includes the results of the requested page.
+        """
+        test_data = [({}, 1000), ({PAGE_VAR: "100"}, 100 * 25), ({PAGE_VAR: "foo"}, 0)]
+        for request_data, expected in test_data:
+            with self.subTest(request_data=request_data):
+                with patch.object(self.model_admin, "search_candidates", new=1000):
+                    with patch.object(self.model_admin, "list_per_page", new=25):
+                        request = self.get_request(data=request_data)
+                        self.assertEqual(self.model_admin.get_search_candidates(request), expected)
+
 
 @override_settings(ROOT_URLCONF="tests.test_admin.urls")
 class ChangeConfirmationTest(AdminTestCase):
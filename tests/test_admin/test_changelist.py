@@ -91,6 +91,37 @@ class TestMIZChangeList(AdminTestCase):
         self.assertIn(ALL_VAR, changelist.get_show_all_url())
 
 
+class TestMIZChangeListOverview(AdminTestCase):
+    admin_site = miz_site
+    model = _models.Band
+    model_admin_class = _admin.BandAdmin
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj = make(cls.model, genre__genre="Rock")
+        super().setUpTestData()
+
+    def test_get_queryset_ordering_annotations(self):
+        """
+        Assert that get_queryset only adds the overview annotations that the
+        ordering refers to.
+        """
+        request = self.get_request()
+        changelist = self.model_admin.get_changelist_instance(request)
+        self.assertNotIn("genre_list", changelist.queryset.query.annotations)
+        request = self.get_request(data={ORDER_VAR: str(changelist.list_display.index("genre_string"))})
+        changelist = self.model_admin.get_changelist_instance(request)
+        self.assertIn("genre_list", changelist.queryset.query.annotations)
+        self.assertNotIn("musiker_list", changelist.queryset.query.annotations)
+
+    def test_get_results_overview_annotations(self):
+        """Assert that the overview annotations are added to the result_list."""
+        request = self.get_request(data={ALL_VAR: "1"})
+        changelist = self.model_admin.get_changelist_instance(request)
+        self.assertIn("musiker_list", changelist.result_list.query.annotations)
+        self.assertEqual(changelist.result_list.get().genre_list, "Rock")
+
+
 class TestAusgabeChangeList(AdminTestCase):
     admin_site = miz_site
     model = _models.Ausgabe
@@ -1,9 +1,10 @@
+import json
 from unittest.mock import Mock, patch, DEFAULT
 from urllib.parse import urlencode
 
 from django.http.request import QueryDict
 from django.urls import reverse
-from mizdb_tomselect.views import SEARCH_VAR
+from mizdb_tomselect.views import PAGE_VAR, SEARCH_VAR
 
 from dbentry import models as _models
 from dbentry.autocomplete.views import (
@@ -18,6 +19,7 @@ from dbentry.autocomplete.views import (
     AutocompleteMusiker,
     AutoSuffixAutocompleteView,
 )
+from dbentry.utils.pagination import CURSOR_VAR, KeysetPage
 from tests.case import DataTestCase, ViewTestCase
 from tests.model_factory import make
 from tests.test_autocomplete.models import Ausgabe
@@ -31,12 +33,29 @@ class TestMIZAutocompleteView(ViewTestCase):
     view_class = MIZAutocompleteView
 
     def test_get_page_results(self):
-        """Assert that overview is called on the page object list."""
+        """Assert that overview is called on the queryset of the page's objects."""
         overview_mock = Mock()
-        page_mock = Mock(object_list=Mock(overview=overview_mock))
+        page_mock = Mock()
         view = self.view_class()
         view.values_select = ["foo", "bar"]
-        view.get_page_results(page_mock)
+        with patch("dbentry.autocomplete.views.get_page_queryset") as get_page_queryset_mock:
+            get_page_queryset_mock.return_value = Mock(overview=overview_mock)
+            view.get_page_results(page_mock)
+            get_page_queryset_mock.assert_called_with(page_mock.paginator.object_list, page_mock.object_list)
+        overview_mock.assert_called_with("foo", "bar")
+
+    def test_get_page_results_keyset_page(self):
+        """
+        Assert that overview is called on the object list of a keyset page
+        directly.
+        """
+        overview_mock = Mock()
+        page = KeysetPage(Mock(overview=overview_mock), Mock())
+        view = self.view_class()
+        view.values_select = ["foo", "bar"]
+        with patch("dbentry.autocomplete.views.get_page_queryset") as get_page_queryset_mock:
+            view.get_page_results(page)
+            get_page_queryset_mock.assert_not_called()
         overview_mock.assert_called_with("foo", "bar")
 
     def test_search(self):
@@ -78,6 +97,35 @@ class TestMIZAutocompleteView(ViewTestCase):
                 view.create_object(None)
                 log_mock.assert_called()
 
+    def test_get_keyset_pagination(self):
+        """Assert that the response includes the cursor for the next page with keyset pagination."""
+        make(_models.Magazin, magazin_name="Bravo")
+        other = make(_models.Magazin, magazin_name="Spex")
+        request_data = {"model": "dbentry.magazin", "vs": json.dumps(["id", "magazin_name"])}
+        view = self.get_view(self.get_request(data=request_data))
+        view.keyset_pagination = True
+        view.paginate_by = 1
+        data = json.loads(view.get(view.request).content)
+        self.assertTrue(data["has_more"])
+        self.assertTrue(data["cursor"])
+
+        request_data.update({PAGE_VAR: 2, CURSOR_VAR: data["cursor"]})
+        view = self.get_view(self.get_request(data=request_data))
+        view.keyset_pagination = True
+        view.paginate_by = 1
+        data = json.loads(view.get(view.request).content)
+        self.assertEqual(data["results"], [{"id": other.pk, "magazin_name": "Spex"}])
+        self.assertEqual(data["page"], 2)
+        self.assertFalse(data["has_more"])
+        self.assertFalse(data["cursor"])
+
+    def test_get_no_keyset_pagination(self):
+        """Assert that the response does not include a cursor without keyset pagination."""
+        request_data = {"model": "dbentry.magazin", "vs": json.dumps(["id", "magazin_name"])}
+        view = self.get_view(self.get_request(data=request_data))
+        data = json.loads(view.get(view.request).content)
+        self.assertNotIn("cursor", data)
+
 
 class TestAutocompleteAusgabe(ViewTestCase):
     view_class = AutocompleteAusgabe
@@ -171,15 +219,6 @@ class TestAutocompleteMagazin(DataTestCase, ViewTestCase):
         cls.obj = make(cls.model, issn="12345679")
         super().setUpTestData()
 
-    def test_search(self):
-        """Assert that a search term that is a valid ISSN gets compacted."""
-        view = self.view_class()
-        for q, expected, is_valid_issn in [("1234-5679", "12345679", True), ("1234-5670", "1234-5670", False)]:
-            with self.subTest(search_term=q, is_valid_issn=is_valid_issn):
-                with patch("dbentry.autocomplete.views.MIZAutocompleteView.search") as super_mock:
-                    view.search(None, q)
-                    super_mock.assert_called_with(None, expected)
-
     def test_search_by_issn(self):
         """Assert that an ISSN can be used to search."""
         for issn in ("1234-5679", "12345679"):
@@ -6,6 +6,7 @@ from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core import checks
 from django.db import models as django_models
+from django.test import override_settings
 
 from dbentry.base.models import BaseModel
 from tests.case import MIZTestCase
@@ -126,13 +127,28 @@ class TestComputedNameModel(MIZTestCase):
         super().setUpTestData()
 
     def test_init(self):
-        """The name should be updated with new data upon initialization."""
+        """The name should be updated with new data when fetched from the database."""
         qs = self.model.objects.filter(pk=self.obj.pk)
         qs.update(vorname="Bob", _changed_flag=True)
         obj = qs.get()
         self.assertFalse(obj._changed_flag)
         self.assertEqual(obj._name, "Bob Tester")
 
+    def test_init_no_queries(self):
+        """Instantiating a model object should not query the database."""
+        with self.assertNumQueries(0):
+            self.model(pk=self.obj.pk, vorname="Bob", _changed_flag=True)
+
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_init_name_update_worker(self):
+        """The name should not be updated upon initialization, if the name update worker is used."""
+        qs = self.model.objects.filter(pk=self.obj.pk)
+        qs.update(vorname="Bob", _changed_flag=True)
+        with self.assertNumQueries(1):
+            obj = qs.get()
+        self.assertTrue(obj._changed_flag)
+        self.assertEqual(obj._name, "Alice Tester")
+
     def test_save_no_update(self):
         """save() should not update the name, if called with update=False."""
         self.obj.vorname = "Bob"
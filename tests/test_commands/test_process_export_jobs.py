@@ -0,0 +1,60 @@
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from dbentry import models as _models
+from dbentry.management.commands.process_export_jobs import Command
+from tests.model_factory import make
+from tests.test_export.test_jobs import ExportJobTestMixin
+
+
+@patch("dbentry.management.commands.process_export_jobs.close_old_connections")
+class TestCommand(ExportJobTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="alice")
+        cls.obj = make(_models.Autor, kuerzel="AT")
+
+    def call_command(self, **options):
+        stdout = io.StringIO()
+        Command(stdout=stdout).handle(**{"interval": 5, "once": True, "timeout": 3600, "max_age": 7, **options})
+        return stdout.getvalue()
+
+    def test_handle_once(self, _close_mock):
+        """Assert that handle runs the queued jobs until none is left."""
+        job1 = self.create_job(self.user, object_ids=[self.obj.pk])
+        job2 = self.create_job(self.user, object_ids=[self.obj.pk], filename="Autor2.csv")
+        output = self.call_command()
+        self.assertEqual(
+            list(_models.ExportJob.objects.values_list("status", flat=True).order_by().distinct()),
+            [_models.ExportJob.Status.DONE],
+        )
+        self.assertIn(f"Export {job1.pk} (Autor.csv): fertig", output)
+        self.assertIn(f"Export {job2.pk} (Autor2.csv): fertig", output)
+
+    def test_handle_empty_queue(self, _close_mock):
+        self.assertEqual(self.call_command(), "")
+
+    def test_handle_clean_up(self, _close_mock):
+        """Assert that handle marks stale jobs as failed and deletes old jobs when the queue is empty."""
+        now = timezone.now()
+        stale = self.create_job(self.user, status=_models.ExportJob.Status.RUNNING, started=now - timedelta(hours=2))
+        old = self.create_job(self.user, status=_models.ExportJob.Status.DONE, finished=now - timedelta(days=8))
+        output = self.call_command()
+        self.assertIn("1 stale exports marked as failed", output)
+        self.assertIn("1 old exports deleted", output)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, _models.ExportJob.Status.FAILED)
+        self.assertFalse(_models.ExportJob.objects.filter(pk=old.pk).exists())
+
+    def test_handle_max_age_zero(self, _close_mock):
+        """Assert that finished jobs are kept if max_age is 0."""
+        old = self.create_job(
+            self.user, status=_models.ExportJob.Status.DONE, finished=timezone.now() - timedelta(days=8)
+        )
+        self.assertEqual(self.call_command(max_age=0), "")
+        self.assertTrue(_models.ExportJob.objects.filter(pk=old.pk).exists())
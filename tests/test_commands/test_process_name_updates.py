@@ -0,0 +1,56 @@
+import io
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from dbentry import models as _models
+from dbentry.management.commands.process_name_updates import Command
+from tests.model_factory import make
+
+
+@override_settings(NAME_UPDATE_WORKER=True)
+@patch("dbentry.management.commands.process_name_updates.close_old_connections")
+class TestCommand(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj = make(_models.Person, vorname="Alice", nachname="Tester")
+
+    def get_name(self):
+        return _models.Person.objects.filter(pk=self.obj.pk).values_list("_name", flat=True).get()
+
+    def call_command(self, **options):
+        stdout = io.StringIO()
+        defaults = {"batch_size": 1000, "interval": 5, "once": True, "enqueue_flagged": False, "status": False}
+        Command(stdout=stdout).handle(**{**defaults, **options})
+        return stdout.getvalue()
+
+    def test_handle_once(self, _close_mock):
+        """Assert that handle processes the queue until it is empty."""
+        _models.Person.objects.filter(pk=self.obj.pk).update(vorname="Bob")
+        output = self.call_command()
+        self.assertEqual(self.get_name(), "Bob Tester")
+        self.assertFalse(_models.NameUpdate.objects.exists())
+        self.assertIn("1 names processed", output)
+
+    def test_handle_enqueue_flagged(self, _close_mock):
+        """Assert that records with the _changed_flag set are queued with the enqueue_flagged option."""
+        _models.Person.objects.filter(pk=self.obj.pk).update(vorname="Bob")
+        _models.NameUpdate.objects.all().delete()
+        output = self.call_command(enqueue_flagged=True)
+        self.assertIn("Person: 1 records queued", output)
+        self.assertEqual(self.get_name(), "Bob Tester")
+
+    def test_handle_status(self, _close_mock):
+        """Assert that the status option reports the queue and does not process it."""
+        _models.Person.objects.filter(pk=self.obj.pk).update(vorname="Bob")
+        output = self.call_command(status=True)
+        self.assertIn("1 records queued", output)
+        self.assertTrue(_models.NameUpdate.objects.exists())
+
+    @patch("dbentry.management.commands.process_name_updates.time.sleep")
+    def test_handle_waits_for_records(self, sleep_mock, _close_mock):
+        """Assert that the worker waits for new records if the queue is empty."""
+        sleep_mock.side_effect = KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            self.call_command(once=False, interval=2)
+        sleep_mock.assert_called_with(2)
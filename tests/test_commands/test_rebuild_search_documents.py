@@ -0,0 +1,33 @@
+import io
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from dbentry import models as _models
+from dbentry.management.commands.rebuild_search_documents import Command
+from tests.model_factory import make
+
+
+class TestCommand(TestCase):
+    def test_handle(self):
+        """Assert that handle rebuilds the documents of the indexed models."""
+        obj = make(_models.Person, vorname="Alice", nachname="Tester")
+        ct = ContentType.objects.get_for_model(_models.Person)
+        _models.SearchDocument.objects.filter(content_type=ct).update(label="foo")
+        Command(stdout=io.StringIO()).handle()
+        doc = _models.SearchDocument.objects.get(content_type=ct, object_id=obj.pk)
+        self.assertEqual(doc.label, "Alice Tester")
+
+    def test_handle_removes_stale_documents(self):
+        """Assert that handle removes documents of models that are not indexed."""
+        ct = ContentType.objects.get_for_model(_models.Musiker)
+        _models.SearchDocument.objects.create(content_type=ct, object_id=1, label="foo")
+        Command(stdout=io.StringIO()).handle()
+        self.assertFalse(_models.SearchDocument.objects.filter(content_type=ct).exists())
+
+    def test_handle_output(self):
+        """Assert that handle reports the number of documents per model."""
+        make(_models.Person, vorname="Alice", nachname="Tester")
+        stdout = io.StringIO()
+        Command(stdout=stdout).handle()
+        self.assertIn("Person: 1 documents", stdout.getvalue())
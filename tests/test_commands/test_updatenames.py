@@ -1,30 +1,148 @@
 import io
+import json
+import os
+import tempfile
 from unittest.mock import Mock, patch
 
-from django.test import TestCase
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase
 
-from dbentry.management.commands.updatenames import Command
+from dbentry import models as _models
+from dbentry.management.commands.updatenames import Checkpoint, Command, get_chunks
+from dbentry.query import CNQuerySet
+from tests.model_factory import make
 
 from .models import UpdateCNModel, UpdateNormalModel
 
 models_list_mock = Mock(return_value=[UpdateCNModel, UpdateNormalModel])
 
 
+def get_options(**options):
+    return {"force": False, "jobs": 1, "chunk_size": 10000, "checkpoint": "", "verbosity": 1, **options}
+
+
 @patch("dbentry.management.commands.updatenames.apps.get_models", new=models_list_mock)
 class TestCommand(TestCase):
     @patch("dbentry.query.CNQuerySet._update_names")
     def test_handle(self, update_names_mock):
         """Assert that handle calls _update_names on ComputedNameModels."""
+        UpdateCNModel.objects.bulk_create([UpdateCNModel()])
         cmd = Command(stdout=io.StringIO())
-        cmd.handle(force=False)
-        update_names_mock.assert_called()
+        cmd.handle(**get_options())
+        update_names_mock.assert_called_with(force=False)
 
-    @patch("dbentry.query.CNQuerySet.update")
-    def test_handle_force_option(self, update_mock):
+    @patch("dbentry.query.CNQuerySet._update_names")
+    def test_handle_force_option(self, update_names_mock):
         """
         Assert that an update is forced on ComputedNameModels if using
         force=True as option.
         """
+        UpdateCNModel.objects.bulk_create([UpdateCNModel()])
         cmd = Command(stdout=io.StringIO())
-        cmd.handle(force=True)
-        update_mock.assert_called_with(_changed_flag=True)
+        cmd.handle(**get_options(force=True))
+        update_names_mock.assert_called_with(force=True)
+
+
+class UpdateNamesTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.objs = [make(_models.Person, vorname=f"Alice{i}", nachname="Tester") for i in range(5)]
+        # Change the names without updating them:
+        with patch.object(CNQuerySet, "_update_names"):
+            _models.Person.objects.update(nachname="Test")
+        patcher = patch(
+            "dbentry.management.commands.updatenames.apps.get_models", new=Mock(return_value=[_models.Person])
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_names(self):
+        # Use a plain QuerySet that does not update the names:
+        return list(QuerySet(_models.Person).order_by("pk").values_list("_name", flat=True))
+
+    def call_command(self, **options):
+        stdout = io.StringIO()
+        Command(stdout=stdout).handle(**get_options(**options))
+        return stdout.getvalue()
+
+
+class TestUpdateNames(UpdateNamesTestMixin, TestCase):
+    def test_update_names(self):
+        output = self.call_command(chunk_size=2)
+        self.assertEqual(self.get_names(), [f"Alice{i} Test" for i in range(5)])
+        self.assertIn("Person updated! (5 names)", output)
+
+    def test_progress(self):
+        """Assert that the progress is reported for every chunk."""
+        output = self.call_command(chunk_size=2)
+        self.assertIn("Person: 2/5 rows", output)
+        self.assertIn("Person: 5/5 rows", output)
+        self.assertNotIn("rows/s", self.call_command(verbosity=0))
+
+    def test_force(self):
+        """Assert that force updates the names of rows without the _changed_flag."""
+        _models.Person.objects.update(_changed_flag=False)
+        self.call_command()
+        self.assertEqual(self.get_names(), [f"Alice{i} Tester" for i in range(5)])
+        output = self.call_command(force=True)
+        self.assertEqual(self.get_names(), [f"Alice{i} Test" for i in range(5)])
+        self.assertIn("Person updated! (5 names)", output)
+
+    def test_get_chunks(self):
+        pks = [obj.pk for obj in self.objs]
+        self.assertEqual(
+            list(get_chunks(_models.Person, 2)), [(pks[0], pks[1], 2), (pks[2], pks[3], 2), (pks[4], pks[4], 1)]
+        )
+        self.assertEqual(list(get_chunks(_models.Person, 3, start=pks[1])), [(pks[2], pks[4], 3)])
+        _models.Person.objects.filter(pk__in=pks[:4]).update(_changed_flag=False)
+        self.assertEqual(list(get_chunks(_models.Person, 2)), [(pks[4], pks[4], 1)])
+        self.assertEqual(len(list(get_chunks(_models.Person, 2, force=True))), 3)
+
+    def test_checkpoint_resume(self):
+        """Assert that a run resumes after the last row recorded in the checkpoint."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "checkpoint.json")
+            checkpoint = Checkpoint(path, force=False)
+            checkpoint.set("dbentry.Person", self.objs[2].pk)
+            self.call_command(checkpoint=path)
+            self.assertEqual(
+                self.get_names(), ["Alice0 Tester", "Alice1 Tester", "Alice2 Tester", "Alice3 Test", "Alice4 Test"]
+            )
+            # The checkpoint is removed after a complete run:
+            self.assertFalse(os.path.exists(path))
+
+    def test_checkpoint_model_done(self):
+        """Assert that models that were processed completely are skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "checkpoint.json")
+            Checkpoint(path, force=False).set("dbentry.Person", True)
+            output = self.call_command(checkpoint=path)
+            self.assertIn("Person skipped", output)
+            self.assertEqual(self.get_names(), [f"Alice{i} Tester" for i in range(5)])
+
+    def test_checkpoint_other_force_option_ignored(self):
+        """Assert that a checkpoint of a run with a different force option is ignored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "checkpoint.json")
+            Checkpoint(path, force=True).set("dbentry.Person", True)
+            self.call_command(checkpoint=path)
+            self.assertEqual(self.get_names(), [f"Alice{i} Test" for i in range(5)])
+
+    def test_checkpoint_written(self):
+        """Assert that the checkpoint records the progress of an interrupted run."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "checkpoint.json")
+            with patch("dbentry.management.commands.updatenames.update_chunk") as update_mock:
+                update_mock.side_effect = [2, KeyboardInterrupt]
+                with self.assertRaises(KeyboardInterrupt):
+                    self.call_command(chunk_size=2, checkpoint=path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), {"force": False, "models": {"dbentry.Person": self.objs[1].pk}})
+
+
+class TestUpdateNamesJobs(UpdateNamesTestMixin, TransactionTestCase):
+    def test_jobs(self):
+        """Assert that the names are updated by several processes."""
+        output = self.call_command(jobs=2, chunk_size=2)
+        self.assertEqual(self.get_names(), [f"Alice{i} Test" for i in range(5)])
+        self.assertIn("Person updated! (5 names)", output)
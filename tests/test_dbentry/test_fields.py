@@ -248,6 +248,18 @@ class StdNumFieldTestsMixin(object):
                 with self.assertRaises(ValidationError, msg=msg):
                     self.model.objects.filter(**{self.model_field.name: invalid_number})
 
+    def test_get_canonical_value(self: TestCaseType):
+        """
+        Assert that get_canonical_value returns the value as stored for valid
+        numbers, and None for invalid numbers.
+        """
+        for value in self.valid:
+            with self.subTest(value=value):
+                self.assertEqual(self.model_field.get_canonical_value(value), self.model_field.to_python(value))
+        for value in (*self.invalid, ""):
+            with self.subTest(value=value):
+                self.assertIsNone(self.model_field.get_canonical_value(value))
+
     def test_query_with_any_format(self: TestCaseType):
         """
         Assert queries are possible regardless of the format (pretty/compact)
@@ -374,6 +386,10 @@ class TestISBNField(StdNumFieldTestsMixin, MIZTestCase):
         """Assert that to_python converts non-empty values to ISBN-13."""
         self.assertEqual(isbn.isbn_type(self.model_field.to_python("123456789X")), "ISBN13")
 
+    def test_get_canonical_value_isbn10(self):
+        """Assert that get_canonical_value returns ISBN-10 values as compact ISBN-13."""
+        self.assertEqual(self.model_field.get_canonical_value("1-234-56789-X"), "9781234567897")
+
     def test_get_format_callback_empty_value(self):
         """Assert that the callback does not modify empty values."""
         for value in self.model_field.empty_values:
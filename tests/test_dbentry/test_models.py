@@ -265,6 +265,22 @@ class TestModelAutor(MIZTestCase):
         """Check the configs for related search vectors."""
         self.assertIn(("person___fts", SIMPLE), self.model.related_search_vectors)
 
+    def test_related_name_updated(self):
+        """
+        Assert that the name of a related ComputedNameModel instance is updated
+        when accessed through the forward relation descriptor.
+        """
+        obj = make(self.model, person__vorname="Alice", person__nachname="Tester")
+        _models.Person.objects.filter(pk=obj.person.pk).update(vorname="Bob")
+        self.assertEqual(self.model.objects.get(pk=obj.pk).person._name, "Bob Tester")
+
+    def test_refresh_from_db_updates_name(self):
+        """Assert that refresh_from_db updates the name of the instance."""
+        obj = make(_models.Person, vorname="Alice", nachname="Tester")
+        _models.Person.objects.filter(pk=obj.pk).update(vorname="Bob")
+        obj.refresh_from_db()
+        self.assertEqual(obj._name, "Bob Tester")
+
     def test_get_overview_annotations(self):
         annotations = self.model.get_overview_annotations()
         self.assertIn("magazin_list", annotations)
@@ -567,6 +583,10 @@ class TestModelMonat(MIZTestCase):
 class TestModelMagazin(MIZTestCase):
     model = _models.Magazin
 
+    def test_issn_db_index(self):
+        """Assert that the ISSN field is indexed."""
+        self.assertTrue(self.model._meta.get_field("issn").db_index)
+
     def test_str(self):
         obj = self.model(magazin_name="Testmagazin")
         self.assertEqual(str(obj), "Testmagazin")
@@ -796,6 +816,12 @@ class TestModelArtikel(MIZTestCase):
 class TestModelBuch(MIZTestCase):
     model = _models.Buch
 
+    def test_stdnum_db_index(self):
+        """Assert that the standard number fields are indexed."""
+        for field_name in ("ISBN", "EAN"):
+            with self.subTest(field_name=field_name):
+                self.assertTrue(self.model._meta.get_field(field_name).db_index)
+
     def test_str(self):
         obj = make(self.model, titel="Testing With Django", seitenumfang=22, jahr=2022)
         self.assertEqual(obj.__str__(), "Testing With Django")
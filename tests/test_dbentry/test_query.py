@@ -1,14 +1,21 @@
 import datetime
+import os
 import random
-from itertools import chain
+import shutil
+import tempfile
 from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist, FieldError
-from django.db import models
+from django.core.files.base import ContentFile
+from django.db import connection, models
 from django.db.models import Count
+from django.test import override_settings
+from django.utils import timezone
 
 from dbentry import models as _models
-from dbentry.query import CNQuerySet, InvalidJahrgangError, MIZQuerySet, build_date
+from dbentry.query import CNQuerySet, InvalidJahrgangError, MIZQuerySet, build_date, parse_ausgabe_name
 from tests.case import DataTestCase, MIZTestCase
 from tests.model_factory import make
 from .models import Band
@@ -307,15 +314,44 @@ class TestCNQuerySet(DataTestCase):
 
     def test_update_names_num_queries(self):
         """Asser that a name update performs the expected number of queries."""
-        # Should be six queries:
-        # - one from querying the existence of _changed_flag records,
+        # Should be three queries:
+        # - one for the primary keys of the _changed_flag records,
         # - one from calling values_dict,
-        # - one each for every object to be updated,
-        # - two for the transaction.atomic block
+        # - one UPDATE for all objects to be updated
         self.queryset.update(_changed_flag=True)
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(3):
             self.queryset._update_names()
 
+    def test_update_names_batches(self):
+        """Assert that the names are computed and written in batches."""
+        make(self.model, month=1, year=2020)
+        self.queryset.update(_changed_flag=True)
+        self.queryset.name_update_batch_size = 2
+        # One query for the primary keys and two queries per batch:
+        with self.assertNumQueries(5):
+            self.assertEqual(self.queryset._update_names(), 3)
+        self.assertFalse(self.queryset.filter(_changed_flag=True).exists())
+        self.assertEqual(self.queryset.values("_name").get(year=2020)["_name"], "2020-01")
+
+    def test_update_names_returns_count(self):
+        """Assert that _update_names returns the number of updated rows."""
+        self.obj1_qs.update(_changed_flag=True)
+        self.assertEqual(self.queryset._update_names(), 1)
+        self.assertEqual(self.queryset._update_names(), 0)
+
+    def test_update_names_force(self):
+        """
+        Assert that _update_names with force=True recomputes the names of all
+        rows and writes only the names that changed.
+        """
+        self.queryset.update(_changed_flag=True)
+        self.queryset._update_names()
+        # Change the name composing data without setting the _changed_flag:
+        self.obj1_qs.update(year=1922, _changed_flag=False)
+        self.assertEqual(self.queryset._update_names(), 0)
+        self.assertEqual(self.queryset._update_names(force=True), 1)
+        self.assertEqual(self.queryset.values("_name").get(pk=self.obj1.pk)["_name"], "1922-10")
+
     def test_update_names_num_queries_empty(self):
         """
         Assert that no updating queries are done if the queryset does not
@@ -336,6 +372,111 @@ class TestCNQuerySet(DataTestCase):
         with self.assertNumQueries(4):
             list(self.queryset.only("_name").filter(_name="2022-01").values_list("_name"))
 
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_worker_read_paths_not_update_names(self):
+        """
+        Assert that read paths do not update names if the names are
+        maintained by the name update worker.
+        """
+        with patch.object(CNQuerySet, "_update_names") as update_mock:
+            list(self.queryset.defer("id").only("_name").filter(_name="2022-01").values_list("_name"))
+            update_mock.assert_not_called()
+
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_worker_update_enqueues(self):
+        """Assert that update adds the updated rows to the name update queue."""
+        self.obj1_qs.update(year=1921)
+        ct = ContentType.objects.get_for_model(self.model)
+        self.assertQuerySetEqual(
+            _models.NameUpdate.objects.filter(content_type=ct).values_list("object_id", flat=True), [self.obj1.pk]
+        )
+
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_worker_update_without_changed_flag_not_enqueues(self):
+        """Assert that updates that reset the _changed_flag do not queue the rows."""
+        self.obj1_qs.update(year=1921, _changed_flag=False)
+        self.assertFalse(_models.NameUpdate.objects.exists())
+
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_worker_bulk_create_enqueues(self):
+        """Assert that bulk_create adds the created rows to the name update queue."""
+        (obj,) = self.queryset.bulk_create([self.model(month=11, year=2023)])
+        self.assertQuerySetEqual(_models.NameUpdate.objects.values_list("object_id", flat=True), [obj.pk])
+
+
+class TestCNModelIterable(DataTestCase):
+    model = _models.Person
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.alice = make(cls.model, vorname="Alice", nachname="Tester")
+        cls.bob = make(cls.model, vorname="Bob", nachname="Tester")
+        cls.autor = make(_models.Autor, person=cls.alice, kuerzel="AT")
+
+    def set_dirty(self):
+        """Change the names of the persons and set the _changed_flag, without updating the names."""
+        with patch.object(CNQuerySet, "_update_names"):
+            self.queryset.update(nachname="Test")
+
+    def test_names_updated(self):
+        """
+        Assert that the names of the dirty instances are updated with one
+        query for the name data and one UPDATE.
+        """
+        self.set_dirty()
+        with self.assertNumQueries(3):
+            objs = list(self.queryset.order_by("pk"))
+        self.assertEqual([obj._name for obj in objs], ["Alice Test", "Bob Test"])
+        self.assertFalse(any(obj._changed_flag for obj in objs))
+        self.assertFalse(self.queryset.filter(_changed_flag=True).exists())
+
+    def test_no_dirty_instances(self):
+        """Assert that no additional queries are made if no instance is dirty."""
+        with self.assertNumQueries(1):
+            list(self.queryset)
+
+    def test_chunks(self):
+        """Assert that the names are updated per chunk of the iterator."""
+        self.set_dirty()
+        with self.assertNumQueries(5):
+            objs = list(self.queryset.order_by("pk").iterator(chunk_size=1))
+        self.assertEqual([obj._name for obj in objs], ["Alice Test", "Bob Test"])
+
+    def test_deferred_changed_flag(self):
+        """Assert that the _changed_flag is looked up if it was deferred."""
+        self.set_dirty()
+        # Disable the update of names by only():
+        with patch.object(CNQuerySet, "_refresh_names"):
+            with self.assertNumQueries(3):
+                obj = self.queryset.only("_name").get(pk=self.alice.pk)
+            self.assertEqual(obj._name, "Alice Test")
+            # The flag has been reset; the lookup of the flag finds nothing:
+            with self.assertNumQueries(2):
+                self.queryset.only("_name").get(pk=self.alice.pk)
+
+    def test_deferred_name(self):
+        """Assert that names are not updated if the name field was deferred."""
+        self.set_dirty()
+        with self.assertNumQueries(1):
+            list(self.queryset.defer("_name"))
+        self.assertTrue(self.queryset.filter(pk=self.alice.pk, _changed_flag=True).exists())
+
+    def test_select_related(self):
+        """Assert that the names of related instances added by select_related are updated."""
+        self.set_dirty()
+        autor = _models.Autor.objects.select_related("person").get(pk=self.autor.pk)
+        self.assertEqual(autor.person._name, "Alice Test")
+        self.assertFalse(autor.person._changed_flag)
+
+    @override_settings(NAME_UPDATE_WORKER=True)
+    def test_name_update_worker(self):
+        """Assert that names are not updated if the names are maintained by the name update worker."""
+        self.set_dirty()
+        with self.assertNumQueries(1):
+            objs = list(self.queryset.order_by("pk"))
+        self.assertEqual([obj._name for obj in objs], ["Alice Tester", "Bob Tester"])
+
 
 class TestAusgabeChronologicalOrder(DataTestCase):
     jg = None
@@ -366,6 +507,10 @@ class TestAusgabeChronologicalOrder(DataTestCase):
         cls.all = cls.e_datum + cls.num + cls.lnum + cls.monat + cls.jg
         super().setUpTestData()
 
+    def get_key(self, obj):
+        """Return the chronological sort key of the given object."""
+        return self.model.objects.values_list("_chronologic_order", flat=True).get(pk=obj.pk)
+
     def test_already_ordered(self):
         """
         Assert that chronological_order is not attempted for a queryset that is
@@ -377,37 +522,50 @@ class TestAusgabeChronologicalOrder(DataTestCase):
             queryset = queryset.chronological_order()
         self.assertFalse(queryset.query.order_by)
 
-    def test_empty_queryset(self):
-        """Assert that chronological_order is not attempted for an empty queryset."""
-        queryset = self.model.objects.filter(id=0).order_by()
-        with self.assertNumQueries(1):
-            queryset = queryset.chronological_order()
-        self.assertEqual(queryset.query.order_by, tuple(self.model._meta.ordering))
+    def test_no_queries(self):
+        """Assert that chronological_order does not require any queries."""
+        with self.assertNumQueries(0):
+            self.model.objects.chronological_order()
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.model.objects.chronological_order().query.order_by,
+            ("magazin__magazin_name", "magazin_id", "_chronologic_order", "-id"),
+        )
+
+    def test_ordering_filtered_by_magazin(self):
+        """
+        Assert that the magazin is left out of the ordering if the queryset is
+        filtered to a single magazin.
+        """
+        for queryset in (
+            self.model.objects.filter(magazin=self.mag),
+            self.model.objects.filter(magazin_id=self.mag.pk, sonderausgabe=False),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertEqual(queryset.chronological_order().query.order_by, ("_chronologic_order", "-id"))
+        for queryset in (
+            self.model.objects.filter(magazin__magazin_name=self.mag.magazin_name),
+            self.model.objects.filter(magazin__in=[self.mag]),
+            self.model.objects.exclude(magazin=self.mag),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertIn("magazin__magazin_name", queryset.chronological_order().query.order_by)
 
     def test_multiple_magazines(self):
-        """
-        Assert that chronological_order is not attempted for a queryset with
-        multiple magazines.
-        """
-        make(_models.Ausgabe, magazin__magazin_name="Bad")
-        queryset = self.model.objects.all()
-        with self.assertNumQueries(1):
-            queryset = queryset.chronological_order()
-        self.assertEqual(queryset.query.order_by, tuple(self.model._meta.ordering))
+        """Assert that the ausgaben of multiple magazines are grouped by magazin."""
+        other = make(self.model, magazin__magazin_name="Aaa", ausgabejahr__jahr=3000)
+        results = list(self.model.objects.chronological_order())
+        self.assertEqual(results[0], other)
+        self.assertCountEqual(results[1:], self.all)
 
-    def test_keeps_specified_ordering(self):
+    def test_argument_ordering_has_priority(self):
         """
-        Assert that chronological_order applies ordering specified by either
-        the given arguments or the ordering of the initial queryset if no
-        chronological ordering will be attempted.
+        Assert that ordering fields passed in to chronological_order have the
+        highest priority in the final ordering.
         """
-        make(_models.Ausgabe, magazin__magazin_name="Bad")
-        queryset = self.model.objects.order_by("sonderausgabe", "-id")
-        queryset = queryset.chronological_order()
-        self.assertEqual(queryset.query.order_by, ("sonderausgabe", "-id"))
-        queryset = self.model.objects.all()
-        queryset = queryset.chronological_order("sonderausgabe", "-id")
-        self.assertEqual(queryset.query.order_by, ("sonderausgabe", "-id"))
+        queryset = self.model.objects.chronological_order("-magazin", "sonderausgabe", "e_datum")
+        self.assertEqual(queryset.query.order_by[:3], ("-magazin", "sonderausgabe", "e_datum"))
 
     def test_checks_for_pk_ordering(self):
         """
@@ -429,79 +587,176 @@ class TestAusgabeChronologicalOrder(DataTestCase):
                         queryset.query.order_by[-1], ordering[0], msg="Last ordering entry should be a primary key."
                     )
 
-    def test_argument_ordering_has_priority(self):
-        """
-        Assert that ordering fields passed in to chronological_order have the
-        highest priority in the final ordering.
-        """
-        queryset = self.model.objects.chronological_order("-magazin", "sonderausgabe", "jahr")
-        self.assertEqual(queryset.query.order_by[:3], ("-magazin", "sonderausgabe", "jahr"))
+    def test_chronological_order(self):
+        """Assert that the results are ordered chronologically."""
+        queryset = self.model.objects.filter(pk__in=[o.pk for o in self.num]).chronological_order()
+        self.assertEqual(list(queryset), self.num)
+        queryset = self.model.objects.filter(pk__in=[o.pk for o in self.lnum]).chronological_order()
+        self.assertEqual(list(queryset), self.lnum)
 
     def test_jahr_over_jahrgang(self):
         """
-        Assert that ordering field 'jahr' comes before 'jahrgang' if 'jahr'
-        values are more prominent than 'jahrgang' values in the queryset.
+        Assert that the key starts with 'jahr' if 'jahr' values are more
+        prominent than 'jahrgang' values in the magazin.
         """
-        order_by = self.model.objects.chronological_order().query.order_by
-        self.assertGreater(
-            order_by.index("jahrgang"), order_by.index("jahr"), msg="'jahr' ordering expected before 'jahrgang'."
-        )
+        # The magazin has more num values than values for the other criteria:
+        self.assertEqual(self.get_key(self.num[0]), [1999, None, 0, 1, None, None, None])
+        self.assertEqual(self.get_key(self.jg[3]), [None, 2, 0, 1, None, None, None])
 
     def test_jahrgang_over_jahr(self):
         """
-        Assert that ordering field 'jahrgang' comes before 'jahr' if 'jahrgang'
-        values are more prominent than 'jahr' values in the queryset.
+        Assert that the key starts with 'jahrgang' if 'jahrgang' values are
+        more prominent than 'jahr' values in the magazin.
         """
-        ids = [obj.pk for obj in self.jg]
-        order_by = self.model.objects.filter(id__in=ids).chronological_order().query.order_by
-        self.assertGreater(
-            order_by.index("jahr"), order_by.index("jahrgang"), msg="'jahrgang' ordering expected before 'jahr'."
-        )
+        mag = make(_models.Magazin)
+        obj = make(self.model, magazin=mag, jahrgang=2, ausgabejahr__jahr=2000)
+        make(self.model, magazin=mag, jahrgang=1)
+        self.assertEqual(self.get_key(obj), [2, 2000, 0, None, None, None, None])
 
     def test_criteria_equal(self):
         """
-        Assert that a default ordering is used when all criteria are equally
-        represented.
+        Assert that a default order of the criteria is used when all criteria
+        are equally represented.
         """
         # If none of the four criteria dominate, the default order should be:
         # 'e_datum', 'lnum', 'monat', 'num'
-        ids = [obj.pk for obj in chain(self.e_datum, self.lnum, self.monat, self.num)]
-        queryset = self.model.objects.filter(id__in=ids)
-        expected = (
-            "magazin__magazin_name",
-            "jahr",
-            "jahrgang",
-            "sonderausgabe",
-            "e_datum",
-            "lnum",
-            "monat",
-            "num",
-            "-id",
-        )
-        self.assertEqual(queryset.chronological_order().query.order_by, expected)
+        mag = make(_models.Magazin)
+        make(self.model, magazin=mag, e_datum="2000-01-01")
+        make(self.model, magazin=mag, ausgabelnum__lnum=1)
+        make(self.model, magazin=mag, ausgabemonat__monat__ordinal=1)
+        obj = make(self.model, magazin=mag, ausgabenum__num=4, sonderausgabe=True)
+        self.assertEqual(self.get_key(obj), [None, None, 1, None, None, None, 4])
 
     def test_table_join_duplicates(self):
         """
         Assert that duplicates created through table joins are not counted
         multiple times when determining which criteria to use.
         """
+        mag = make(_models.Magazin)
         # Four Ausgabe instances use 'lnum', thus it should be the leading
         # criteria.
-        a = make(self.model, magazin=self.mag, ausgabelnum__lnum=1)
-        b = make(self.model, magazin=self.mag, ausgabelnum__lnum=2)
-        c = make(self.model, magazin=self.mag, ausgabelnum__lnum=3)
-        d = make(self.model, magazin=self.mag, ausgabelnum__lnum=4)
-        e = make(
+        for i in range(1, 5):
+            make(self.model, magazin=mag, ausgabelnum__lnum=i)
+        obj = make(
             self.model,
-            magazin=self.mag,
+            magazin=mag,
             # The joins would lead to both monat and num criteria being present
             # nine times. lnum should still win out, though.
             ausgabemonat__monat__ordinal=[1, 2, 3],
             ausgabenum__num=[1, 2, 3],
         )
-        ordering = self.model.objects.filter(pk__in=[a.pk, b.pk, c.pk, d.pk, e.pk]).chronological_order().query.order_by
-        self.assertLess(ordering.index("lnum"), ordering.index("monat"))
-        self.assertLess(ordering.index("lnum"), ordering.index("num"))
+        # Order of the criteria: lnum, monat, num (equal counts), e_datum
+        self.assertEqual(self.get_key(obj), [None, None, 0, None, 3, 3, None])
+
+    def test_count_ordering_field_only_once_per_row(self):
+        """
+        Assert that rows with multiple values in any of the order fields are
+        only counted once.
+        """
+        mag = make(_models.Magazin)
+        a = make(self.model, magazin=mag, e_datum="2023-04-17")
+        b = make(self.model, magazin=mag, e_datum="2023-04-16", ausgabelnum__lnum=[1, 2, 3])
+        # Top ordering field should be e_datum, because both instances have it.
+        # It should not be lnum, although it has the highest 'count' in total
+        # (3 lnums vs 2 e_datums).
+        e_datum = datetime.date(2023, 4, 16).toordinal() - 1
+        self.assertEqual(self.get_key(b), [None, None, 0, e_datum, 3, None, None])
+        self.assertEqual(list(self.model.objects.filter(magazin=mag).chronological_order()), [b, a])
+
+    def test_key_updated_on_related_change(self):
+        """
+        Assert that the key is updated when jahr, num, lnum or monat values
+        are added, changed or removed.
+        """
+        obj = self.num[0]
+        _models.AusgabeNum.objects.filter(ausgabe=obj).update(num=7)
+        self.assertEqual(self.get_key(obj), [1999, None, 0, 7, None, None, None])
+        _models.AusgabeJahr.objects.create(ausgabe=obj, jahr=1998)
+        self.assertEqual(self.get_key(obj), [1998, None, 0, 7, None, None, None])
+        _models.AusgabeNum.objects.filter(ausgabe=obj).delete()
+        self.assertEqual(self.get_key(obj), [1998, None, 0, None, None, None, None])
+
+    def test_key_updated_on_ausgabe_change(self):
+        """Assert that the key is updated when the ausgabe's fields change."""
+        obj = self.num[0]
+        obj.sonderausgabe = True
+        obj.jahrgang = 3
+        obj.save()
+        self.assertEqual(self.get_key(obj), [1999, 3, 1, 1, None, None, None])
+
+    def test_key_updated_on_magazin_change(self):
+        """
+        Assert that the key is computed with the strategy of the new magazin
+        when the ausgabe is moved to another magazin.
+        """
+        mag = make(_models.Magazin)
+        make(self.model, magazin=mag, jahrgang=1)
+        obj = self.jg[0]
+        self.model.objects.filter(pk=obj.pk).update(magazin=mag)
+        self.assertEqual(self.get_key(obj), [1, None, 0, 1, None, None, None])
+
+    def test_strategy_change_updates_all_keys(self):
+        """
+        Assert that the keys of all ausgaben of a magazin are updated when the
+        ordering strategy of the magazin changes.
+        """
+        mag = make(_models.Magazin)
+        a = make(self.model, magazin=mag, ausgabenum__num=1, ausgabelnum__lnum=2)
+        # lnum and num are tied; lnum comes first by default:
+        self.assertEqual(self.get_key(a), [None, None, 0, 2, 1, None, None])
+        # Adding more ausgaben with num values makes num the top criterion:
+        make(self.model, magazin=mag, ausgabenum__num=2)
+        self.assertEqual(self.get_key(a), [None, None, 0, 1, 2, None, None])
+
+    def test_only_affected_keys_updated(self):
+        """
+        Assert that only the keys of the affected ausgaben are computed anew if
+        the ordering strategy of the magazin does not change.
+        """
+        obj = self.num[0]
+        with connection.cursor() as cursor:
+            # Write a bogus key, bypassing the trigger that discards it:
+            cursor.execute("SELECT set_config('dbentry.chronologic_order', 'on', true)")
+            cursor.execute("UPDATE dbentry_ausgabe SET _chronologic_order = '{0}' WHERE id = %s", [obj.pk])
+            cursor.execute("SELECT set_config('dbentry.chronologic_order', '', true)")
+        other = make(self.model, magazin=self.mag, ausgabenum__num=5, ausgabejahr__jahr=2002)
+        self.assertEqual(self.get_key(other), [2002, None, 0, 5, None, None, None])
+        self.assertEqual(self.get_key(obj), [0])
+
+    def test_counts_match_rebuild(self):
+        """
+        Assert that the counts of the ordering strategies, which are updated
+        with the changes of each statement, match the counts of a rebuild.
+        """
+
+        def get_counts():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT * FROM dbentry_ausgabe_chronologic_strategy ORDER BY magazin_id")
+                return cursor.fetchall()
+
+        other_mag = make(_models.Magazin)
+        obj = make(self.model, magazin=other_mag, jahrgang=1, ausgabejahr__jahr=[2000, 2001], ausgabenum__num=9)
+        _models.AusgabeJahr.objects.filter(ausgabe=obj, jahr=2000).delete()
+        _models.AusgabeNum.objects.filter(ausgabe=obj).update(ausgabe=self.num[0])
+        _models.AusgabeLnum.objects.create(ausgabe=obj, lnum=3)
+        self.model.objects.filter(pk=self.jg[0].pk).update(magazin=other_mag, e_datum="2000-01-01")
+        self.model.objects.filter(pk__in=[self.lnum[0].pk, self.monat[0].pk]).update(jahrgang=4)
+        self.monat[1].delete()
+        counts = get_counts()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT dbentry_ausgabe_update_chronologic_order(ARRAY(SELECT id FROM dbentry_magazin), NULL)"
+            )
+        self.assertEqual(counts, get_counts())
+        self.model.objects.filter(magazin=other_mag).delete()
+        self.assertNotIn(other_mag.pk, [row[0] for row in get_counts()])
+
+    def test_stale_key_not_saved(self):
+        """Assert that saving an instance does not overwrite the key with a stale value."""
+        obj = self.model.objects.get(pk=self.num[0].pk)
+        _models.AusgabeNum.objects.filter(ausgabe=obj).update(num=7)
+        obj.save()
+        self.assertEqual(self.get_key(obj), [1999, None, 0, 7, None, None, None])
 
     def test_search_keeps_order(self):
         """
@@ -518,19 +773,7 @@ class TestAusgabeChronologicalOrder(DataTestCase):
         self.model.objects.update(_changed_flag=True)
         queryset = self.model.objects.chronological_order()
         queryset._update_names()
-        # Since jahrgang objects have 'num' values the 'num' criterion should
-        # come before 'e_datum', 'lnum', etc.:
-        expected = (
-            "magazin__magazin_name",
-            "jahr",
-            "jahrgang",
-            "sonderausgabe",
-            "num",
-            "e_datum",
-            "lnum",
-            "monat",
-            "-id",
-        )
+        expected = ("magazin__magazin_name", "magazin_id", "_chronologic_order", "-id")
         self.assertEqual(queryset.query.order_by, expected)
 
     def test_keeps_chronologically_ordered_value_after_cloning(self):
@@ -565,20 +808,6 @@ class TestAusgabeChronologicalOrder(DataTestCase):
         with self.assertNotRaises(Exception):
             queryset.update(beschreibung="abc")
 
-    def test_count_ordering_field_only_once_per_row(self):
-        """
-        Assert that rows with multiple values in any of the order fields are
-        only counted once.
-        """
-        a = make(self.model, magazin=self.mag, e_datum="2023-04-17")
-        b = make(self.model, magazin=self.mag, e_datum="2023-04-16", ausgabelnum__lnum=[1, 2, 3])
-        # Top ordering field should be e_datum, because both instances have it.
-        # It should not be lnum, although it has the highest 'count' in total
-        # (3 lnums vs 2 e_datums).
-        queryset = self.model.objects.filter(id__in=[a.pk, b.pk]).chronological_order()
-        ordering = queryset.query.order_by
-        self.assertGreater(ordering.index("lnum"), ordering.index("e_datum"), msg=ordering)
-
 
 class TestAusgabeIncrementJahrgang(DataTestCase):
     model = _models.Ausgabe
@@ -783,6 +1012,86 @@ class TestBuildDate(MIZTestCase):
         self.assertIsNone(build_date([None], [None]))
 
 
+class TestParseAusgabeName(MIZTestCase):
+    def assertFilters(self, q, expected):
+        self.assertEqual([f.children for f in parse_ausgabe_name(q)], expected)
+
+    def test_jahre_nums(self):
+        self.assertFilters("2001-05", [[("ausgabejahr__jahr", 2001)], [("ausgabenum__num", 5)]])
+        self.assertFilters(
+            "1999/00-12/01",
+            [
+                [("ausgabejahr__jahr", 1999)],
+                [("ausgabejahr__jahr", 2000)],
+                [("ausgabenum__num", 12)],
+                [("ausgabenum__num", 1)],
+            ],
+        )
+
+    def test_jahrgang(self):
+        self.assertFilters("Jg. 3-12", [[("jahrgang", 3)], [("ausgabenum__num", 12)]])
+
+    def test_monate(self):
+        self.assertFilters(
+            "2001-Jan/dez",
+            [
+                [("ausgabejahr__jahr", 2001)],
+                [("ausgabemonat__monat__abk", "Jan")],
+                [("ausgabemonat__monat__abk", "Dez")],
+            ],
+        )
+        self.assertIsNone(parse_ausgabe_name("2001-Foo"))
+
+    def test_lnums(self):
+        self.assertFilters(
+            "21/22 (2001)", [[("ausgabejahr__jahr", 2001)], [("ausgabelnum__lnum", 21)], [("ausgabelnum__lnum", 22)]]
+        )
+
+    def test_e_datum(self):
+        self.assertFilters("2001-05-12", [[("e_datum", datetime.date(2001, 5, 12))]])
+        self.assertIsNone(parse_ausgabe_name("2001-13-12"))
+
+    def test_no_match(self):
+        for q in ("2001", "Rolling Stone", "2001-05 Sonderheft", "k.A.-05"):
+            with self.subTest(q=q):
+                self.assertIsNone(parse_ausgabe_name(q))
+
+
+class TestAusgabeSearch(DataTestCase):
+    model = _models.Ausgabe
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mag = make(_models.Magazin)
+        cls.obj1 = make(cls.model, magazin=cls.mag, ausgabejahr__jahr=[1999, 2000], ausgabenum__num=[12, 1])
+        cls.obj2 = make(cls.model, magazin=cls.mag, ausgabejahr__jahr=2000, ausgabenum__num=1)
+        cls.obj3 = make(
+            cls.model, magazin=cls.mag, ausgabejahr__jahr=2000, ausgabemonat__monat__monat=["Januar", "Februar"]
+        )
+        cls.obj4 = make(cls.model, magazin=cls.mag, ausgabejahr__jahr=2000, ausgabelnum__lnum=1)
+        super().setUpTestData()
+
+    def test_search_structured(self):
+        """Assert that search terms in the format of a name are looked up with equality filters."""
+        self.assertQuerySetEqual(self.queryset.search("1999/00-12/01"), [self.obj1])
+        self.assertQuerySetEqual(self.queryset.search("2000-01"), [self.obj1, self.obj2], ordered=False)
+        self.assertQuerySetEqual(self.queryset.search("2000-Feb"), [self.obj3])
+        self.assertQuerySetEqual(self.queryset.search("01 (2000)"), [self.obj4])
+
+    def test_search_structured_no_text_search(self):
+        """Assert that a structured search does not use full text search."""
+        sql = str(self.queryset.search("2000-01").query)
+        self.assertIn('"dbentry_ausgabenum"."num" = 1', sql)
+        self.assertNotIn("to_tsquery", sql)
+
+    def test_search_structured_chronological_order(self):
+        self.assertTrue(self.queryset.search("2000-01").chronologically_ordered)
+
+    def test_search_fallback(self):
+        """Assert that terms that do not match a name format are searched with full text search."""
+        self.assertIn("to_tsquery", str(self.queryset.search("Sonderheft").query))
+
+
 class TestAudioManager(DataTestCase):
     model = _models.Audio
 
@@ -814,11 +1123,40 @@ class TestAudioManager(DataTestCase):
             with self.subTest(plattennummer=pn):
                 self.assertEqual(self.model.objects.all()._clean_filter_value(pn), expected)
 
-    def test_clean_field_values(self):
-        """Assert that _clean_field_values adds a 'pn_cleaned' annotation."""
-        qs = self.model.objects.all()
-        annotations = qs._clean_field_values(qs).query.annotations
-        self.assertIn("pn_cleaned", annotations)
+    def test_normalized_plattennummer(self):
+        """
+        Assert that the database keeps the normalized plattennummer in sync
+        with the plattennummer.
+        """
+        obj = self.test_data[0]
+        obj.refresh_from_db()
+        self.assertEqual(obj._plattennummer_normalized, "123456789A")
+        self.model.objects.filter(pk=obj.pk).update(plattennummer="B-12 3")
+        obj.refresh_from_db()
+        self.assertEqual(obj._plattennummer_normalized, "B123")
+        # Values written together with the plattennummer are replaced:
+        self.model.objects.filter(pk=obj.pk).update(plattennummer="C-456", _plattennummer_normalized="foo")
+        obj.refresh_from_db()
+        self.assertEqual(obj._plattennummer_normalized, "C456")
+        obj.plattennummer = "D-789"
+        obj.save()
+        obj.refresh_from_db()
+        self.assertEqual(obj._plattennummer_normalized, "D789")
+
+    def test_normalized_plattennummer_trigger_columns(self):
+        """Assert that the normalization trigger only fires for updates of the plattennummer."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgname = 'dbentry_audio_normalize_plattennummer'"
+            )
+            definition = cursor.fetchone()[0]
+        self.assertIn("BEFORE INSERT OR UPDATE OF plattennummer ON", definition)
+
+    def test_filter_uses_normalized_plattennummer(self):
+        """Assert that plattennummer filters are applied to the normalized plattennummer."""
+        sql = str(self.model.objects.filter(plattennummer="123-456").query)
+        self.assertIn('UPPER("dbentry_audio"."_plattennummer_normalized"::text) LIKE UPPER(%123456%)', sql)
+        self.assertNotIn("regexp_replace", sql)
 
     def test_filter_by_plattennummer(self):
         """
@@ -862,3 +1200,238 @@ class TestAudioManager(DataTestCase):
                 qs = self.model.objects.filter(plattennummer__contains=c)
                 self.assertEqual(qs.count(), 1)
                 self.assertIn(self.model.objects.get(titel=f"Special Char: '{c}'"), qs)
+
+
+class TestSearchDocumentQuerySet(DataTestCase):
+    model = _models.SearchDocument
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.person = make(_models.Person, vorname="Peter", nachname="Lustig", beschreibung="Ein netter Herr")
+        cls.other = make(_models.Person, vorname="Sharon", nachname="Silva")
+        cls.verlag = make(_models.Verlag, verlag_name="Lustige Taschenbücher")
+
+    def get_document(self, obj):
+        return self.queryset.get(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk)
+
+    def test_trigger_insert(self):
+        """Assert that a document is created when a record is created."""
+        document = self.get_document(self.person)
+        self.assertEqual(document.label, "Peter Lustig")
+        self.assertTrue(document.search_vector)
+
+    def test_trigger_update(self):
+        """Assert that the document is updated when the record is updated."""
+        self.verlag.verlag_name = "Carlsen"
+        self.verlag.save()
+        self.assertEqual(self.get_document(self.verlag).label, "Carlsen")
+        self.assertFalse(self.queryset.search("Lustige", [_models.Verlag]).exists())
+        self.assertTrue(self.queryset.search("Carlsen", [_models.Verlag]).exists())
+
+    def test_trigger_delete(self):
+        """Assert that the document is deleted when the record is deleted."""
+        pk = self.verlag.pk
+        self.verlag.delete()
+        self.assertFalse(self.queryset.filter(object_id=pk, content_type__model="verlag").exists())
+
+    def test_search(self):
+        """Assert that search finds documents of the given models."""
+        self.assertQuerySetEqual(
+            self.queryset.search("Lustig", [_models.Person]).values_list("object_id", flat=True),
+            [self.person.pk],
+        )
+        self.assertQuerySetEqual(
+            self.queryset.search("Lustig", [_models.Person, _models.Verlag]).values_list("label", flat=True),
+            ["Peter Lustig", "Lustige Taschenbücher"],
+            ordered=False,
+        )
+
+    def test_search_config(self):
+        """Assert that search uses the search configs of the models' fields."""
+        # 'beschreibung' uses the STEMMING config:
+        self.assertTrue(self.queryset.search("nette", [_models.Person]).exists())
+
+    def test_search_label_icontains(self):
+        """Assert that search finds documents whose label contains the search term."""
+        self.assertTrue(self.queryset.search("ustig", [_models.Person]).exists())
+
+    def test_search_id(self):
+        """Assert that search finds documents by the record's id."""
+        self.assertIn(
+            self.other.pk,
+            self.queryset.search(str(self.other.pk), [_models.Person]).values_list("object_id", flat=True),
+        )
+
+    def test_search_no_models(self):
+        """Assert that search returns an empty queryset if no models are given."""
+        self.assertFalse(self.queryset.search("Lustig", []))
+        self.assertFalse(self.queryset.search("", [_models.Person]))
+
+    def test_search_matches_model_search(self):
+        """Assert that search matches the same records as the model's search."""
+        for q in ("Lustig", "Peter Lustig", "Sil", "Herr"):
+            with self.subTest(q=q):
+                self.assertQuerySetEqual(
+                    self.queryset.search(q, [_models.Person]).values_list("object_id", flat=True),
+                    _models.Person.objects.search(q, ranked=False).values_list("pk", flat=True),
+                    ordered=False,
+                )
+
+    def test_search_fuzzy(self):
+        """Assert that a fuzzy search finds documents with labels similar to the search term."""
+        self.assertFalse(self.queryset.search("Peter Lutsig", [_models.Person]).exists())
+        self.assertQuerySetEqual(
+            self.queryset.search("Peter Lutsig", [_models.Person], search_type="fuzzy").values_list(
+                "object_id", flat=True
+            ),
+            [self.person.pk],
+        )
+
+    def test_counts(self):
+        """Assert that counts returns the number of documents per content type."""
+        counts = self.queryset.search("Lustig", [_models.Person, _models.Verlag]).counts()
+        self.assertEqual(
+            counts,
+            {
+                ContentType.objects.get_for_model(_models.Person).pk: 1,
+                ContentType.objects.get_for_model(_models.Verlag).pk: 1,
+            },
+        )
+
+    def test_rebuild(self):
+        """Assert that rebuild recreates the documents of the given model."""
+        self.queryset.filter(content_type__model="person").delete()
+        self.assertEqual(self.queryset.rebuild(_models.Person), 2)
+        self.assertEqual(self.get_document(self.person).label, "Peter Lustig")
+
+
+@override_settings(NAME_UPDATE_WORKER=True)
+class TestNameUpdateQuerySet(DataTestCase):
+    model = _models.NameUpdate
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.alice = make(_models.Person, vorname="Alice", nachname="Tester")
+        cls.bob = make(_models.Person, vorname="Bob", nachname="Tester")
+
+    def setUp(self):
+        super().setUp()
+        # Set the _changed_flag and empty the queue:
+        _models.Person.objects.filter(pk=self.alice.pk).update(vorname="Alicia")
+        _models.Person.objects.filter(pk=self.bob.pk).update(vorname="Robert")
+        self.queryset.delete()
+
+    def get_name(self, obj):
+        return _models.Person.objects.filter(pk=obj.pk).values_list("_name", flat=True).get()
+
+    def test_enqueue(self):
+        """Assert that enqueue adds the rows of the queryset to the queue."""
+        self.assertEqual(self.queryset.enqueue(_models.Person.objects.filter(pk=self.alice.pk)), 1)
+        queued = self.queryset.get()
+        self.assertEqual(queued.content_type, ContentType.objects.get_for_model(_models.Person))
+        self.assertEqual(queued.object_id, self.alice.pk)
+
+    def test_enqueue_ignores_queued_rows(self):
+        """Assert that enqueue ignores rows that are already queued."""
+        self.queryset.enqueue(_models.Person.objects.filter(pk=self.alice.pk))
+        self.assertEqual(self.queryset.enqueue(_models.Person.objects.all()), 1)
+        self.assertEqual(self.queryset.count(), 2)
+
+    def test_enqueue_empty_result(self):
+        self.assertEqual(self.queryset.enqueue(_models.Person.objects.filter(pk__in=[])), 0)
+
+    def test_process(self):
+        """Assert that process updates the names of the queued rows and removes them from the queue."""
+        self.queryset.enqueue(_models.Person.objects.all())
+        self.assertEqual(self.queryset.process(), 2)
+        self.assertFalse(self.queryset.exists())
+        self.assertEqual(self.get_name(self.alice), "Alicia Tester")
+        self.assertEqual(self.get_name(self.bob), "Robert Tester")
+
+    def test_process_batch_size(self):
+        """Assert that process takes the oldest rows off the queue first."""
+        self.queryset.enqueue(_models.Person.objects.filter(pk=self.bob.pk))
+        self.queryset.enqueue(_models.Person.objects.filter(pk=self.alice.pk))
+        self.assertEqual(self.queryset.process(batch_size=1), 1)
+        self.assertEqual(self.get_name(self.bob), "Robert Tester")
+        self.assertEqual(self.get_name(self.alice), "Alice Tester")
+        self.assertEqual(self.queryset.process(batch_size=1), 1)
+        self.assertEqual(self.get_name(self.alice), "Alicia Tester")
+        self.assertEqual(self.queryset.process(batch_size=1), 0)
+
+    def test_lag(self):
+        self.assertIsNone(self.queryset.lag())
+        self.queryset.enqueue(_models.Person.objects.all())
+        self.queryset.update(created=timezone.now() - datetime.timedelta(minutes=5))
+        self.assertGreaterEqual(self.queryset.lag(), datetime.timedelta(minutes=5))
+
+
+class TestExportJobQuerySet(DataTestCase):
+    model = _models.ExportJob
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="alice")
+        super().setUpTestData()
+
+    def create_job(self, **kwargs):
+        return self.model.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(_models.Band),
+            resource="dbentry.export.resources.BandResource",
+            file_format="CSV",
+            filename="Band.csv",
+            **kwargs,
+        )
+
+    def test_claim(self):
+        """Assert that claim marks the oldest queued job as running."""
+        now = timezone.now()
+        self.create_job(status=self.model.Status.DONE, created=now - datetime.timedelta(hours=2))
+        oldest = self.create_job(created=now - datetime.timedelta(hours=1))
+        self.create_job(created=now)
+        job = self.model.objects.claim()
+        self.assertEqual(job, oldest)
+        job.refresh_from_db()
+        self.assertEqual(job.status, self.model.Status.RUNNING)
+        self.assertIsNotNone(job.started)
+
+    def test_claim_empty_queue(self):
+        self.create_job(status=self.model.Status.RUNNING)
+        self.assertIsNone(self.model.objects.claim())
+
+    def test_fail_stale(self):
+        """Assert that fail_stale marks running jobs as failed that were started too long ago."""
+        now = timezone.now()
+        stale = self.create_job(status=self.model.Status.RUNNING, started=now - datetime.timedelta(hours=2))
+        running = self.create_job(status=self.model.Status.RUNNING, started=now)
+        queued = self.create_job(created=now - datetime.timedelta(hours=2))
+        self.assertEqual(self.model.objects.fail_stale(3600), 1)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, self.model.Status.FAILED)
+        self.assertTrue(stale.error)
+        self.assertIsNotNone(stale.finished)
+        for job, status in ((running, self.model.Status.RUNNING), (queued, self.model.Status.QUEUED)):
+            with self.subTest(status=status):
+                job.refresh_from_db()
+                self.assertEqual(job.status, status)
+
+    def test_delete_finished(self):
+        """Assert that delete_finished deletes old finished jobs and their files."""
+        now = timezone.now()
+        old = now - datetime.timedelta(days=8)
+        done = self.create_job(status=self.model.Status.DONE, finished=old)
+        failed = self.create_job(status=self.model.Status.FAILED, finished=old)
+        recent = self.create_job(status=self.model.Status.DONE, finished=now)
+        queued = self.create_job(created=old)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root):
+            done.file.save("Band.csv", ContentFile(b"id"), save=True)
+            path = done.file.path
+            self.assertEqual(self.model.objects.delete_finished(7 * 24 * 60 * 60), 2)
+            self.assertFalse(os.path.exists(path))
+        self.assertFalse(self.model.objects.filter(pk__in=[done.pk, failed.pk]).exists())
+        self.assertEqual(self.model.objects.filter(pk__in=[recent.pk, queued.pk]).count(), 2)
@@ -1,4 +1,4 @@
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 from dbentry.export.fields import AnnotationField, CachedQuerysetField, ChoiceField
 from dbentry.export.widgets import ChoiceLabelWidget
@@ -20,29 +20,31 @@ class TestCachedQuerysetField(MIZTestCase):
         f = CachedQuerysetField(queryset="foo")
         self.assertEqual(f.queryset, "foo")
 
-    def test_cache_builds_dict_from_queryset(self):
-        mock_model_meta = Mock()
-        mock_model_meta.pk = Mock()  # 'name' is a kwarg for Mock, so can't set pk.name here
-        mock_model_meta.pk.name = self.pk_name
-        mock_model = Mock()
-        mock_model._meta = mock_model_meta
-        mock_queryset = Mock(model=mock_model)
-
-        mock_queryset.values.return_value = [{self.pk_name: "1", self.attribute: "bar"}]
-        f = CachedQuerysetField(attribute=self.attribute, queryset=mock_queryset)
-        self.assertEqual(f.cache, {"1": {self.attribute: "bar"}})
+    def test_init_no_cache(self):
+        f = CachedQuerysetField(queryset="foo")
+        self.assertIsNone(f.cache)
 
     def test_export_returns_cached_value(self):
         f = CachedQuerysetField(attribute=self.attribute)
+        f.cache = {"1": {self.attribute: "bar"}}
         mock_obj = Mock(pk="1")
-        with patch("dbentry.export.fields.CachedQuerysetField.cache", new={"1": {self.attribute: "bar"}}):
-            self.assertEqual(f.export(mock_obj), "bar")
+        self.assertEqual(f.export(mock_obj), "bar")
 
     def test_export_no_value(self):
         f = CachedQuerysetField(attribute=self.attribute)
+        f.cache = {"1": {}}
         mock_obj = Mock(pk="1")
-        with patch("dbentry.export.fields.CachedQuerysetField.cache", new={"1": {}}):
-            self.assertEqual(f.export(mock_obj), "")
+        self.assertEqual(f.export(mock_obj), "")
+
+    def test_export_no_cache(self):
+        """Assert that only the value of the given instance is queried if no cache is set."""
+        mock_queryset = Mock()
+        mock_queryset.filter.return_value.values_list.return_value.first.return_value = "bar"
+        f = CachedQuerysetField(attribute=self.attribute, queryset=mock_queryset)
+        self.assertEqual(f.export(Mock(pk="1")), "bar")
+        mock_queryset.filter.assert_called_with(pk="1")
+        mock_queryset.filter.return_value.values_list.return_value.first.return_value = None
+        self.assertEqual(f.export(Mock(pk="1")), "")
 
 
 class TestChoiceField(MIZTestCase):
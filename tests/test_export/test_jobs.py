@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+
+from dbentry import models as _models
+from dbentry.export.jobs import run_export_job
+from tests.case import DataTestCase
+from tests.model_factory import make
+
+
+class ExportJobTestMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_job(self, user, **kwargs):
+        defaults = {
+            "user": user,
+            "content_type": ContentType.objects.get_for_model(_models.Autor),
+            "resource": "dbentry.export.resources.AutorResource",
+            "export_fields": ["id", "kuerzel"],
+            "file_format": "CSV",
+            "filename": "Autor.csv",
+        }
+        return _models.ExportJob.objects.create(**{**defaults, **kwargs})
+
+
+class TestRunExportJob(ExportJobTestMixin, DataTestCase):
+    model = _models.Autor
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="alice")
+        cls.obj1 = make(cls.model, kuerzel="AT")
+        cls.obj2 = make(cls.model, kuerzel="BT")
+        super().setUpTestData()
+
+    def read_file(self, job):
+        with job.file.open("rb") as f:
+            return f.read().decode("utf-8")
+
+    def test_run_export_job(self):
+        job = self.create_job(self.user, object_ids=[self.obj1.pk])
+        run_export_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, _models.ExportJob.Status.DONE)
+        self.assertIsNotNone(job.finished)
+        self.assertEqual(self.read_file(job), f"ID,Kürzel\r\n{self.obj1.pk},AT\r\n")
+
+    def test_all_records(self):
+        """Assert that all records are exported if the job has no object_ids."""
+        job = self.create_job(self.user, object_ids=None)
+        run_export_job(job)
+        self.assertEqual(self.read_file(job), f"ID,Kürzel\r\n{self.obj1.pk},AT\r\n{self.obj2.pk},BT\r\n")
+
+    def test_not_streamable_format(self):
+        job = self.create_job(self.user, object_ids=[self.obj1.pk], file_format="TSV", filename="Autor.tsv")
+        run_export_job(job)
+        self.assertEqual(self.read_file(job), f"ID\tKürzel\r\n{self.obj1.pk}\tAT\r\n")
+
+    def test_failed(self):
+        """Assert that an error is recorded on the job."""
+        job = self.create_job(self.user, object_ids=[self.obj1.pk])
+        with patch("dbentry.export.jobs.write_export", side_effect=ValueError("Oops")):
+            with self.assertLogs("dbentry.export.jobs", level="ERROR"):
+                run_export_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, _models.ExportJob.Status.FAILED)
+        self.assertEqual(job.error, "ValueError: Oops")
+        self.assertFalse(job.file)
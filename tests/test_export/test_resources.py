@@ -1,5 +1,13 @@
+import csv
+import io
+import tempfile
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from dbentry import models as _models
 from dbentry.export import resources
+from dbentry.export.streaming import iter_export
 from tests.case import DataTestCase
 from tests.model_factory import make
 
@@ -480,3 +488,123 @@ class TestMusikerResource(ResourceTestMethodsMixin, ResourceTestCase):
         "Instrumente": "-",
         "Beschreibung": "",
     }
+
+
+class TestCachedQuerysetFields(DataTestCase):
+    model = _models.Audio
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj1 = make(
+            cls.model,
+            titel="Foo",
+            musiker__kuenstler_name=["Alice", "Bob"],
+            band__band_name=["Band A", "Band B"],
+            genre__genre=["Rock", "Pop"],
+        )
+        cls.obj2 = make(cls.model, titel="Bar", musiker__kuenstler_name="Charlie")
+        super().setUpTestData()
+
+    def test_single_query(self):
+        """Assert that the values of all CachedQuerysetFields are fetched with a single query."""
+        resource = resources.AudioResource()
+        with self.assertNumQueries(1):
+            resource._cache_queryset_fields(self.queryset.filter(pk=self.obj1.pk))
+        with self.assertNumQueries(0):
+            self.assertEqual(resource.fields["musiker_list"].export(self.obj1), "Alice, Bob")
+            self.assertEqual(resource.fields["band_list"].export(self.obj1), "Band A, Band B")
+            self.assertEqual(resource.fields["genre_list"].export(self.obj1), "Pop, Rock")
+            self.assertEqual(resource.fields["schlagwort_list"].export(self.obj1), "-")
+
+    def test_restricted_to_exported_records(self):
+        """Assert that only the values of the exported records are queried."""
+        resource = resources.AudioResource()
+        resource._cache_queryset_fields(self.queryset.filter(pk=self.obj1.pk))
+        self.assertEqual(list(resource.fields["musiker_list"].cache), [self.obj1.pk])
+
+    def test_selected_fields(self):
+        """Assert that only the selected export fields are queried."""
+        resource = resources.AudioResource()
+        resource._cache_queryset_fields(self.queryset, selected_fields=["titel", "musiker_list"])
+        self.assertEqual(resource.fields["musiker_list"].cache[self.obj2.pk], {"musiker_list": "Charlie"})
+
+    def test_export(self):
+        resource = resources.AudioResource()
+        dataset = resource.export(self.queryset.filter(pk=self.obj1.pk))
+        self.assertEqual(len(dataset), 1)
+        self.assertEqual(dataset.dict[0]["Musiker"], "Alice, Bob")
+        self.assertEqual(dataset.dict[0]["Bands"], "Band A, Band B")
+        # The cache is released after the export:
+        self.assertIsNone(resource.fields["musiker_list"].cache)
+
+    def test_export_values_not_stale(self):
+        """Assert that the values are queried anew for every export run."""
+        resource = resources.AudioResource()
+        resource.export(self.queryset.filter(pk=self.obj1.pk))
+        self.obj1.musiker.add(make(_models.Musiker, kuenstler_name="Dave"))
+        dataset = resource.export(self.queryset.filter(pk=self.obj1.pk))
+        self.assertEqual(dataset.dict[0]["Musiker"], "Alice, Bob, Dave")
+
+    def test_class_field_not_cached(self):
+        """Assert that an export does not set the cache of the fields declared on the class."""
+        resources.AudioResource().export(self.queryset)
+        self.assertIsNone(resources.AudioResource.fields["musiker_list"].cache)
+
+
+class TestCopyExport(DataTestCase):
+    model = _models.Autor
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj1 = make(
+            cls.model,
+            person__vorname="Alice",
+            person__nachname="Tester",
+            kuerzel="AT",
+            magazin__magazin_name=["Foo", "Bar, Baz"],
+            beschreibung='Some "quoted"\ntext',
+        )
+        cls.obj2 = make(cls.model, kuerzel="BT")
+        super().setUpTestData()
+
+    def copy_export(self, resource, queryset, selected_fields=None):
+        with tempfile.TemporaryFile() as f:
+            resource.copy_export(queryset, f, selected_fields)
+            f.seek(0)
+            return list(csv.reader(io.StringIO(f.read().decode("utf-8"))))
+
+    def test_copy_export(self):
+        """Assert that the rows written by the database equal the rows of the Python export."""
+        rows = list(iter_export(resources.AutorResource(), self.queryset))[1:]
+        self.assertEqual(self.copy_export(resources.AutorResource(), self.queryset), rows)
+
+    def test_copy_export_selected_fields(self):
+        rows = self.copy_export(resources.AutorResource(), self.queryset, ["magazin_list", "kuerzel"])
+        self.assertEqual(rows, [["AT", "Bar, Baz, Foo"], ["BT", "-"]])
+
+    def test_copy_export_empty_result(self):
+        """Assert that nothing is written for a queryset that cannot return any rows."""
+        self.assertEqual(self.copy_export(resources.AutorResource(), self.queryset.filter(pk__in=[])), [])
+
+    def test_copy_export_single_query(self):
+        """Assert that the export values are selected with a single query."""
+        with CaptureQueriesContext(connection) as queries:
+            self.copy_export(resources.AutorResource(), self.queryset)
+        # (the other queries are for the update of the person names)
+        self.assertEqual(len([q for q in queries if q["sql"].startswith("COPY")]), 1)
+        self.assertFalse([q for q in queries if "beschreibung" in q["sql"] and not q["sql"].startswith("COPY")])
+
+    def test_can_copy_export(self):
+        self.assertTrue(resources.AutorResource().can_copy_export())
+        self.assertTrue(resources.AudioResource().can_copy_export(["titel", "musiker_list", "land_pressung"]))
+
+    def test_can_copy_export_rendered_values(self):
+        """Assert that exports with values that are rendered in Python cannot be copied."""
+        resource = resources.AudioResource()
+        # BooleanField with YesNoBooleanWidget:
+        self.assertFalse(resource.can_copy_export(["titel", "original"]))
+        # DurationField:
+        self.assertFalse(resource.can_copy_export(["laufzeit"]))
+        # Dehydrate method:
+        resource.dehydrate_titel = lambda obj: obj.titel.upper()
+        self.assertFalse(resource.can_copy_export(["titel"]))
@@ -0,0 +1,159 @@
+import io
+import json
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+import tablib
+from django.test import override_settings
+from import_export.formats.base_formats import CSV, JSON, TSV, XLSX
+
+from dbentry import models as _models
+from dbentry.export import resources
+from dbentry.export.streaming import (
+    copy_csv,
+    get_stream_writer,
+    iter_export,
+    stream_csv,
+    stream_export,
+    stream_json,
+    stream_xlsx,
+)
+from tests.case import DataTestCase, MIZTestCase
+from tests.model_factory import make
+
+
+class TestStreamWriters(MIZTestCase):
+    rows = [["ID", "Titel"], ["1", "Foo"], ["2", 'Bar, "Baz"']]
+
+    def get_dataset(self):
+        return tablib.Dataset(*self.rows[1:], headers=self.rows[0])
+
+    def test_stream_csv(self):
+        """Assert that the streamed CSV is the same as the CSV export of a Dataset."""
+        self.assertEqual("".join(stream_csv(self.rows)), self.get_dataset().export("csv"))
+
+    def test_stream_json(self):
+        """Assert that the streamed JSON is the same as the JSON export of a Dataset."""
+        self.assertEqual("".join(stream_json(self.rows)), self.get_dataset().export("json"))
+
+    def test_stream_json_no_rows(self):
+        self.assertEqual(json.loads("".join(stream_json([["ID"]]))), [])
+
+    @override_settings(IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT=True)
+    def test_escape_formulae(self):
+        rows = [["ID", "Titel"], ["1", "=SUM(A1)"]]
+        self.assertEqual("".join(stream_csv(rows)), "ID,Titel\r\n1,SUM(A1)\r\n")
+
+    def test_get_stream_writer(self):
+        self.assertEqual(get_stream_writer(CSV()), stream_csv)
+        self.assertEqual(get_stream_writer(JSON()), stream_json)
+        self.assertIsNone(get_stream_writer(TSV()))
+
+    @skipUnless(XLSX.is_available(), "openpyxl is not installed")
+    def test_stream_xlsx(self):
+        """Assert that the streamed workbook contains the rows."""
+        from openpyxl import load_workbook
+
+        self.assertEqual(get_stream_writer(XLSX()), stream_xlsx)
+
+        workbook = load_workbook(io.BytesIO(b"".join(stream_xlsx(self.rows))))
+        sheet = workbook.active
+        self.assertEqual([list(row) for row in sheet.iter_rows(values_only=True)], self.rows)
+        self.assertTrue(sheet["A1"].font.bold)
+        self.assertEqual(sheet.freeze_panes, "A2")
+
+    @skipUnless(XLSX.is_available(), "openpyxl is not installed")
+    def test_stream_xlsx_illegal_characters(self):
+        rows = [["ID", "Titel"], ["1", "Foo\x00"]]
+        with self.assertRaises(ValueError):
+            b"".join(stream_xlsx(rows))
+        with override_settings(IMPORT_EXPORT_ESCAPE_ILLEGAL_CHARS_ON_EXPORT=True):
+            self.assertTrue(b"".join(stream_xlsx(rows)))
+
+
+class TestIterExport(DataTestCase):
+    model = _models.Audio
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj1 = make(cls.model, titel="Foo", musiker__kuenstler_name=["Alice", "Bob"])
+        cls.obj2 = make(cls.model, titel="Bar", musiker__kuenstler_name="Charlie")
+        super().setUpTestData()
+
+    def test_iter_export(self):
+        """Assert that iter_export yields the same rows as Resource.export."""
+        resource = resources.AudioResource()
+        dataset = resource.export(self.queryset)
+        rows = list(iter_export(resources.AudioResource(), self.queryset))
+        self.assertEqual(rows[0], dataset.headers)
+        self.assertEqual(rows[1:], [list(row) for row in dataset])
+
+    def test_iter_export_selected_fields(self):
+        rows = list(iter_export(resources.AudioResource(), self.queryset, export_fields=["titel", "musiker_list"]))
+        self.assertEqual(rows, [["Titel", "Musiker"], ["Foo", "Alice, Bob"], ["Bar", "Charlie"]])
+
+    def test_iter_export_chunks(self):
+        """Assert that the values of the CachedQuerysetFields are cached for one chunk at a time."""
+        resource = resources.AudioResource()
+        resource.get_chunk_size = Mock(return_value=1)
+        rows = iter_export(resource, self.queryset, export_fields=["titel", "musiker_list"])
+        next(rows)  # headers
+        self.assertEqual(next(rows), ["Foo", "Alice, Bob"])
+        self.assertEqual(list(resource.fields["musiker_list"].cache), [self.obj1.pk])
+        self.assertEqual(next(rows), ["Bar", "Charlie"])
+        self.assertEqual(list(resource.fields["musiker_list"].cache), [self.obj2.pk])
+        list(rows)
+        self.assertIsNone(resource.fields["musiker_list"].cache)
+
+
+class TestStreamExport(DataTestCase):
+    model = _models.Autor
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj = make(cls.model, kuerzel="AT", magazin__magazin_name="Foo")
+        super().setUpTestData()
+
+    def test_csv_copy(self):
+        """Assert that CSV exports that the database can produce are written with COPY."""
+        stream = stream_export(resources.AutorResource(), self.queryset, CSV(), ["id", "kuerzel", "magazin_list"])
+        self.assertEqual("".join(stream), f"ID,Kürzel,Magazine\r\n{self.obj.pk},AT,Foo\r\n")
+
+    def test_csv_copy_same_as_no_copy(self):
+        """
+        Assert that CSV exports written with COPY are the same as the CSV
+        exports written in Python.
+        """
+        make(self.model, kuerzel="", beschreibung='Foo, "Bar"\nBaz', person=None)
+        fields = ["id", "person", "kuerzel", "urls_list", "magazin_list", "beschreibung"]
+        resource = resources.AutorResource()
+        self.assertTrue(resource.can_copy_export(fields))
+        with patch("dbentry.export.streaming.copy_csv", wraps=copy_csv) as copy_mock:
+            copied = "".join(stream_export(resource, self.queryset.order_by("id"), CSV(), fields))
+            copy_mock.assert_called()
+        with patch.object(resource, "can_copy_export", new=Mock(return_value=False)):
+            written = "".join(stream_export(resource, self.queryset.order_by("id"), CSV(), fields))
+        self.assertEqual(copied, written)
+
+    def test_csv_no_copy(self):
+        """Assert that CSV exports that the database cannot produce are written in Python."""
+        resource = resources.AutorResource()
+        with patch.object(resource, "copy_export") as copy_mock:
+            with patch.object(resource, "can_copy_export", new=Mock(return_value=False)):
+                content = "".join(stream_export(resource, self.queryset, CSV(), ["id", "kuerzel"]))
+            copy_mock.assert_not_called()
+        self.assertEqual(content, f"ID,Kürzel\r\n{self.obj.pk},AT\r\n")
+
+    @override_settings(IMPORT_EXPORT_ESCAPE_FORMULAE_ON_EXPORT=True)
+    def test_csv_escape_formulae_no_copy(self):
+        resource = resources.AutorResource()
+        with patch.object(resource, "copy_export") as copy_mock:
+            list(stream_export(resource, self.queryset, CSV(), ["id", "kuerzel"]))
+            copy_mock.assert_not_called()
+
+    def test_json(self):
+        content = "".join(stream_export(resources.AutorResource(), self.queryset, JSON(), ["id", "kuerzel"]))
+        self.assertEqual(json.loads(content), [{"ID": str(self.obj.pk), "Kürzel": "AT"}])
+
+    def test_not_streamable(self):
+        self.assertIsNone(stream_export(resources.AutorResource(), self.queryset, TSV()))
@@ -62,3 +62,50 @@ class TestSearchVectorField(TestCase):
         self.assertEqual(len(errors), 1)
         self.assertEqual(errors[0].msg, "Language required for column WeightedColumn('Bacon', 'C', '')")
         self.assertEqual(errors[0].obj, field)
+
+    def test_search_field_deconstruct_document_label(self):
+        """Assert that deconstruct includes document_label, if it is set."""
+        column = WeightedColumn("title", "A", "simple")
+        field = SearchVectorField(columns=[column], document_label="title")
+        _name, _path, _args, kwargs = field.deconstruct()
+        self.assertEqual(kwargs["document_label"], "title")
+
+        field = SearchVectorField(columns=[column])
+        _name, _path, _args, kwargs = field.deconstruct()
+        self.assertNotIn("document_label", kwargs)
+
+    def test_check_document_label(self):
+        """Assert that the check catches document labels that are not columns."""
+
+        class DocumentLabelModel(models.Model):
+            title = models.CharField(max_length=100)
+            search_field = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")], document_label="title")
+            invalid_field = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")], document_label="foo")
+
+        opts = DocumentLabelModel._meta
+        self.assertFalse(list(opts.get_field("search_field")._check_document_label()))
+        errors = list(opts.get_field("invalid_field")._check_document_label())
+        self.assertEqual(len(errors), 1)
+        self.assertIn("'document_label' 'foo' is not one of the available columns", errors[0].msg)
+
+    def test_search_field_deconstruct_related(self):
+        """Assert that deconstruct includes related, if it is set."""
+        field = SearchVectorField(related=[("alias___fts", "simple")])
+        _name, _path, _args, kwargs = field.deconstruct()
+        self.assertEqual(kwargs["related"], [("alias___fts", "simple")])
+
+    def test_check_related(self):
+        """Assert that the check catches related paths that do not lead to a SearchVectorField."""
+
+        class RelatedCheckModel(models.Model):
+            title = models.CharField(max_length=100)
+            parent = models.ForeignKey("self", on_delete=models.CASCADE)
+            _fts = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")])
+            valid_field = SearchVectorField(related=[("parent___fts", "simple")])
+            invalid_field = SearchVectorField(related=[("parent__title", "simple"), ("foo___fts", "simple")])
+
+        opts = RelatedCheckModel._meta
+        self.assertFalse(list(opts.get_field("valid_field")._check_related()))
+        errors = list(opts.get_field("invalid_field")._check_related())
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0].msg, "'related' path 'parent__title' does not lead to a SearchVectorField.")
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection, models
+from django.test import TestCase
+
+from dbentry import models as _models
+from dbentry.fts.indexes import add_name_field_indexes, get_name_field_index, get_trigram_index
+
+
+class TestGetNameFieldIndex(TestCase):
+    class IndexModel(models.Model):
+        title = models.CharField(max_length=100)
+        number = models.IntegerField()
+        name_field = "title"
+
+        class Meta:
+            app_label = "test_fts"
+
+    def test_get_trigram_index(self):
+        """Assert that get_trigram_index returns a trigram GIN index."""
+        index = get_trigram_index(self.IndexModel, "title")
+        self.assertIsInstance(index, GinIndex)
+        self.assertTrue(index.name.startswith("indexmodel_"))
+        self.assertTrue(index.name.endswith("_trgm"))
+        self.assertLessEqual(len(index.name), 30)
+        (opclass,) = index.expressions
+        self.assertEqual(opclass.extra["name"], "gin_trgm_ops")
+
+    def test_get_name_field_index(self):
+        """Assert that get_name_field_index returns an index for the name field."""
+        self.assertIsNotNone(get_name_field_index(self.IndexModel))
+
+    def test_get_name_field_index_not_a_text_field(self):
+        """Assert that no index is returned for name fields that are not text fields."""
+        with patch.object(self.IndexModel, "name_field", new="number"):
+            self.assertIsNone(get_name_field_index(self.IndexModel))
+
+    def test_get_name_field_index_related_field(self):
+        """Assert that no index is returned for name fields of related models."""
+        self.assertIsNone(get_name_field_index(_models.Provenienz))
+
+    def test_get_name_field_index_inherited_field(self):
+        """
+        Assert that no index is returned for name fields that are inherited
+        from a multi-table inheritance parent.
+        """
+        self.assertIsNone(get_name_field_index(_models.Brochure))
+        self.assertIsNotNone(get_name_field_index(_models.BaseBrochure))
+
+    def test_add_name_field_indexes(self):
+        """Assert that add_name_field_indexes adds the index only once."""
+
+        class AddIndexModel(models.Model):
+            title = models.CharField(max_length=100)
+            name_field = "title"
+
+            class Meta:
+                app_label = "test_fts"
+
+        add_name_field_indexes([AddIndexModel])
+        add_name_field_indexes([AddIndexModel])
+        self.assertEqual(len(AddIndexModel._meta.indexes), 1)
+        self.assertEqual(AddIndexModel._meta.original_attrs["indexes"], AddIndexModel._meta.indexes)
+
+
+class TestNameFieldIndexUsage(TestCase):
+    def test_icontains_uses_index(self):
+        """Assert that case-insensitive lookups on the name field can use the index."""
+        index = get_name_field_index(_models.Band)
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for lookup in ("icontains", "istartswith"):
+            with self.subTest(lookup=lookup):
+                plan = _models.Band.objects.filter(**{f"band_name__{lookup}": "Beat"}).explain()
+                self.assertIn(index.name, plan)
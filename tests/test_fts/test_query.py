@@ -10,7 +10,12 @@ from django.test import TestCase
 
 from dbentry import models as _models
 from dbentry.fts.fields import SearchVectorField, WeightedColumn
-from dbentry.fts.query import TextSearchQuerySetMixin, _get_search_vector_field
+from dbentry.fts.query import (
+    TextSearchQuerySetMixin,
+    _get_related_search_vector_field,
+    _get_search_vector_field,
+    can_count_search_documents,
+)
 from tests.case import DataTestCase
 from tests.model_factory import make
 
@@ -30,6 +35,47 @@ class TestGetSearchVectorField(TestCase):
         self.assertIsNone(_get_search_vector_field(self.ModelB))
 
 
+class TestGetRelatedSearchVectorField(TestCase):
+    class RelatedVectorModel(models.Model):
+        title = models.CharField(max_length=100)
+        parent = models.ForeignKey("self", on_delete=models.CASCADE)
+        search_field = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")])
+        related_field = SearchVectorField(related=[("parent__search_field", "simple")])
+
+    def test(self):
+        expected = self.RelatedVectorModel._meta.get_field("related_field")
+        self.assertEqual(_get_related_search_vector_field(self.RelatedVectorModel), expected)
+        self.assertEqual(
+            _get_search_vector_field(self.RelatedVectorModel), self.RelatedVectorModel._meta.get_field("search_field")
+        )
+
+
+class TestCanCountSearchDocuments(TestCase):
+    def test_can_count_search_documents(self):
+        """
+        Assert that can_count_search_documents returns True for models with
+        search documents, unless the search term is a standard number.
+        """
+        test_data = [
+            (_models.Person, "Peter", True),
+            (_models.Buch, "Testbuch", True),
+            (_models.Buch, "978-0-471-11709-4", False),
+            (_models.Magazin, "1234-5679", False),
+            (_models.Musiker, "Peter", False),
+            (_models.Ausgabe, "2020-10", False),
+            (_models.Bestand, "Peter", False),
+        ]
+        for model, q, expected in test_data:
+            with self.subTest(model=model._meta.model_name, q=q):
+                self.assertEqual(can_count_search_documents(model, q), expected)
+
+    def test_custom_search(self):
+        """Assert that models with a custom search method cannot be counted with the search documents."""
+        queryset_class = type("CustomSearchQuerySet", (type(_models.Person.objects.all()),), {"search": Mock()})
+        with patch.object(_models.Person.objects, "all", new=lambda: queryset_class(_models.Person)):
+            self.assertFalse(can_count_search_documents(_models.Person, "Peter"))
+
+
 class TestFullTextSearch(DataTestCase):
     model = _models.Band
 
@@ -194,6 +240,47 @@ class TestFullTextSearch(DataTestCase):
             with self.subTest(name=name):
                 self.assertIn(obj, _models.Autor.objects.search(name))
 
+    def test_search_fuzzy(self):
+        """Assert that a fuzzy search finds records despite typos in the search term."""
+        self.assertFalse(self.queryset.search("Die Ärtze").exists())
+        results = self.queryset.search("Die Ärtze", search_type="fuzzy")
+        self.assertQuerySetEqual(results, [self.obj1])
+        self.assertTrue(results.get().rank)
+
+    def test_search_fuzzy_uses_trigram_expression(self):
+        """Assert that the fuzzy filter uses the expression of the trigram index."""
+        sql = str(self.queryset.search("Beatles", search_type="fuzzy").query)
+        self.assertIn('UPPER(("dbentry_band"."band_name")::text) % Beatles', sql)
+
+    def test_search_candidates(self):
+        """
+        Assert that two-phase ranking returns the same results in the same
+        order if all results are candidates.
+        """
+        make(self.model, band_name="Ärzte")
+        make(self.model, band_name="Ärztekammer")
+        make(self.model, band_name="Toten Hosen", beschreibung="Die Toten Hosen gehen gerne zum Arzt.")
+        expected = list(self.model.objects.search("Ärzte"))
+        self.assertEqual(list(self.model.objects.search("Ärzte", candidates=10)), expected)
+
+    def test_search_candidates_limit(self):
+        """
+        Assert that two-phase ranking orders the candidates before the other
+        results, and that only the candidates are ranked.
+        """
+        make(self.model, band_name="Ärzte")
+        make(self.model, band_name="Ärztekammer")
+        results = self.model.objects.search("Ärzte", candidates=1)
+        self.assertEqual(results.count(), 3)
+        self.assertEqual(results[0].band_name, "Ärzte")
+        self.assertTrue(results[0].rank)
+        self.assertFalse(any(obj.rank for obj in results[1:]))
+
+    def test_search_candidates_not_ranked(self):
+        """Assert that candidates is ignored if ranked is False."""
+        sql = str(self.queryset.search("Ärzte", ranked=False, candidates=10).query)
+        self.assertNotIn("CASE", sql)
+
     def test_search_id(self):
         """Assert that instances can be found using their id."""
         q = str(self.obj1.pk)
@@ -483,6 +570,33 @@ class TestTextSearchQuerySetMixin(TestCase):
                 self.assertIsInstance(queryset.query.where.children[0], NothingNode)
                 self.assertFalse(queryset.query.annotations)
 
+    def test_search_no_columns_no_related_vectors_numeric(self):
+        """
+        Assert that search returns an empty queryset for numeric search terms
+        if no columns and no related search vectors were declared.
+        """
+        mocked_search_field = Mock(columns=None)
+        mocked_get_search_field = Mock(return_value=mocked_search_field)
+        mocked_get_related = Mock(return_value={})
+        with patch("dbentry.fts.query._get_search_vector_field", mocked_get_search_field):
+            with patch.object(self.queryset, "_get_related_search_vectors", mocked_get_related):
+                queryset = self.queryset.search("42")
+                self.assertIsInstance(queryset.query.where.children[0], NothingNode)
+                self.assertFalse(queryset.query.annotations)
+
+    def test_search_related_search_vector_field(self):
+        """
+        Assert that search queries the model's related search vector field
+        instead of joining the related search vectors.
+        """
+        related_field = Mock(related=[("alias__fts", "simple_unaccent")])
+        related_field.name = "svf"
+        with patch("dbentry.fts.query._get_related_search_vector_field", Mock(return_value=related_field)):
+            queryset = self.queryset.search("Hovercraft")
+        rank = queryset.query.annotations["rank"]
+        self.assertFalse(rank.contains_aggregate)
+        self.assertEqual(len(queryset.query.alias_map), 1)
+
     def test_search_no_search_term(self):
         """
         Assert that an empty (using none()) queryset is returned if no search
@@ -494,6 +608,35 @@ class TestTextSearchQuerySetMixin(TestCase):
         self.assertFalse(queryset.query.annotations)
 
 
+class TestStdNumSearch(DataTestCase):
+    model = _models.Buch
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.obj = make(cls.model, titel="Testbuch", ISBN="9780471117094", EAN="73513537")
+        cls.other = make(cls.model, titel="9780471117094")
+        super().setUpTestData()
+
+    def test_search_stdnum(self):
+        """Assert that standard numbers in any format find the records with that number."""
+        for q in ("9780471117094", "978-0-471-11709-4", "0-471-11709-9", "7351-3537"):
+            with self.subTest(q=q):
+                self.assertQuerySetEqual(self.model.objects.search(q), [self.obj])
+
+    def test_search_stdnum_equality_lookup(self):
+        """Assert that standard number search terms skip the text search."""
+        queryset = self.model.objects.search("978-0-471-11709-4")
+        sql = str(queryset.query)
+        self.assertIn('"dbentry_buch"."ISBN" = 9780471117094', sql)
+        self.assertNotIn("to_tsquery", sql)
+        self.assertNotIn("rank", queryset.query.annotations)
+
+    def test_search_no_stdnum(self):
+        """Assert that search terms that are not valid standard numbers use the text search."""
+        self.assertIn(self.other, self.model.objects.search("97804711170"))
+        self.assertIn("rank", self.model.objects.search("9780471117095").query.annotations)
+
+
 class TestProvenienzSearch(DataTestCase):
     """
     Performing a text search on the Provenienz model raised an error, due to
@@ -514,6 +657,106 @@ class TestProvenienzSearch(DataTestCase):
         self.assertIn(self.obj, self.model.objects.search("Foo Bar"))
 
 
+class TestRelatedSearchVectors(DataTestCase):
+    model = _models.Veranstaltung
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ort = make(_models.Ort, stadt="Dortmund")
+        cls.spielort = make(_models.Spielort, name="Westfalenhalle", ort=cls.ort)
+        cls.obj = make(cls.model, name="Rockpalast", spielort=cls.spielort, veranstaltungalias__alias="Rocknacht")
+        super().setUpTestData()
+
+    def assertFound(self, q, found=True):
+        results = self.model.objects.search(q)
+        if found:
+            self.assertIn(self.obj, results)
+        else:
+            self.assertNotIn(self.obj, results)
+
+    def test_search(self):
+        """Assert that the related search vectors are included in the search."""
+        for q in ("Rocknacht", "Westfalenhalle", "Dortmund"):
+            with self.subTest(q=q):
+                self.assertFound(q)
+
+    def test_update_alias(self):
+        """Assert that changes to the aliases are reflected in the search."""
+        alias = self.obj.veranstaltungalias_set.get()
+        alias.alias = "Rockfestival"
+        alias.save()
+        self.assertFound("Rockfestival")
+        self.assertFound("Rocknacht", found=False)
+        alias.delete()
+        self.assertFound("Rockfestival", found=False)
+        _models.VeranstaltungAlias.objects.create(parent=self.obj, alias="Rocksommer")
+        self.assertFound("Rocksommer")
+
+    def test_update_related_object(self):
+        """
+        Assert that changes to the related objects along the path are
+        reflected in the search.
+        """
+        self.ort.stadt = "Bochum"
+        self.ort.save()
+        self.assertFound("Bochum")
+        self.assertFound("Dortmund", found=False)
+
+    def test_update_foreign_key(self):
+        """Assert that changing the foreign key updates the related search vector."""
+        self.obj.spielort = make(_models.Spielort, name="Zeche", ort__stadt="Bochum")
+        self.obj.save()
+        self.assertFound("Zeche")
+        self.assertFound("Bochum")
+        self.assertFound("Westfalenhalle", found=False)
+
+    def test_related_vectors_positions(self):
+        """
+        Assert that the positions of the lexemes of the related search vectors
+        do not overlap.
+        """
+        _models.VeranstaltungAlias.objects.create(parent=self.obj, alias="Jazz Abend")
+        _models.VeranstaltungAlias.objects.create(parent=self.obj, alias="Blues Nacht")
+        queryset = self.model.objects.filter(pk=self.obj.pk)
+        # With overlapping positions, 'Jazz' would be followed by 'Nacht':
+        query = SearchQuery("jazz <-> nacht", search_type="raw", config="simple")
+        self.assertFalse(queryset.filter(_related_fts=query).exists())
+        query = SearchQuery("jazz <-> abend", search_type="raw", config="simple")
+        self.assertTrue(queryset.filter(_related_fts=query).exists())
+
+    def test_search_candidates(self):
+        """
+        Assert that two-phase ranking returns the same first page as ranking
+        every result, including the ranks of the related search vectors.
+        """
+        make(self.model, name="Konzert", veranstaltungalias__alias="Rock Rock Rock")
+        make(self.model, name="Festival", spielort__name="Rock Arena")
+        make(self.model, name="Party", spielort__ort__stadt="Rockenhausen")
+        make(self.model, name="Rock am Ring")
+        expected = list(self.model.objects.search("Rock", candidates=0))
+        self.assertEqual(len(expected), 5)
+        for candidates in (1, 2, 3):
+            with self.subTest(candidates=candidates):
+                results = self.model.objects.search("Rock", candidates=candidates)
+                self.assertEqual(results.count(), 5)
+                self.assertEqual(list(results)[:candidates], expected[:candidates])
+                self.assertCountEqual(results, expected)
+
+    def test_search_no_aggregation(self):
+        """Assert that the search query does not join the related tables or aggregate."""
+        queryset = self.model.objects.search("Rocknacht")
+        sql = str(queryset.query)
+        self.assertNotIn("dbentry_veranstaltungalias", sql)
+        self.assertNotIn("GROUP BY", sql)
+
+    def test_save_stale_value(self):
+        """Assert that saving a stale related search vector does not overwrite it."""
+        obj = self.model.objects.get(pk=self.obj.pk)
+        _models.VeranstaltungAlias.objects.create(parent=self.obj, alias="Rocksommer")
+        obj.save()
+        self.assertFound("Rocksommer")
+
+
 class TestAusgabeFTS(DataTestCase):
     model = _models.Ausgabe
 
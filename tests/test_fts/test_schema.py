@@ -1,10 +1,11 @@
 from unittest.mock import Mock, patch
 
-from django.db import connection
+from django.db import connection, models
 from django.test import TestCase
 
+from dbentry import models as _models
 from dbentry.fts.db.schema import MIZDBSchemaEditor, MIZDBTriggerEditor
-from dbentry.fts.fields import WeightedColumn
+from dbentry.fts.fields import SearchVectorField, WeightedColumn
 
 
 class TestMIZDBTriggerEditor(TestCase):
@@ -27,6 +28,155 @@ class TestMIZDBTriggerEditor(TestCase):
         self.assertEqual(sql, expected)
 
 
+class TestMIZDBTriggerEditorSearchDocuments(TestCase):
+    class DocumentModel(models.Model):
+        title = models.CharField(max_length=100)
+        search_field = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")], document_label="title")
+
+        class Meta:
+            app_label = "test_fts"
+
+    class NoDocumentModel(models.Model):
+        title = models.CharField(max_length=100)
+        search_field = SearchVectorField(columns=[WeightedColumn("title", "A", "simple")])
+
+        class Meta:
+            app_label = "test_fts"
+
+    def get_sql(self, method, model):
+        with MIZDBSchemaEditor(connection) as schema_editor:
+            editor = MIZDBTriggerEditor(schema_editor)
+            return list(getattr(editor, method)(model, model._meta.get_field("search_field")))
+
+    def test_create_function_updates_document(self):
+        """
+        Assert that the trigger function updates the search document table, if
+        the field has a document label.
+        """
+        field = self.DocumentModel._meta.get_field("search_field")
+        with MIZDBSchemaEditor(connection) as schema_editor:
+            sql = MIZDBTriggerEditor(schema_editor)._create_function("foo()", field)
+        self.assertIn('INSERT INTO "dbentry_searchdocument"', sql)
+        self.assertIn("""ct.app_label = 'test_fts' AND ct.model = 'documentmodel'""", sql)
+        self.assertIn('NEW."title"::text', sql)
+        self.assertIn("ON CONFLICT (content_type_id, object_id) DO UPDATE", sql)
+
+    def test_create_function_no_document_label(self):
+        """
+        Assert that the trigger function does not update the search document
+        table, if the field has no document label.
+        """
+        field = self.NoDocumentModel._meta.get_field("search_field")
+        with MIZDBSchemaEditor(connection) as schema_editor:
+            sql = MIZDBTriggerEditor(schema_editor)._create_function("foo()", field)
+        self.assertNotIn("dbentry_searchdocument", sql)
+
+    def test_create_tsvector_delete_trigger(self):
+        """Assert that a trigger that deletes documents is created."""
+        sql = self.get_sql("_create_tsvector", self.DocumentModel)
+        self.assertTrue(any('DELETE FROM "dbentry_searchdocument"' in s for s in sql))
+        self.assertTrue(any(s.startswith("CREATE TRIGGER") and "AFTER DELETE" in s for s in sql))
+        sql = self.get_sql("_create_tsvector", self.NoDocumentModel)
+        self.assertFalse(any("AFTER DELETE" in s for s in sql))
+
+    def test_drop_tsvector_drops_delete_trigger(self):
+        """Assert that the trigger that deletes documents is dropped."""
+        sql = self.get_sql("_drop_tsvector", self.DocumentModel)
+        self.assertTrue(any("DROP TRIGGER" in s and "_document_trigger" in s for s in sql))
+        self.assertTrue(any("DROP FUNCTION" in s and "_document_function" in s for s in sql))
+
+
+class TestMIZDBTriggerEditorRelatedSearchVectors(TestCase):
+    model = _models.Veranstaltung
+
+    def get_sql(self, method):
+        with MIZDBSchemaEditor(connection) as schema_editor:
+            editor = MIZDBTriggerEditor(schema_editor)
+            return list(getattr(editor, method)(self.model, self.model._meta.get_field("_related_fts")))
+
+    def test_get_joins(self):
+        """Assert that _get_joins resolves forward and reverse relations."""
+        with MIZDBSchemaEditor(connection) as schema_editor:
+            editor = MIZDBTriggerEditor(schema_editor)
+            self.assertEqual(
+                editor._get_joins(self.model, "spielort__ort___fts"),
+                ([(_models.Spielort, "spielort_id", "id"), (_models.Ort, "ort_id", "id")], "_fts"),
+            )
+            self.assertEqual(
+                editor._get_joins(self.model, "veranstaltungalias___fts"),
+                ([(_models.VeranstaltungAlias, "id", "parent_id")], "_fts"),
+            )
+
+    def test_create_tsvector(self):
+        """
+        Assert that _create_tsvector creates a trigger on the model's table
+        and a trigger on every table along the related paths.
+        """
+        sql = self.get_sql("_create_tsvector")
+        triggers = [s for s in sql if s.startswith("CREATE TRIGGER")]
+        self.assertEqual(len(triggers), 5)
+        self.assertIn('BEFORE INSERT OR UPDATE ON "dbentry_veranstaltung"', triggers[0])
+        self.assertIn('AFTER INSERT OR UPDATE OR DELETE ON "dbentry_veranstaltungalias"', triggers[1])
+        self.assertIn('AFTER INSERT OR UPDATE OR DELETE ON "dbentry_spielort"', triggers[2])
+        self.assertIn('AFTER INSERT OR UPDATE OR DELETE ON "dbentry_spielort"', triggers[3])
+        self.assertIn('AFTER INSERT OR UPDATE OR DELETE ON "dbentry_ort"', triggers[4])
+
+    def test_create_related_function(self):
+        """
+        Assert that the trigger function on the model's table concatenates the
+        related search vectors, and that it recomputes the vector when the
+        foreign key changes.
+        """
+        sql = self.get_sql("_create_tsvector")
+        function = next(s for s in sql if s.startswith("CREATE FUNCTION") and 'NEW."_related_fts" :=' in s)
+        self.assertIn(
+            """COALESCE((SELECT dbentry_tsvector_agg(t2."_fts") FROM "dbentry_spielort" AS t1 """
+            """JOIN "dbentry_ort" AS t2 ON t1."ort_id" = t2."id" WHERE t1."id" = NEW."spielort_id"), '')""",
+            function,
+        )
+        self.assertIn(
+            """COALESCE((SELECT dbentry_tsvector_agg(t1."_fts") FROM "dbentry_veranstaltungalias" AS t1 """
+            """WHERE t1."parent_id" = NEW."id"), '')""",
+            function,
+        )
+        self.assertIn('ELSIF (NEW."spielort_id" IS DISTINCT FROM OLD."spielort_id") THEN do_update = true;', function)
+        # Other values written to the column should be discarded:
+        self.assertIn('ELSE NEW."_related_fts" := OLD."_related_fts";', function)
+
+    def test_create_tsvector_agg(self):
+        """
+        Assert that _create_tsvector creates the aggregate that concatenates
+        the related search vectors before the function that uses it.
+        """
+        sql = self.get_sql("_create_tsvector")
+        index = next(i for i, s in enumerate(sql) if "AGGREGATE dbentry_tsvector_agg(tsvector)" in s)
+        self.assertIn("SFUNC = tsvector_concat", sql[index])
+        function_index = next(i for i, s in enumerate(sql) if 'NEW."_related_fts" :=' in s)
+        self.assertLess(index, function_index)
+
+    def test_create_refresh_function(self):
+        """
+        Assert that the trigger functions on the related tables reset the
+        vectors of the rows that are related to the changed row.
+        """
+        sql = self.get_sql("_create_tsvector")
+        ort_function = next(s for s in sql if s.startswith("CREATE FUNCTION") and 't1."ort_id" = NEW' in s)
+        self.assertIn(
+            """UPDATE "dbentry_veranstaltung" SET "_related_fts" = NULL WHERE "id" IN ("""
+            """SELECT t0."id" FROM "dbentry_veranstaltung" AS t0 """
+            """JOIN "dbentry_spielort" AS t1 ON t0."spielort_id" = t1."id" WHERE t1."ort_id" = NEW."id")""",
+            ort_function,
+        )
+        self.assertIn('NEW."_fts" IS DISTINCT FROM OLD."_fts"', ort_function)
+
+    def test_drop_tsvector(self):
+        """Assert that the functions on the related tables are dropped."""
+        sql = self.get_sql("_drop_tsvector")
+        drop_refresh = [s for s in sql if s.endswith("CASCADE")]
+        self.assertEqual(len(drop_refresh), 4)
+        self.assertTrue(all(s.startswith("DROP FUNCTION IF EXISTS") for s in drop_refresh))
+
+
 class TestMIZDBSchemaEditor(TestCase):
     def test_trigger_editor_class(self):
         """
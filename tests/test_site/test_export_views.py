@@ -5,10 +5,13 @@ from django.test import override_settings
 from django.urls import reverse, path
 from import_export.resources import ModelResource
 
+from dbentry import models as _models
+from dbentry.export.jobs import run_export_job
 from dbentry.site.views.base import BaseListView
 from dbentry.site.views.export import BaseExportView, ExportActionView, ExportModelView
 from tests.case import ViewTestCase
 from tests.model_factory import make, batch
+from tests.test_export.test_jobs import ExportJobTestMixin
 from tests.test_site.models import Band
 from tests.test_site.urls import urlpatterns as base_url_patterns
 
@@ -79,7 +82,38 @@ class TestBaseExportView(ViewTestCase):
             response = view.form_valid(form)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get("Content-Disposition"), 'attachment; filename="export.csv"')
-        self.assertEqual(response.content.decode("utf-8"), f"id,name\r\n{band.pk},Foo Fighters\r\n")
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertEqual(content, f"id,name\r\n{band.pk},Foo Fighters\r\n")
+
+    def test_form_valid_json(self):
+        """Assert that a JSON export is streamed."""
+        band = make(Band, name="Foo Fighters", alias="FF")
+        view = self.get_view(
+            self.post_request(), queryset=Band.objects.all(), model=Band, resource_classes=[BandResource]
+        )
+        json_index = [f.__name__ for f in view.get_export_formats()].index("JSON")
+        view.request = self.post_request(data={"fields_select": ["id", "name"], "format": str(json_index)})
+        form = view.get_form()
+        assert form.is_valid()
+        response = view.form_valid(form)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode("utf-8")
+        self.assertEqual(content, f'[{{"id": "{band.pk}", "name": "Foo Fighters"}}]')
+
+    def test_form_valid_not_streamed(self):
+        """Assert that formats that cannot be streamed are exported with a regular response."""
+        make(Band, name="Foo Fighters", alias="FF")
+        view = self.get_view(
+            self.post_request(), queryset=Band.objects.all(), model=Band, resource_classes=[BandResource]
+        )
+        html_index = [f.__name__ for f in view.get_export_formats()].index("HTML")
+        view.request = self.post_request(data={"fields_select": ["id", "name"], "format": str(html_index)})
+        form = view.get_form()
+        assert form.is_valid()
+        response = view.form_valid(form)
+        self.assertFalse(response.streaming)
+        self.assertIn("Foo Fighters", response.content.decode("utf-8"))
 
 
 class TestExportActionView(ViewTestCase):
@@ -147,3 +181,99 @@ class TestExportMany(ViewTestCase):
         response = self.post_response(path=reverse("changelist"), data=request_data)
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.get("Content-Disposition").startswith("attachment"))
+
+
+class BandExportResource(ModelResource):
+    class Meta:
+        model = Band
+        fields = ["id", "name"]
+
+
+@override_settings(ROOT_URLCONF=URLConf, EXPORT_JOB_WORKER=True)
+class TestExportJobs(ExportJobTestMixin, ViewTestCase):
+    view_class = ExportActionView
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.band = make(Band, name="Foo Fighters")
+        cls.other = make(Band, name="Bar Fighters")
+
+    def setUp(self):
+        super().setUp()
+        # The requests of the RequestFactory do not support messages:
+        patcher = patch("dbentry.site.views.export.messages")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_form_and_view(self, view_class, queryset):
+        data = {"fields_select": ["id", "name"], "format": "0", ExportActionView.action_confirmed_name: "yes"}
+        request = self.post_request(data=data)
+        view = view_class(queryset=queryset, model=Band, resource_classes=[BandExportResource])
+        view.setup(request)
+        form = view.get_form()
+        assert form.is_valid(), form.errors
+        return form, view
+
+    def test_form_valid_creates_job(self):
+        """Assert that form_valid adds an export job if the export worker is enabled."""
+        form, view = self.get_form_and_view(ExportActionView, Band.objects.filter(pk=self.band.pk))
+        with patch.object(view, "get_export_filename", new=Mock(return_value="export.csv")):
+            response = view.form_valid(form)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse("export_jobs"))
+        job = _models.ExportJob.objects.get()
+        self.assertEqual(job.user, self.super_user)
+        self.assertEqual(job.content_type.model_class(), Band)
+        self.assertEqual(job.object_ids, [self.band.pk])
+        self.assertEqual(job.resource, "tests.test_site.test_export_views.BandExportResource")
+        self.assertEqual(job.export_fields, ["id", "name"])
+        self.assertEqual(job.file_format, "CSV")
+        self.assertEqual(job.filename, "export.csv")
+        self.assertEqual(job.status, _models.ExportJob.Status.QUEUED)
+
+    def test_model_export_job_exports_all(self):
+        """Assert that the job of a model export exports all records."""
+        form, view = self.get_form_and_view(ExportModelView, Band.objects.all())
+        view.form_valid(form)
+        self.assertIsNone(_models.ExportJob.objects.get().object_ids)
+
+    def test_run_job(self):
+        form, view = self.get_form_and_view(ExportActionView, Band.objects.filter(pk=self.band.pk))
+        view.form_valid(form)
+        job = _models.ExportJob.objects.get()
+        run_export_job(job)
+        with job.file.open("rb") as f:
+            self.assertEqual(f.read().decode(), f"id,name\r\n{self.band.pk},Foo Fighters\r\n")
+
+    def test_job_list(self):
+        """Assert that the list of export jobs only contains the jobs of the current user."""
+        own = self.create_job(self.super_user, filename="own.csv")
+        self.create_job(self.staff_user, filename="other.csv")
+        response = self.get_response(reverse("export_jobs"))
+        self.assertEqual(list(response.context["object_list"]), [own])
+
+    def test_job_list_download_link(self):
+        job = self.create_job(self.super_user, status=_models.ExportJob.Status.DONE)
+        response = self.get_response(reverse("export_jobs"))
+        self.assertContains(response, reverse("export_job_download", kwargs={"pk": job.pk}))
+
+    def test_download(self):
+        job = self.create_job(self.super_user, object_ids=[])
+        run_export_job(job)
+        response = self.get_response(reverse("export_job_download", kwargs={"pk": job.pk}))
+        self.assertEqual(response.status_code, 200, job.error)
+        self.assertEqual(response.get("Content-Disposition"), 'attachment; filename="Autor.csv"')
+        self.assertEqual(b"".join(response.streaming_content).decode(), "ID,Kürzel\r\n")
+
+    def test_download_other_user(self):
+        """Assert that users cannot download the exports of other users."""
+        job = self.create_job(self.staff_user, object_ids=[])
+        run_export_job(job)
+        response = self.get_response(reverse("export_job_download", kwargs={"pk": job.pk}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_not_done(self):
+        job = self.create_job(self.super_user)
+        response = self.get_response(reverse("export_job_download", kwargs={"pk": job.pk}))
+        self.assertEqual(response.status_code, 404)
@@ -13,8 +13,9 @@ from django.views import View
 from dbentry import models as _models
 from dbentry.site.registry import ModelType, Registry, register_changelist
 from dbentry.site.views import list
-from dbentry.site.views.base import ORDER_VAR, ONLINE_HELP_INDEX, OFFLINE_HELP_INDEX
+from dbentry.site.views.base import ORDER_VAR, ONLINE_HELP_INDEX, OFFLINE_HELP_INDEX, SEARCH_VAR
 from dbentry.site.views.list import _get_continue_url
+from dbentry.utils.pagination import CURSOR_VAR
 from tests.case import DataTestCase, RequestTestCase, ViewTestCase
 from tests.model_factory import make
 from tests.test_site.models import Band, Genre, Musician
@@ -162,6 +163,11 @@ class ListViewTestMethodsMixin:
         response = self.get_response(self.url)
         assert response.status_code == 200
 
+    def test_search(self: ListViewTestCase):
+        """Assert that the changelist can be searched."""
+        response = self.get_response(self.url, data={SEARCH_VAR: "Test"})
+        self.assertEqual(response.status_code, 200)
+
     def test_get_help_url(self: ListViewTestCase):
         """Assert that the URL returned by get_help_url is as expected."""
         request = self.get_request(self.url)
@@ -205,6 +211,34 @@ class TestAusgabeList(ListViewTestMethodsMixin, ListViewTestCase):
         view = self.get_view(request)
         self.assertFalse(view.get_queryset().chronologically_ordered)
 
+    def test_search_results(self):
+        """Assert that searching the changelist finds the expected Ausgabe records."""
+        obj = make(self.view_class.model, ausgabejahr__jahr=2020, ausgabenum__num=10, beschreibung="Sonderheft")
+        other = make(self.view_class.model, ausgabejahr__jahr=2000, beschreibung="Jubiläum")
+        for search_term in ("2020-10", "Sonderheft"):
+            with self.subTest(search_term=search_term):
+                response = self.get_response(self.url, data={SEARCH_VAR: search_term})
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(obj, response.context["object_list"])
+                self.assertNotIn(other, response.context["object_list"])
+
+    def test_keyset_pagination(self):
+        """Assert that the pages of a chronologically ordered changelist can be browsed with cursors."""
+        for jahr in (2001, 2000, 2002):
+            make(self.view_class.model, magazin=self.obj.magazin, ausgabejahr__jahr=jahr)
+        request_data = {"magazin_id": self.obj.magazin_id}
+        objects = []
+        with patch.object(self.view_class, "paginate_by", new=2):
+            while True:
+                response = self.get_response(self.url, data=request_data)
+                objects.extend(response.context["object_list"])
+                page = response.context["page_obj"]
+                if not page.has_next():
+                    break
+                request_data[CURSOR_VAR] = page.next_cursor
+        view = self.get_view(self.get_request(self.url, data={"magazin_id": self.obj.magazin_id}))
+        self.assertQuerySetEqual(view.get_queryset(), objects)
+
 
 class TestAutorList(ListViewTestMethodsMixin, ListViewTestCase):
     view_class = list.AutorList
@@ -3,9 +3,11 @@
 import json
 from unittest.mock import Mock, patch
 
+from django.contrib.contenttypes.models import ContentType
 from django.test import override_settings
 from django.urls import path, reverse
 
+from dbentry import models as _models
 from dbentry.site.views.search import SearchbarSearch, SiteSearchView
 from tests.case import ViewTestCase
 from tests.model_factory import make
@@ -70,6 +72,17 @@ class TestSearchbarSearch(ViewTestCase):
         self.assertEqual(len(details), 1)
         self.assertHTMLEqual(details[0], f'<a href="/musician/{self.paul.pk}/change/">Paul Foo</a>')
 
+    @patch("dbentry.site.views.search.miz_site")
+    def test_num_queries(self, site_mock):
+        """
+        Assert that the counts for all models are fetched with a single query.
+        """
+        site_mock.model_list = [("", [Band._meta, Musician._meta])]
+        # Two queries for session and user, one query for the counts, and one
+        # query each for the details of the two models.
+        with self.assertNumQueries(5):
+            self.get_response(reverse("search"), data={"q": "foo"})
+
     @patch("dbentry.site.views.search.JsonResponse")
     def test_get_many_results_no_details(self, json_response_mock):
         """
@@ -93,19 +106,72 @@ class TestSearchbarSearch(ViewTestCase):
 class TestUnit(ViewTestCase):
     view_class = SearchbarSearch
 
+    @patch("dbentry.site.views.search.SearchbarSearch._get_counts")
     @patch("dbentry.site.views.search.SearchbarSearch._get_model_results")
-    def test_get_results_excludes_empty_querysets(self, get_results_mock):
+    def test_get_results_excludes_empty_querysets(self, _get_results_mock, count_mock):
         """Assert that empty querysets are excluded from the result list."""
         view = self.get_view()
-        for exists in (True, False):
-            with self.subTest(exists=exists):
-                get_results_mock.return_value.exists.return_value = exists
+        for count in (1, 0):
+            with self.subTest(count=count):
+                count_mock.return_value = [count]
                 results = view._get_results("q", [Mock()])
-                if exists:
+                if count:
                     self.assertTrue(results)
                 else:
                     self.assertFalse(results)
 
+    @patch("dbentry.site.views.search.SearchbarSearch._get_counts")
+    @patch("dbentry.site.views.search.SearchbarSearch._get_model_results")
+    def test_get_results_memoizes_counts(self, get_results_mock, count_mock):
+        """Assert that _get_results memoizes the counts of the querysets."""
+        queryset_mock = Mock()
+        get_results_mock.return_value = queryset_mock
+        count_mock.return_value = [42]
+        view = self.get_view()
+        view._get_results("q", [Mock()])
+        self.assertEqual(view.get_count(queryset_mock), 42)
+        queryset_mock.count.assert_not_called()
+
+    def test_get_counts(self):
+        """
+        Assert that _get_counts uses the search index for models with search
+        documents and counts the other querysets with a single query.
+        """
+        view = self.get_view()
+        make(_models.Person, vorname="Peter", nachname="Lustig")
+        make(Band, name="Peter and the Wolves")
+        querysets = [Band.objects.search("Peter"), _models.Person.objects.search("Peter", ranked=False)]
+        ContentType.objects.get_for_model(_models.Person)  # warm up the content type cache
+        with self.assertNumQueries(2):
+            self.assertEqual(view._get_counts("Peter", querysets), [1, 1])
+        with patch("dbentry.site.views.search.SearchDocument") as document_mock:
+            view._get_counts("Peter", querysets)
+            document_mock.objects.search.assert_called_with("Peter", [_models.Person])
+
+    def test_get_counts_use_search_documents_false(self):
+        """
+        Assert that _get_counts does not use the search index if
+        use_search_documents is False.
+        """
+        view = self.get_view(use_search_documents=False)
+        make(_models.Person, vorname="Peter", nachname="Lustig")
+        querysets = [_models.Person.objects.search("Peter", ranked=False)]
+        with patch("dbentry.site.views.search.SearchDocument") as document_mock:
+            self.assertEqual(view._get_counts("Peter", querysets), [1])
+            document_mock.objects.search.assert_not_called()
+
+    def test_get_counts_stdnum(self):
+        """
+        Assert that _get_counts counts the results of models that are searched
+        for a standard number without the search index.
+        """
+        view = self.get_view()
+        make(_models.Magazin, magazin_name="Nature", issn="0028-0836")
+        querysets = [_models.Magazin.objects.search("0028-0836", ranked=False)]
+        with patch("dbentry.site.views.search.SearchDocument") as document_mock:
+            self.assertEqual(view._get_counts("0028-0836", querysets), [1])
+            document_mock.objects.search.assert_not_called()
+
     def test_get_model_results_ranked_false(self):
         """Assert that _get_model_results calls search with ranked=False."""
         queryset_mock = Mock()
@@ -8,9 +8,11 @@ from django import forms
 from django.contrib import admin
 from django.contrib.admin.models import LogEntry
 from django.contrib.contenttypes.models import ContentType
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.template import TemplateDoesNotExist
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import NoReverseMatch, path, reverse
 from mizdb_tomselect.views import IS_POPUP_VAR
 
@@ -19,6 +21,7 @@ from dbentry.site.forms import InlineForm
 from dbentry.site.views.base import (
     ACTION_SELECTED_ITEM,
     ORDER_VAR,
+    PAGE_VAR,
     SEARCH_VAR,
     BaseEditView,
     BaseListView,
@@ -32,6 +35,7 @@ from dbentry.site.views.delete import DeleteSelectedView, DeleteView
 from dbentry.site.views.help import HelpView, has_help_page
 from dbentry.site.views.history import HistoryView
 from dbentry.site.views.watchlist import WatchlistView
+from dbentry.utils.pagination import CURSOR_VAR, KeysetPaginator
 from tests.case import DataTestCase, ViewTestCase, MIZTestCase
 from tests.model_factory import make
 
@@ -684,11 +688,26 @@ class TestBaseListView(DataTestCase, ViewTestCase):
             view.get_result_rows(object_list)
             get_row_mock.assert_has_calls([call("foo"), call("bar")])
 
-    def test_get_queryset_applies_overview_annotations(self):
-        """Assert that get_queryset applies the overview annotations."""
+    def test_get_queryset_no_overview_annotations(self):
+        """
+        Assert that get_queryset does not apply the overview annotations that
+        are not required for the ordering.
+        """
         view = self.get_view(self.get_request())
+        self.assertNotIn("members_list", view.get_queryset().query.annotations)
+        view = self.get_view(self.get_request(data={ORDER_VAR: "2"}))  # order by members_list
         self.assertIn("members_list", view.get_queryset().query.annotations)
 
+    def test_paginate_queryset_applies_overview_annotations(self):
+        """
+        Assert that paginate_queryset applies the overview annotations to the
+        objects of the page only.
+        """
+        view = self.get_view(self.get_request())
+        _paginator, _page, object_list, _is_paginated = view.paginate_queryset(view.get_queryset(), 1)
+        self.assertIn("members_list", object_list.query.annotations)
+        self.assertQuerySetEqual(object_list, [self.obj])
+
     def test_get_result_row(self):
         """Assert that get_result_row returns the expected list of values."""
         view = self.get_view(self.get_request())
@@ -828,6 +847,146 @@ class TestBaseListView(DataTestCase, ViewTestCase):
             with self.subTest(context_item=context_item):
                 self.assertIn(context_item, context)
 
+    def test_paginate_queryset_keyset_pagination(self):
+        """Assert that paginate_queryset uses a keyset paginator if keyset_pagination is True."""
+        other = make(self.model, name="The Who")
+        view = self.get_view(self.get_request())
+        view.keyset_pagination = True
+        queryset = self.model.objects.order_by("name")
+        paginator, page, object_list, is_paginated = view.paginate_queryset(queryset, 1)
+        self.assertIsInstance(paginator, KeysetPaginator)
+        self.assertQuerySetEqual(object_list, [self.obj])
+        self.assertTrue(is_paginated)
+
+        view = self.get_view(self.get_request(data={CURSOR_VAR: page.next_cursor}))
+        view.keyset_pagination = True
+        _paginator, page, object_list, _is_paginated = view.paginate_queryset(queryset, 1)
+        self.assertQuerySetEqual(object_list, [other])
+        self.assertFalse(page.has_next())
+
+    def test_paginate_queryset_keyset_pagination_invalid_cursor(self):
+        """Assert that paginate_queryset raises Http404 for an invalid cursor."""
+        view = self.get_view(self.get_request(data={CURSOR_VAR: "foo"}))
+        view.keyset_pagination = True
+        with self.assertRaises(Http404):
+            view.paginate_queryset(self.model.objects.order_by("name"), 1)
+
+    def test_paginate_queryset_keyset_pagination_unsupported_ordering(self):
+        """Assert that paginate_queryset uses page numbers if the ordering does not support keyset pagination."""
+        view = self.get_view(self.get_request())
+        view.keyset_pagination = True
+        paginator, *_ = view.paginate_queryset(self.model.objects.order_by("?"), 1)
+        self.assertNotIsInstance(paginator, KeysetPaginator)
+
+    def test_paginate_queryset_estimated_count(self):
+        """
+        Assert that paginate_queryset uses a keyset paginator if the number of
+        results is estimated.
+        """
+        view = self.get_view(self.get_request())
+        queryset = self.model.objects.order_by("name")
+        with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+            with patch("dbentry.utils.count.estimate_query_count", return_value=1000):
+                paginator, *_ = view.paginate_queryset(queryset, 1)
+                self.assertIsInstance(paginator, KeysetPaginator)
+                self.assertTrue(view.result_estimate.estimated)
+            with patch("dbentry.utils.count.estimate_query_count", return_value=10):
+                paginator, *_ = view.paginate_queryset(queryset, 1)
+                self.assertNotIsInstance(paginator, KeysetPaginator)
+                self.assertEqual(paginator.count, 1)
+
+    def test_paginate_queryset_estimated_count_unsupported_ordering(self):
+        """
+        Assert that paginate_queryset counts the results exactly if the
+        ordering does not support keyset pagination.
+        """
+        view = self.get_view(self.get_request())
+        with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+            with patch("dbentry.utils.count.estimate_query_count", return_value=1000):
+                paginator, *_ = view.paginate_queryset(self.model.objects.order_by("?"), 1)
+        self.assertNotIsInstance(paginator, KeysetPaginator)
+        self.assertEqual(paginator.count, 1)
+
+    def test_get_context_data_counts(self):
+        """Assert that get_context_data only counts the results once."""
+        request = self.get_response(reverse("test_site_band_changelist")).wsgi_request
+        view = self.get_view(request)
+        view.object_list = view.get_queryset().filter(name__startswith="Led")
+        with CaptureQueriesContext(connection) as queries:
+            context = view.get_context_data()
+        self.assertEqual(len([q for q in queries if "COUNT(" in q["sql"]]), 2)
+        self.assertEqual(context["result_count"], 1)
+        self.assertEqual(context["total_count"], 1)
+
+    def test_get_context_data_keyset_pagination(self):
+        """Assert that get_context_data handles keyset pages."""
+        make(self.model, name="The Who")
+        request = self.get_response(reverse("test_site_band_changelist")).wsgi_request
+        view = self.get_view(request)
+        view.keyset_pagination = True
+        view.paginate_by = 1
+        view.object_list = view.get_queryset().order_by("name")
+        context = view.get_context_data()
+        self.assertTrue(context["keyset_pagination"])
+        self.assertTrue(context["pagination_required"])
+        self.assertEqual(context["page_range"], [])
+
+    def test_get_context_data_keyset_pagination_no_count(self):
+        """
+        Assert that get_context_data does not count the results of keyset
+        pages if COUNT_ESTIMATE_THRESHOLD is not set.
+        """
+        make(self.model, name="The Who")
+        make(self.model, name="The Doors")
+        request = self.get_response(reverse("test_site_band_changelist")).wsgi_request
+        view = self.get_view(request)
+        view.keyset_pagination = True
+        view.paginate_by = 1
+        view.object_list = view.get_queryset().filter(name__startswith="The").order_by("name")
+        with CaptureQueriesContext(connection) as queries:
+            context = view.get_context_data()
+        # The filtered results must not have been counted:
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"] and "LIKE" in q["sql"]])
+        self.assertFalse([q for q in queries if "EXPLAIN" in q["sql"]])
+        self.assertIsNone(context["result_count"])
+
+    def test_get_context_data_keyset_pagination_count_estimate_threshold(self):
+        """
+        Assert that get_context_data uses the estimate for the results of
+        keyset pages if it is above the COUNT_ESTIMATE_THRESHOLD, and counts
+        the results otherwise.
+        """
+        make(self.model, name="The Who")
+        make(self.model, name="The Doors")
+        request = self.get_response(reverse("test_site_band_changelist")).wsgi_request
+        for estimate, expected, estimated in ((1000, 1000, True), (10, 2, False)):
+            with self.subTest(estimate=estimate):
+                view = self.get_view(request)
+                view.keyset_pagination = True
+                view.paginate_by = 1
+                view.object_list = view.get_queryset().filter(name__startswith="The").order_by("name")
+                with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+                    with patch("dbentry.utils.count.estimate_query_count", return_value=estimate):
+                        context = view.get_context_data()
+                self.assertEqual(context["result_count"], expected)
+                self.assertEqual(context["result_count"].estimated, estimated)
+
+    def test_get_context_data_keyset_pagination_single_page(self):
+        """
+        Assert that get_context_data uses the exact result count if all results
+        fit on a single keyset page.
+        """
+        request = self.get_response(reverse("test_site_band_changelist")).wsgi_request
+        view = self.get_view(request)
+        view.keyset_pagination = True
+        view.object_list = view.get_queryset().filter(name__startswith="Led").order_by("name")
+        with CaptureQueriesContext(connection) as queries:
+            context = view.get_context_data()
+        self.assertFalse([q for q in queries if "COUNT(" in q["sql"] and "LIKE" in q["sql"]])
+        self.assertFalse(context["pagination_required"])
+        self.assertEqual(context["result_count"], 1)
+        self.assertFalse(context["result_count"].estimated)
+
     def test_get_context_data_is_filtered(self):
         """
         Assert that the context data contains the 'is_filtered' item that
@@ -1000,6 +1159,30 @@ class TestBaseListView(DataTestCase, ViewTestCase):
                     else:
                         self.assertTrue(kwargs["ranked"])
 
+    def test_get_search_candidates(self):
+        """
+        Assert that get_search_candidates returns the number of candidates
+        that includes the results of the requested page.
+        """
+        test_data = [
+            ({}, 1000),
+            ({PAGE_VAR: "2"}, 1000),
+            ({PAGE_VAR: "100"}, 100 * 25),
+            ({PAGE_VAR: "last"}, 0),
+        ]
+        for request_data, expected in test_data:
+            with self.subTest(request_data=request_data):
+                view = self.get_view(self.get_request(data=request_data))
+                view.search_candidates = 1000
+                with patch.object(view, "get_paginate_by", new=Mock(return_value=25)):
+                    self.assertEqual(view.get_search_candidates(), expected)
+
+    def test_get_search_candidates_disabled(self):
+        """Assert that get_search_candidates returns 0 if search_candidates is 0."""
+        view = self.get_view(self.get_request())
+        view.search_candidates = 0
+        self.assertEqual(view.get_search_candidates(), 0)
+
     def test_get_queryset_applies_search(self):
         """
         Assert that the queryset returned by get_queryset has search filters
@@ -1012,15 +1195,6 @@ class TestBaseListView(DataTestCase, ViewTestCase):
         queryset = view.get_queryset()
         self.assertFalse(queryset.query.has_filters())
 
-    def test_get_queryset_adds_annotations(self):
-        """
-        Assert that the queryset returned by get_queryset has list display
-        annotations applied to it.
-        """
-        view = self.get_view(self.get_request())
-        queryset = view.get_queryset()
-        self.assertIn("members_list", queryset.query.annotations)
-
     def test_get_queryset_adds_ordering(self):
         """
         Assert that the queryset returned by get_queryset has ordering applied
@@ -527,6 +527,28 @@ class TestMIZSiteSearch(ViewTestCase):
         self.assertIn("Musiker (1)", results[1])
         self.assertIn("Veranstaltungen (1)", results[2])
 
+    def test_get_result_list_search_documents(self):
+        """Assert that get_result_list includes results from the search index."""
+        make(_models.Person, vorname="Sharon", nachname="Silva")
+        view = self.get_view(request=self.get_request())
+        with patch(
+            "dbentry.tools.views.SearchDocument.objects.search", wraps=_models.SearchDocument.objects.search
+        ) as m:
+            results = view.get_result_list("Silva")
+            self.assertIn(_models.Person, m.call_args[0][1])
+        self.assertEqual(len(results), 4)
+        self.assertIn("Personen (1)", results[2])
+
+    def test_get_result_list_stdnum(self):
+        """Assert that get_result_list counts the results for standard numbers in any format."""
+        make(_models.Magazin, magazin_name="Nature", issn="0028-0836")
+        view = self.get_view(request=self.get_request())
+        for q in ("0028-0836", "00280836"):
+            with self.subTest(q=q):
+                results = view.get_result_list(q)
+                self.assertEqual(len(results), 1)
+                self.assertIn("Magazine (1)", results[0])
+
     def test_permissions(self):
         """
         Assert that site search does not include results for models that the
@@ -1,7 +1,7 @@
 from unittest.mock import Mock, patch
 
 from django import forms
-from django.contrib.admin.models import ADDITION, CHANGE, DELETION
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
 from django.forms import modelform_factory
 from django.test import override_settings
 
@@ -218,6 +218,54 @@ class TestAdminUtils(RequestTestCase):
             self.assertEqual(obj, self.obj1)
             self.assertEqual(action_flag, DELETION)
 
+    ################################################################################################
+    # test LogCollector
+    ################################################################################################
+
+    def test_log_collector(self):
+        """Assert that LogCollector creates the collected LogEntry objects when the context exits."""
+        with admin_utils.LogCollector() as logs:
+            logs.log_addition(self.super_user.pk, self.obj1)
+            logs.log_change(self.super_user.pk, self.obj1, ["titel"])
+            logs.log_deletion(self.super_user.pk, self.obj2)
+            self.assertFalse(LogEntry.objects.exists())
+        entries = LogEntry.objects.order_by("pk")
+        self.assertQuerySetEqual(
+            entries.values_list("object_id", "action_flag", "change_message"),
+            [
+                (str(self.obj1.pk), ADDITION, '[{"added": {}}]'),
+                (str(self.obj1.pk), CHANGE, '[{"changed": {"fields": ["Titel"]}}]'),
+                (str(self.obj2.pk), DELETION, ""),
+            ],
+        )
+        self.assertEqual(entries[0].get_edited_object(), self.obj1)
+        self.assertEqual(entries[0].user, self.super_user)
+        self.assertEqual(entries[0].object_repr, "Testaudio")
+
+    def test_log_collector_related_obj(self):
+        m2m_band = self.obj1.band.through.objects.create(band=self.band, audio=self.obj1)
+        with admin_utils.LogCollector() as logs:
+            logs.log_addition(self.super_user.pk, self.obj1, m2m_band)
+        self.assertEqual(LogEntry.objects.get().get_change_message(), "Band „Led Zeppelin“ hinzugefügt.")
+
+    def test_log_collector_exception(self):
+        """Assert that LogCollector does not create any LogEntry objects if an exception was raised."""
+        with self.assertRaises(ValueError):
+            with admin_utils.LogCollector() as logs:
+                logs.log_addition(self.super_user.pk, self.obj1)
+                raise ValueError
+        self.assertFalse(LogEntry.objects.exists())
+
+    def test_log_collector_single_query(self):
+        """Assert that the content types are resolved once and the entries are created with one query."""
+        with admin_utils.LogCollector() as logs:
+            logs.log_addition(self.super_user.pk, self.obj1)
+            with self.assertNumQueries(0):
+                logs.log_addition(self.super_user.pk, self.obj2)
+            with self.assertNumQueries(1):
+                logs.flush()
+        self.assertEqual(LogEntry.objects.count(), 2)
+
     ################################################################################################
     # test get_model_admin_for_model
     ################################################################################################
@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+
+from dbentry import models as _models
+from dbentry.utils.count import (
+    RowCount,
+    estimate_query_count,
+    estimate_table_count,
+    get_result_count,
+    get_result_estimate,
+    get_total_count,
+)
+from tests.case import DataTestCase, MIZTestCase
+from tests.model_factory import make
+
+
+class TestRowCount(MIZTestCase):
+    def test_row_count(self):
+        count = RowCount(42, estimated=True)
+        self.assertEqual(count, 42)
+        self.assertTrue(count.estimated)
+        self.assertFalse(RowCount(42).estimated)
+
+
+class TestEstimates(DataTestCase):
+    model = _models.Genre
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Rock", "Pop", "Jazz"):
+            make(cls.model, genre=name)
+        super().setUpTestData()
+
+    def test_estimate_table_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {self.model._meta.db_table}")
+        self.assertEqual(estimate_table_count(self.model), 3)
+
+    def test_estimate_query_count(self):
+        self.assertIsInstance(estimate_query_count(self.queryset.filter(genre="Rock")), int)
+
+    def test_estimate_query_count_empty_result(self):
+        self.assertEqual(estimate_query_count(self.queryset.filter(pk__in=[])), 0)
+
+
+@override_settings(COUNT_ESTIMATE_THRESHOLD=None, TOTAL_COUNT_CACHE_TIMEOUT=0)
+class TestCounts(DataTestCase):
+    model = _models.Genre
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Rock", "Pop", "Jazz"):
+            make(cls.model, genre=name)
+        super().setUpTestData()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_get_result_count(self):
+        count = get_result_count(self.queryset.filter(genre="Rock"))
+        self.assertEqual(count, 1)
+        self.assertFalse(count.estimated)
+
+    def test_get_result_count_estimated(self):
+        """Assert that the estimate is returned if it is above the threshold."""
+        with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+            with patch("dbentry.utils.count.estimate_query_count", return_value=1000):
+                count = get_result_count(self.queryset)
+                self.assertEqual(count, 1000)
+                self.assertTrue(count.estimated)
+            with patch("dbentry.utils.count.estimate_query_count", return_value=10):
+                count = get_result_count(self.queryset)
+                self.assertEqual(count, 3)
+                self.assertFalse(count.estimated)
+
+    def test_get_result_estimate(self):
+        """Assert that get_result_estimate only returns estimates above the threshold."""
+        self.assertIsNone(get_result_estimate(self.queryset))
+        with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+            with patch("dbentry.utils.count.estimate_query_count", return_value=1000):
+                estimate = get_result_estimate(self.queryset)
+                self.assertEqual(estimate, 1000)
+                self.assertTrue(estimate.estimated)
+            with patch("dbentry.utils.count.estimate_query_count", return_value=10):
+                self.assertIsNone(get_result_estimate(self.queryset))
+
+    def test_get_total_count(self):
+        count = get_total_count(self.model)
+        self.assertEqual(count, 3)
+        self.assertFalse(count.estimated)
+
+    def test_get_total_count_estimated(self):
+        """Assert that the table estimate is returned if it is above the threshold."""
+        with override_settings(COUNT_ESTIMATE_THRESHOLD=100):
+            with patch("dbentry.utils.count.estimate_table_count", return_value=1000):
+                with self.assertNumQueries(0):
+                    count = get_total_count(self.model)
+                self.assertEqual(count, 1000)
+                self.assertTrue(count.estimated)
+
+    def test_get_total_count_cached(self):
+        """Assert that the exact total count is cached if a timeout is set."""
+        with override_settings(TOTAL_COUNT_CACHE_TIMEOUT=60):
+            self.assertEqual(get_total_count(self.model), 3)
+            make(self.model, genre="Blues")
+            with self.assertNumQueries(0):
+                self.assertEqual(get_total_count(self.model), 3)
+
+    def test_get_total_count_not_cached(self):
+        """Assert that the total count is not cached if the timeout is 0."""
+        self.assertEqual(get_total_count(self.model), 3)
+        make(self.model, genre="Blues")
+        self.assertEqual(get_total_count(self.model), 4)
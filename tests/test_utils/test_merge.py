@@ -1,5 +1,9 @@
+from unittest.mock import patch
+
+from django.contrib.admin.models import DELETION, LogEntry
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
 
 from dbentry.utils.merge import merge_records
 from tests.case import DataTestCase, LoggingTestMixin, RequestTestCase
@@ -150,6 +154,65 @@ class TestMerge(LoggingTestMixin, DataTestCase, RequestTestCase):
         self.assertLoggedAddition(self.obj1, change_message=str(added).replace("'", '"'))
         self.assertEqual(self.obj1.foo.all().count(), 3)
 
+    def test_related_object_already_related_to_original(self):
+        """
+        Assert that related objects that the original already has are not
+        moved, and that they are deleted with the other records.
+        """
+        self.obj2.foo.add(self.foo_original)  # noqa
+        merge_records(self.obj1, self.queryset, expand_original=False)
+        self.assertSequenceEqual(
+            self.obj1.foo.all().order_by("pk"), [self.foo_original, self.foo_merger1, self.foo_merger2]
+        )
+        self.assertEqual(MergeBase.foo.through.objects.count(), 3)
+
+    def test_query_count_independent_of_related_objects(self):
+        """Assert that the number of queries does not depend on the number of related objects."""
+
+        def count_queries(n):
+            original = make(MergeBase, name="Original")
+            other = make(MergeBase, name="Other")
+            for i in range(n):
+                foo = make(Foo, name=f"Foo {i}")
+                other.foo.add(foo)  # noqa
+                if i % 2:
+                    original.foo.add(foo)  # noqa
+            with CaptureQueriesContext(connection) as queries:
+                merge_records(original, MergeBase.objects.filter(pk=other.pk), user_id=self.super_user.pk)
+            self.assertEqual(original.foo.count(), n)
+            return len(queries)
+
+        count_queries(1)  # fill the ContentType cache
+        self.assertEqual(count_queries(2), count_queries(10))
+
+    def test_related_objects_moved_with_filtered_update(self):
+        """
+        Assert that the related objects are moved with an UPDATE that filters
+        them, instead of with a list of their primary keys.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            merge_records(self.obj1, self.queryset, expand_original=False)
+        db_table = MergeBase.foo.through._meta.db_table
+        updates = [q["sql"] for q in queries if q["sql"].startswith(f'UPDATE "{db_table}"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("EXISTS", updates[0])
+
+    def test_log_entries_created_in_bulk(self):
+        """Assert that the LogEntry objects of a merge are created with a single query."""
+        with patch.object(LogEntry.objects, "bulk_create", wraps=LogEntry.objects.bulk_create) as bulk_create_mock:
+            merge_records(self.obj1, self.queryset, expand_original=True, user_id=self.super_user.pk)
+        bulk_create_mock.assert_called_once()
+        deletions = LogEntry.objects.filter(action_flag=DELETION).values_list("object_id", flat=True)
+        self.assertCountEqual(deletions, [str(self.obj2.pk), str(self.obj3.pk)])
+
+    def test_no_log_entries_on_rollback(self):
+        """Assert that no LogEntry objects are created if the merge is aborted."""
+        self.obj3.bar.add(self.bar_merger1)  # noqa
+        queryset = self.queryset.filter(pk__in=[self.obj2.pk, self.obj3.pk])
+        with self.assertRaises(models.deletion.ProtectedError):
+            merge_records(self.obj2, queryset, expand_original=True, user_id=self.super_user.pk)
+        self.assertFalse(LogEntry.objects.exists())
+
     def test_rest_deleted(self):
         """Assert that merge deletes the other objects."""
         merge_records(self.obj1, self.queryset, expand_original=True, user_id=self.super_user.pk)
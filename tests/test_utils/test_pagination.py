@@ -0,0 +1,168 @@
+from unittest.mock import patch
+
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+
+from dbentry import models as _models
+from dbentry.fields import PartialDate
+from dbentry.utils.pagination import (
+    InvalidCursor,
+    KeysetPage,
+    decode_cursor,
+    encode_cursor,
+    get_keyset_ordering,
+    get_keyset_paginator,
+    get_page_queryset,
+    keyset_filter,
+)
+from tests.case import DataTestCase, MIZTestCase
+from tests.model_factory import make
+
+
+class TestCursor(MIZTestCase):
+    def test_encode_decode(self):
+        """Assert that decode_cursor returns the values passed to encode_cursor."""
+        for reverse in (True, False):
+            with self.subTest(reverse=reverse):
+                self.assertEqual(decode_cursor(encode_cursor(["foo", None, 1], reverse)), (["foo", None, 1], reverse))
+
+    def test_decode_invalid(self):
+        """Assert that decode_cursor raises InvalidCursor for invalid tokens."""
+        for cursor in ("foo", encode_cursor([1])[:-2], "eyJ2IjogMX0"):  # the last is {"v": 1}
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    decode_cursor(cursor)
+
+    def test_encode_partial_date(self):
+        """Assert that partial dates are encoded with their database value."""
+        values, _reverse = decode_cursor(encode_cursor([PartialDate(2020)]))
+        self.assertEqual(values, ["2020-00-00"])
+
+
+class TestKeysetOrdering(MIZTestCase):
+    def test_default_ordering(self):
+        """Assert that the model's default ordering is used, and that the pk is appended."""
+        _queryset, keys = get_keyset_ordering(_models.Audio.objects.all())
+        self.assertEqual(keys, [("titel", False), ("id", False)])
+
+    def test_descending(self):
+        _queryset, keys = get_keyset_ordering(_models.Audio.objects.order_by("-jahr", "-pk"))
+        self.assertEqual(keys, [("jahr", True), ("id", True)])
+
+    def test_relation_expanded(self):
+        """Assert that orderings on relations are expanded into the related model's ordering."""
+        _queryset, keys = get_keyset_ordering(_models.Ausgabe.objects.order_by("-magazin"))
+        self.assertEqual(keys, [("magazin__magazin_name", True), ("id", False)])
+
+    def test_relation_without_ordering(self):
+        """Assert that relations without a default ordering use the foreign key column."""
+        with patch.object(_models.Land._meta, "ordering", []):
+            _queryset, keys = get_keyset_ordering(_models.Audio.objects.order_by("land_pressung"))
+        self.assertEqual(keys, [("land_pressung_id", False), ("id", False)])
+
+    def test_expressions_annotated(self):
+        """Assert that ordering expressions are added as annotations."""
+        queryset, keys = get_keyset_ordering(_models.Audio.objects.order_by(F("tracks").desc()))
+        self.assertEqual(keys, [("_keyset_0", True), ("id", False)])
+        self.assertIn("_keyset_0", queryset.query.annotations)
+
+    def test_unsupported(self):
+        """Assert that None is returned for orderings that are not supported."""
+        for ordering in ("?", "musiker__kuenstler_name", F("tracks").asc(nulls_first=True)):
+            with self.subTest(ordering=ordering):
+                self.assertIsNone(get_keyset_ordering(_models.Audio.objects.order_by(ordering)))
+
+    def test_keyset_filter(self):
+        keys = [("titel", False), ("id", False)]
+        self.assertEqual(
+            keyset_filter(keys, ["foo", 1]),
+            (Q(titel__gt="foo") | Q(titel__isnull=True)) | (Q(titel="foo") & (Q(id__gt=1) | Q(id__isnull=True))),
+        )
+        self.assertEqual(
+            keyset_filter(keys, ["foo", 1], reverse=True),
+            Q(titel__lt="foo") | (Q(titel="foo") & Q(id__lt=1)),
+        )
+
+
+class TestKeysetPaginator(DataTestCase):
+    model = _models.Audio
+
+    @classmethod
+    def setUpTestData(cls):
+        # Include NULL values and duplicate values in the ordering column:
+        for i, tracks in enumerate([3, None, 1, 1, None, 2, 3]):
+            make(cls.model, titel=f"Audio {i}", tracks=tracks)
+        super().setUpTestData()
+
+    def get_pages(self, queryset, per_page, reverse=False):
+        """Browse through all pages and return the object lists."""
+        paginator = get_keyset_paginator(queryset, per_page)
+        page = paginator.page()
+        pages = [list(page.object_list)]
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            pages.append(list(page.object_list))
+        if reverse:
+            pages = [list(page.object_list)]
+            while page.has_previous():
+                page = paginator.page(page.previous_cursor)
+                pages.insert(0, list(page.object_list))
+        return pages
+
+    def test_pages(self):
+        """Assert that browsing the pages returns all results in the correct order."""
+        for ordering in (["tracks"], ["-tracks"], ["-tracks", "-titel"], ["titel"]):
+            queryset = self.model.objects.order_by(*ordering)
+            for reverse in (False, True):
+                with self.subTest(ordering=ordering, reverse=reverse):
+                    pages = self.get_pages(queryset, 3, reverse=reverse)
+                    self.assertEqual([len(p) for p in pages], [3, 3, 1])
+                    self.assertEqual(sum(pages, []), list(queryset.order_by(*ordering, "pk")))
+
+    def test_page(self):
+        paginator = get_keyset_paginator(self.model.objects.order_by("titel"), 3)
+        page = paginator.page()
+        self.assertIsInstance(page, KeysetPage)
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertEqual(len(page), 3)
+        page = paginator.page(page.next_cursor)
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_page_number_of_queries(self):
+        """Assert that a page requires a query for the keys and one for the objects."""
+        paginator = get_keyset_paginator(self.model.objects.order_by("titel"), 3)
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(2):
+            list(paginator.page(cursor).object_list)
+
+    def test_page_invalid_cursor(self):
+        """Assert that page raises InvalidCursor for cursors that do not fit the ordering."""
+        paginator = get_keyset_paginator(self.model.objects.order_by("titel"), 3)
+        for cursor in (encode_cursor(["foo"]), encode_cursor(["foo", "bar"]), "foo"):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    paginator.page(cursor)
+
+
+class TestGetPageQueryset(DataTestCase):
+    model = _models.Band
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Led Zeppelin", "Black Sabbath", "Deep Purple"):
+            make(cls.model, band_name=name)
+        super().setUpTestData()
+
+    def test_get_page_queryset(self):
+        """
+        Assert that get_page_queryset returns the objects of the page, in the
+        order of the queryset, with the annotations added to the returned
+        queryset.
+        """
+        queryset = self.model.objects.order_by("band_name")
+        page = Paginator(queryset, 2).page(1)
+        page_queryset = get_page_queryset(queryset, page.object_list).overview()
+        self.assertEqual(list(page_queryset), list(page.object_list))
+        self.assertIn("genre_list", page_queryset.query.annotations)
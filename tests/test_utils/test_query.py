@@ -1,10 +1,20 @@
 from django.contrib.postgres.aggregates import ArrayAgg
-from django.db.models import F, Func, Value
-
-from dbentry.utils.query import array_remove, array_to_string, concatenate, join_arrays, limit, to_array
+from django.db.models import Count, F, Func, Value
+
+from dbentry import models as _models
+from dbentry.utils.query import (
+    add_ordering_annotations,
+    array_remove,
+    array_to_string,
+    concatenate,
+    count_querysets,
+    join_arrays,
+    limit,
+    to_array,
+)
 from tests.case import DataTestCase, MIZTestCase
 from tests.model_factory import make
-from tests.test_utils.models import Audio, Band
+from tests.test_utils.models import Audio, Band, Musiker
 
 
 class TestFunctions(MIZTestCase):
@@ -89,3 +99,43 @@ class TestQueryset(DataTestCase):
             kuenstler=limit(array_to_string(to_array("musiker__kuenstler_name"), to_array("band__band_name"), null=""))
         )
         self.assertEqual(queryset.get().kuenstler, "John Lennon, Paul McCartney, Ringo Starr")
+
+    def test_count_querysets(self):
+        """Assert that count_querysets returns the counts in the given order."""
+        querysets = [
+            Band.objects.all(),
+            Musiker.objects.filter(kuenstler_name__startswith="J"),
+            Musiker.objects.all(),
+        ]
+        with self.assertNumQueries(1):
+            self.assertEqual(count_querysets(querysets), [1, 2, 6])
+
+    def test_count_querysets_empty_queryset(self):
+        """Assert that empty querysets are counted without querying them."""
+        with self.assertNumQueries(1):
+            self.assertEqual(count_querysets([Band.objects.none(), Musiker.objects.all()]), [0, 6])
+        with self.assertNumQueries(0):
+            self.assertEqual(count_querysets([Band.objects.none()]), [0])
+
+    def test_count_querysets_aggregate_annotation(self):
+        """Assert that querysets with aggregate annotations are counted correctly."""
+        queryset = Musiker.objects.annotate(audio_count=Count("audio")).order_by("-audio_count")
+        self.assertEqual(count_querysets([queryset]), [queryset.count()])
+
+
+class TestAddOrderingAnnotations(MIZTestCase):
+    def test_add_ordering_annotations(self):
+        """Assert that only the overview annotations referred to by the ordering are added."""
+        queryset = add_ordering_annotations(_models.Band.objects.all(), ["band_name", "-genre_list"])
+        self.assertIn("genre_list", queryset.query.annotations)
+        self.assertNotIn("musiker_list", queryset.query.annotations)
+
+    def test_add_ordering_annotations_already_annotated(self):
+        """Assert that existing annotations are not replaced."""
+        queryset = _models.Band.objects.annotate(genre_list=Value("foo"))
+        self.assertIs(add_ordering_annotations(queryset, ["genre_list"]), queryset)
+
+    def test_add_ordering_annotations_no_overview(self):
+        """Assert that querysets of models without overview annotations are returned unchanged."""
+        queryset = _models.Bildreihe.objects.all()
+        self.assertIs(add_ordering_annotations(queryset, ["name"]), queryset)
@@ -1,7 +1,7 @@
 from collections import OrderedDict
 from unittest import mock
 
-from django.db.models import Count
+from django.db.models import Count, F, Subquery
 from django.test import TestCase
 
 from dbentry import models as _models
@@ -63,6 +63,47 @@ class TestParser(DataTestCase):
         self.assertIn("reihe", queryset.query.select_related)
         self.assertIn("count", queryset.query.annotations)
 
+    def test_modify_queryset_aggregates_in_subqueries(self):
+        """Assert that aggregate annotations are evaluated in a subquery per object."""
+        queryset = self.parser.modify_queryset(self.queryset)
+        self.assertIsInstance(queryset.query.annotations["count"], Subquery)
+        self.assertIsNone(queryset.query.group_by)
+        self.assertEqual(queryset.get().count, 1)
+
+    def test_get_summaries_chunks(self):
+        """
+        Assert that get_summaries fetches the objects in chunks, keeping the
+        ordering of the queryset.
+        """
+        other = make(self.model)
+        self.parser.chunk_size = 1
+        # For each chunk: one query that seeks the chunk, one query for the
+        # objects and the prefetch query.
+        with self.assertNumQueries(6):
+            summaries = list(self.parser.get_summaries(self.queryset.order_by("-pk")))
+        self.assertEqual([d["ID"] for d in summaries], [other.pk, self.obj.pk])
+
+    def test_get_summaries_chunks_no_keyset_ordering(self):
+        """
+        Assert that get_summaries keeps the ordering of the queryset if the
+        ordering does not support keyset pagination.
+        """
+        other = make(self.model)
+        self.parser.chunk_size = 1
+        queryset = self.queryset.order_by(F("pk").desc(nulls_last=True))
+        summaries = list(self.parser.get_summaries(queryset))
+        self.assertEqual([d["ID"] for d in summaries], [other.pk, self.obj.pk])
+
+    def test_get_summaries_chunks_random_ordering(self):
+        """
+        Assert that get_summaries returns every object exactly once if the
+        queryset is ordered randomly.
+        """
+        others = [make(self.model) for _ in range(4)]
+        self.parser.chunk_size = 2
+        summaries = list(self.parser.get_summaries(self.queryset.order_by("?")))
+        self.assertCountEqual([d["ID"] for d in summaries], [self.obj.pk, *(o.pk for o in others)])
+
     def test_modify_queryset_does_not_raise_exceptions(self):
         """
         Assert that modify_queryset does not propagate exceptions raised from
@@ -111,6 +152,18 @@ class TestPersonParser(ParserTestCase):
         text_repr = self.parser.get_summary(self.queryset.get())
         self.assertEqual(list(text_repr.keys()), expected)
 
+    def test_lists_of_several_relations(self):
+        """Assert that the lists of the different relations do not multiply each other's items."""
+        obj = make(
+            self.model,
+            urls__url=["http://foo.bar", "http://bar.baz"],
+            orte__land__land_name="Deutschland",
+            orte__stadt=["Dortmund", "Bochum"],
+        )
+        obj = self.queryset.get(pk=obj.pk)
+        self.assertEqual(obj.url_list, ["http://bar.baz", "http://foo.bar"])
+        self.assertEqual(len(obj.ort_list), 2)
+
 
 class TestMusikerParser(ParserTestCase):
     model = _models.Musiker
@@ -208,6 +261,15 @@ class TestAusgabeParser(ParserTestCase):
         text_repr = self.parser.get_summary(self.queryset.get())
         self.assertEqual(list(text_repr.keys()), expected)
 
+    def test_get_summaries_chronological_order(self):
+        """Assert that get_summaries keeps the chronological order of the ausgaben."""
+        mag = make(_models.Magazin)
+        second = make(self.model, magazin=mag, ausgabenum__num=2, ausgabejahr__jahr=2020)
+        first = make(self.model, magazin=mag, ausgabenum__num=1, ausgabejahr__jahr=2020)
+        self.parser.chunk_size = 1
+        queryset = self.model.objects.filter(magazin=mag).chronological_order()
+        self.assertEqual([d["ID"] for d in self.parser.get_summaries(queryset)], [first.pk, second.pk])
+
 
 class TestMagazinParser(ParserTestCase):
     model = _models.Magazin